@@ -0,0 +1,56 @@
+# benchmarks/bench_parsers.py
+"""
+Parse time per page for each HTML parser backend, over the recorded eagle.ac pages in
+tests/fixtures. Profile pages are parsed whole ('full'); the leaderboard builds only the
+panels it reads ('strained'). Backends that are not installed (lxml) are skipped. Every
+run is checked against the html.parser result, so a faster backend can't silently change
+the output.
+
+    python -m benchmarks.bench_parsers --repeat 200
+"""
+import argparse
+import pathlib
+import time
+
+from bot.eagle_parser import available_parser_backends, parse_profile_html, parse_leaderboard_html
+
+FIXTURES = pathlib.Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def time_per_page(func, html: str, repeat: int) -> float:
+    func(html)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(html)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="parses per page and variant")
+    args = parser.parse_args()
+
+    profile_html = (FIXTURES / "eagle_profile.html").read_text(encoding="utf-8")
+    arcade_html = (FIXTURES / "eagle_arcade.html").read_text(encoding="utf-8")
+    expected_profile = parse_profile_html(profile_html, "bench", "html.parser")
+    expected_leaderboard = parse_leaderboard_html(arcade_html, "html.parser")
+
+    results = []  # (page, backend, variant, ms per page)
+    for backend in available_parser_backends():
+        assert parse_profile_html(profile_html, "bench", backend) == expected_profile, f"{backend}: profile output differs"
+        assert parse_leaderboard_html(arcade_html, backend) == expected_leaderboard, f"{backend}: leaderboard output differs"
+        results.append(("profile", backend, "full", time_per_page(lambda html: parse_profile_html(html, "bench", backend), profile_html, args.repeat)))
+        results.append(("leaderboard", backend, "strained", time_per_page(lambda html: parse_leaderboard_html(html, backend), arcade_html, args.repeat)))
+
+    baseline = next(ms for page, backend, variant, ms in results if (page, backend, variant) == ("profile", "html.parser", "full"))
+    print(f"{'page':<12} {'backend':<12} {'variant':<9} {'ms/page':>8}  vs full html.parser")
+    for page, backend, variant, ms in results:
+        speedup = f"{baseline / ms:8.2f}x" if page == "profile" else ""
+        print(f"{page:<12} {backend:<12} {variant:<9} {ms:8.3f}  {speedup}")
+    missing = sorted({"lxml"} - set(available_parser_backends()))
+    if missing:
+        print(f"skipped (not installed): {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
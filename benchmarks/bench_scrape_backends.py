@@ -0,0 +1,108 @@
+# benchmarks/bench_scrape_backends.py
+"""
+Pages-per-second comparison of the 'http' and 'selenium' scrape backends.
+
+Both backends are pointed at a local server that replays the recorded eagle.ac pages
+in tests/fixtures, with the rate limiter off, so the numbers measure our fetch + parse
+overhead rather than eagle.ac's response time or our request pacing. The Selenium run
+needs a working chromedriver (CHROME_DRIVER_PATH or one on PATH) and is skipped otherwise.
+
+    python -m benchmarks.bench_scrape_backends --pages 200
+"""
+import argparse
+import asyncio
+import pathlib
+import time
+
+from aiohttp import web
+
+from bot.eagle_browser import EagleBrowser
+from bot.rate_limiter import RateLimiter
+
+FIXTURES = pathlib.Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+async def start_replay_server() -> tuple[web.AppRunner, str]:
+    profile_html = (FIXTURES / "eagle_profile.html").read_text(encoding="utf-8")
+    arcade_html = (FIXTURES / "eagle_arcade.html").read_text(encoding="utf-8")
+
+    async def profile(request):
+        return web.Response(text=profile_html, content_type="text/html")
+
+    async def arcade(request):
+        return web.Response(text=arcade_html, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/game/sdvx/profile/{sdvx_id}", profile)
+    app.router.add_get("/arcade/{arcade_id}", arcade)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://localhost:{port}"
+
+
+async def bench_http(base_url: str, pages: int, concurrency: int) -> float:
+    browser = EagleBrowser(backend="http", base_url=base_url, rate_limiter=RateLimiter(rate=0))
+    browser.http_client.load_cookies([])
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            profile = await browser.scrape_player_profile(f"{10000000 + i}")
+            assert profile and profile["recent_plays"], "HTTP backend returned an empty profile"
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(pages)))
+    elapsed = time.perf_counter() - start
+    await browser.http_client.close()
+    return pages / elapsed
+
+
+def bench_selenium(base_url: str, pages: int) -> float | None:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument("--headless=new"); options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox"); options.add_argument("--disable-dev-shm-usage")
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        print(f"selenium: skipped ({type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''})")
+        return None
+
+    browser = EagleBrowser(backend="selenium", base_url=base_url, rate_limiter=RateLimiter(rate=0))
+    browser.headless_driver = driver
+    try:
+        start = time.perf_counter()
+        for i in range(pages):
+            profile = browser._scrape_player_profile_sync(f"{10000000 + i}")
+            assert profile and profile["recent_plays"], "Selenium backend returned an empty profile"
+        elapsed = time.perf_counter() - start
+    finally:
+        browser.quit_headless()
+    return pages / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200, help="profile pages to scrape per backend")
+    parser.add_argument("--concurrency", type=int, default=8, help="in-flight requests for the http backend")
+    args = parser.parse_args()
+
+    runner, base_url = await start_replay_server()
+    try:
+        http_pps = await bench_http(base_url, args.pages, args.concurrency)
+        print(f"http:     {http_pps:8.1f} pages/s  ({args.pages} pages, concurrency {args.concurrency})")
+        selenium_pps = await asyncio.to_thread(bench_selenium, base_url, min(args.pages, 50))
+        if selenium_pps is not None:
+            print(f"selenium: {selenium_pps:8.1f} pages/s  ({min(args.pages, 50)} pages, sequential)")
+            print(f"speedup:  {http_pps / selenium_pps:8.1f}x")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
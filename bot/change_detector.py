@@ -0,0 +1,56 @@
+# bot/change_detector.py
+import copy
+from collections import OrderedDict
+
+from bot.config import log, PROFILE_CHANGE_MAX_PLAYERS
+
+
+class ProfileChangeDetector:
+    """
+    Remembers, per player, the content hash of the last profile page that was parsed and
+    the profile it parsed to. A page whose hash matches is not parsed again; the remembered
+    profile is returned instead. Most players aren't at the cabinet on a given tick, so most
+    profile pages come back byte-identical.
+
+    At most max_players players are remembered; the least recently scraped are evicted, so
+    players who are no longer tracked drop out.
+    """
+    def __init__(self, max_players: int = PROFILE_CHANGE_MAX_PLAYERS):
+        self.max_players = max(1, max_players)
+        self._last = OrderedDict()  # sdvx_id -> (content_hash, profile), least recently scraped first
+        self.checked = 0
+        self.unchanged = 0
+        self.evictions = 0
+
+    def lookup(self, sdvx_id: str, content_hash: str | None) -> dict | None:
+        """Returns a copy of the remembered profile if the page is unchanged, else None."""
+        if content_hash is None:
+            return None
+        self.checked += 1
+        entry = self._last.get(sdvx_id)
+        if entry is None or entry[0] != content_hash:
+            return None
+        self._last.move_to_end(sdvx_id)
+        self.unchanged += 1
+        log.debug(f"CHANGE_DETECTOR: Profile page for {sdvx_id} is unchanged; skipping the parse.")
+        return copy.deepcopy(entry[1])
+
+    def remember(self, sdvx_id: str, content_hash: str | None, profile: dict):
+        if content_hash is None or not profile:
+            return
+        self._last[sdvx_id] = (content_hash, copy.deepcopy(profile))
+        self._last.move_to_end(sdvx_id)
+        while len(self._last) > self.max_players:
+            self._last.popitem(last=False)
+            self.evictions += 1
+
+    def forget(self, sdvx_id: str):
+        self._last.pop(sdvx_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "checked": self.checked,
+            "unchanged": self.unchanged,
+            "players": len(self._last),
+            "skip_ratio": self.unchanged / self.checked if self.checked else 0.0,
+        }
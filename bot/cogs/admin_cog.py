@@ -4,26 +4,93 @@ from bot.core.session_service import SessionService
 from bot.core.identity_service import IdentityService
 from bot.utils.error_handler import ScrapeErrorHandler
 from bot.utils.embed_factory import create_embed
+from bot.utils.metrics import StartupTimer
+from bot.change_detector import ProfileChangeDetector
+from bot.rate_limiter import RateLimiter
+from bot.utils.scheduler import JobScheduler
+from bot.scrape_queue import ScrapeQueue, scrape_priority, PRIORITY_INTERACTIVE
+from bot.config import INTERACTIVE_SCRAPE_TIMEOUT_SECONDS
 
 @discord.app_commands.default_permissions(administrator=True)
 class AdminCog(commands.Cog):
-    def __init__(self, bot: commands.Bot, session_service: SessionService, identity_service: IdentityService, error_handler: ScrapeErrorHandler):
+    def __init__(self, bot: commands.Bot, session_service: SessionService, identity_service: IdentityService, error_handler: ScrapeErrorHandler, scheduler: JobScheduler | None = None, scrape_queue: ScrapeQueue | None = None, change_detector: ProfileChangeDetector | None = None, rate_limiter: RateLimiter | None = None, stage_stats: dict | None = None, startup_timer: StartupTimer | None = None):
         self.bot = bot
         self.session_service = session_service
         self.identity_service = identity_service
         self.error_handler = error_handler
+        self.scheduler = scheduler
+        self.scrape_queue = scrape_queue
+        self.change_detector = change_detector
+        self.rate_limiter = rate_limiter
+        self.stage_stats = stage_stats or {}
+        self.startup_timer = startup_timer
 
     @discord.app_commands.command(name="botstatus", description="Checks the operational status of the bot.")
     async def botstatus(self, interaction: discord.Interaction):
         system_status = "DOWN" if self.error_handler.system_is_down else "UP"
         session_count = self.session_service.get_session_count()
         desc = f"**System Status:** {system_status}\n**Active Sessions:** {session_count}"
+        persist = self.session_service.persist_stats
+        if persist["writes"] or persist["writes_avoided"]:
+            desc += f" ({persist['writes']} session writes, {persist['writes_avoided']} avoided by batching)"
+        if self.scheduler:
+            desc += "\n\n**Jobs:**"
+            for job in self.scheduler.get_job_stats():
+                since = job["seconds_since_last_run"]
+                last_run = f"{since:.0f}s ago" if since is not None else "never"
+                desc += (f"\n`{job['name']}` every {job['interval']}s — last run {last_run}, lag {job['lag']:.1f}s"
+                         f", overruns {job['overruns']}, dropped {job['dropped']}")
+        if self.scrape_queue:
+            cache = self.scrape_queue.profile_cache.stats()
+            desc += (f"\n\n**Profile Cache:** {cache['hit_rate']:.0%} hit rate — {cache['hits']} hits, "
+                     f"{cache['coalesced']} coalesced, {cache['misses']} misses, {cache['entries']} cached")
+            restarts = self.scrape_queue.restart_stats()
+            if restarts["restarts"] or restarts["watchdog_kills"]:
+                avg = lambda ms: f" (avg {ms:.0f} ms)" if ms is not None else ""
+                desc += (f"\n\n**Browser Restarts:** {restarts['restarts']} — {restarts['standby_swaps']} standby swaps"
+                         f"{avg(restarts['avg_swap_ms'])}, {restarts['cold_starts']} cold starts{avg(restarts['avg_cold_start_ms'])}"
+                         f", {restarts['watchdog_kills']} watchdog kills, {restarts['recycles']} recycles")
+            if restarts["rss_mb"] is not None:
+                desc += f"\n**Chrome Footprint:** {restarts['rss_mb']:.0f} MB at last sample"
+            breakers = self.scrape_queue.breakers.stats()
+            if breakers["refused"] or breakers["players_open"] or any(b["state"] != "closed" for b in breakers["endpoints"].values()):
+                endpoints = " • ".join(
+                    f"{name} {b['state'].replace('_', '-')}" + (f" (retry in {b['retry_in']:.0f}s)" if b["state"] == "open" else "")
+                    for name, b in breakers["endpoints"].items()
+                )
+                desc += (f"\n\n**Circuit Breakers:** {endpoints} — {len(breakers['players_open'])} players skipped, "
+                         f"{breakers['refused']} scrapes refused")
+        sweep = self.identity_service.last_sweep
+        if sweep:
+            desc += f"\n\n**Last Profile Sweep:** {IdentityService._format_breakdown(sweep['results'])}"
+            if self.scrape_queue:
+                quarantined = self.scrape_queue.breakers.quarantined()
+                if quarantined:
+                    desc += f" — {len(quarantined)} quarantined, next retry in {min(quarantined.values()):.0f}s"
+        startup = self.startup_timer.snapshot() if self.startup_timer else None
+        if startup and startup["first_scrape_seconds"] is not None:
+            desc += f"\n\n**Startup:** first successful scrape {startup['first_scrape_seconds']:.1f}s after {startup['label']}"
+        stages = [stats.snapshot() for stats in self.stage_stats.values()]
+        if any(stage["count"] for stage in stages):
+            desc += "\n\n**Scrape Stages:** " + " • ".join(
+                f"{stage['name']} {stage['per_second']:.2f}/s (avg {stage['avg_ms']:.0f} ms, {stage['count']} pages)" for stage in stages
+            )
+        limit = self.rate_limiter.stats() if self.rate_limiter else None
+        if limit and (limit["delayed"] or limit["backoffs"]):
+            backoff = f" (last: {limit['last_backoff_reason']})" if limit["backoffs"] else ""
+            desc += (f"\n\n**Rate Limit:** {limit['rate']:.2f} of {limit['max_rate']:.2f} requests/s — {limit['delayed']} of "
+                     f"{limit['requests']} requests waited (avg {limit['avg_wait_ms']:.0f} ms), {limit['backoffs']} backoffs{backoff}")
+        changes = self.change_detector.stats() if self.change_detector else None
+        if changes and changes["checked"]:
+            desc += (f"\n\n**Change Detection:** {changes['skip_ratio']:.0%} of profile pages unchanged — "
+                     f"{changes['unchanged']} of {changes['checked']} parses skipped")
         embed = create_embed(title="Bot Status", description=desc, theme="default")
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @discord.app_commands.command(name="force_checkout", description="Forcibly ends a user's session.")
     async def force_checkout(self, interaction: discord.Interaction, user: discord.User):
-        result = await self.session_service.force_checkout(str(user.id))
+        with scrape_priority(PRIORITY_INTERACTIVE, timeout=INTERACTIVE_SCRAPE_TIMEOUT_SECONDS):
+            result = await self.session_service.force_checkout(str(user.id))
         if result:
             embed = create_embed(title="Force Checkout", description=f"Successfully checked out {user.display_name}.", theme="success")
         else:
@@ -45,4 +112,10 @@ async def setup(bot: commands.Bot):
     error_handler = getattr(bot, "error_handler", None)
     if not all([session_service, identity_service, error_handler]):
         raise RuntimeError("One or more required services are not attached to the bot.")
-    await bot.add_cog(AdminCog(bot, session_service, identity_service, error_handler))
\ No newline at end of file
+    scheduler = getattr(bot, "scheduler", None)
+    scrape_queue = getattr(bot, "scrape_queue", None)
+    change_detector = getattr(bot, "change_detector", None)
+    rate_limiter = getattr(bot, "rate_limiter", None)
+    stage_stats = getattr(bot, "stage_stats", None)
+    startup_timer = getattr(bot, "startup_timer", None)
+    await bot.add_cog(AdminCog(bot, session_service, identity_service, error_handler, scheduler, scrape_queue, change_detector, rate_limiter, stage_stats, startup_timer))
\ No newline at end of file
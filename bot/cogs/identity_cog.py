@@ -2,6 +2,8 @@ import discord
 from discord.ext import commands
 from bot.core.identity_service import IdentityService
 from bot.utils.embed_factory import create_embed
+from bot.scrape_queue import scrape_priority, PRIORITY_INTERACTIVE
+from bot.config import INTERACTIVE_SCRAPE_TIMEOUT_SECONDS
 
 class IdentityCog(commands.Cog):
     def __init__(self, bot: commands.Bot, identity_service: IdentityService):
@@ -11,7 +13,8 @@ class IdentityCog(commands.Cog):
     @discord.app_commands.command(name="linkid", description="Link your SDVX ID to your Discord account.")
     @discord.app_commands.describe(sdvx_id="Your 8-digit SDVX ID (e.g., 1234-5678).")
     async def linkid(self, interaction: discord.Interaction, sdvx_id: str):
-        success = await self.identity_service.link_user(str(interaction.user.id), sdvx_id)
+        with scrape_priority(PRIORITY_INTERACTIVE, timeout=INTERACTIVE_SCRAPE_TIMEOUT_SECONDS):
+            success = await self.identity_service.link_user(str(interaction.user.id), sdvx_id)
 
         if success:
             embed = create_embed(
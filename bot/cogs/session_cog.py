@@ -4,7 +4,8 @@ from discord.ext import commands
 from bot.core.session_service import SessionService
 from bot.core.identity_service import IdentityService
 from bot.utils.embed_factory import create_embed
-from bot.config import log
+from bot.scrape_queue import scrape_priority, PRIORITY_INTERACTIVE
+from bot.config import log, INTERACTIVE_SCRAPE_TIMEOUT_SECONDS
 
 class SessionCog(commands.Cog):
     def __init__(self, bot: commands.Bot, session_service: SessionService, identity_service: IdentityService):
@@ -51,15 +52,16 @@ class SessionCog(commands.Cog):
     async def checkout(self, interaction: discord.Interaction):
         user_id = str(interaction.user.id)
         log.info(f"CHECKOUT_COG: Received command from {user_id}")
-        
-        session_summary = await self.session_service.end_session(user_id)
+        if user_id not in self.session_service.get_session_discord_ids():
+            await interaction.response.send_message(embed=self._no_session_embed(), ephemeral=True)
+            return
+
+        # The summary waits on a profile scrape, which can take longer than Discord's 3s reply window.
+        await interaction.response.defer()
+        with scrape_priority(PRIORITY_INTERACTIVE, timeout=INTERACTIVE_SCRAPE_TIMEOUT_SECONDS):
+            session_summary = await self.session_service.end_session(user_id)
         if not session_summary:
-            embed = create_embed(
-                title="Checkout Failed",
-                description="No active session found to check out.",
-                theme="error"
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=self._no_session_embed(), ephemeral=True)
             return
 
         initial_vf = session_summary.get('initial_volforce')
@@ -84,7 +86,15 @@ class SessionCog(commands.Cog):
             theme="summary",
             fields=fields
         )
-        await interaction.response.send_message(embed=embed)
+        await interaction.followup.send(embed=embed)
+
+    @staticmethod
+    def _no_session_embed() -> discord.Embed:
+        return create_embed(
+            title="Checkout Failed",
+            description="No active session found to check out.",
+            theme="error"
+        )
 
     @discord.app_commands.command(name="break", description="Pause your current session.")
     async def break_session(self, interaction: discord.Interaction):
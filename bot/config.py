@@ -1,5 +1,6 @@
 import os
 import logging
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -35,8 +36,218 @@ CHROME_USER_DATA_DIR = os.getenv('CHROME_USER_DATA_DIR')
 CHROME_PROFILE_DIR = os.getenv('CHROME_PROFILE_DIR')
 ARCADE_ID = os.getenv("ARCADE_ID", "94")
 
-# Example: Base URL for Eagle's SDVX profile pages
-# SDVX_PROFILE_BASE_URL = "https://eagle.ac/game/sdvx/profile/"
+# Base URL for all eagle.ac pages (profile: /game/sdvx/profile/<id>, arcade: /arcade/<id>)
+EAGLE_BASE_URL = os.getenv("EAGLE_BASE_URL", "https://eagle.ac")
 
-# Example: Base URL for Eagle's arcade leaderboard
-# SDVX_LEADERBOARD_URL = "https://eagle.ac/game/sdvx/arcade_leaderboard"
+# The eagle.ac cookie jar is saved here after every login and restored into Chrome and the
+# HTTP client on startup. The kailua login only runs again, in the headless browser, when a
+# scrape finds the session expired. Each login step waits at most EAGLE_LOGIN_STEP_SECONDS.
+EAGLE_COOKIE_FILE = os.getenv("EAGLE_COOKIE_FILE", "data/eagle_cookies.json")
+EAGLE_LOGIN_STEP_SECONDS = float(os.getenv("EAGLE_LOGIN_STEP_SECONDS", "15"))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Scraping Backend
+# ──────────────────────────────────────────────────────────────────────────────
+# 'selenium' drives the headless Chrome for every page load. 'http' fetches pages
+# with aiohttp using the session cookies exported from Chrome, and only falls back
+# to Selenium when the HTTP fetch fails or the session has expired. 'cdp' drives one
+# headless Chrome directly over the DevTools Protocol (an asyncio websocket, no
+# chromedriver) with CDP_PAGE_TARGETS tabs scraping at once.
+SCRAPE_BACKEND = os.getenv("SCRAPE_BACKEND", "selenium").lower()
+CDP_PAGE_TARGETS = int(os.getenv("CDP_PAGE_TARGETS", "4"))
+CHROME_BINARY_PATH = os.getenv("CHROME_BINARY_PATH", "google-chrome")
+# ws://.../devtools/browser/... of an already running Chrome to use instead of launching one.
+CHROME_CDP_URL = os.getenv("CHROME_CDP_URL")
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "8"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "15"))
+# How the Selenium backend reads a loaded page. 'soup' transfers page_source and parses it
+# with BeautifulSoup; 'js' runs one execute_script call that returns only the fields we use.
+# 'js' falls back to 'soup' if the script fails.
+SCRAPE_EXTRACTION = os.getenv("SCRAPE_EXTRACTION", "soup").lower()
+# BeautifulSoup tree builder for the 'soup' extraction and the HTTP backend. 'auto' uses
+# lxml when it is installed and html.parser otherwise.
+HTML_PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "auto").lower()
+
+# ──────────────────────────────────────────────────────────────────────────────
+# eagle.ac Rate Limit
+# ──────────────────────────────────────────────────────────────────────────────
+# Every request to eagle.ac, on every backend (profile and leaderboard pages, logins, login
+# checks), takes a token from one shared bucket: EAGLE_RATE_LIMIT_PER_SECOND requests per
+# second, in bursts of up to EAGLE_RATE_LIMIT_BURST (0 = no limit). The rate is halved on a
+# 429/5xx, a challenge page or a page slower than EAGLE_SLOW_RESPONSE_SECONDS, down to
+# EAGLE_RATE_LIMIT_MIN_PER_SECOND, and climbs back while pages come back fast.
+EAGLE_RATE_LIMIT_PER_SECOND = float(os.getenv("EAGLE_RATE_LIMIT_PER_SECOND", "2"))
+EAGLE_RATE_LIMIT_BURST = int(os.getenv("EAGLE_RATE_LIMIT_BURST", "4"))
+EAGLE_RATE_LIMIT_MIN_PER_SECOND = float(os.getenv("EAGLE_RATE_LIMIT_MIN_PER_SECOND", "0.2"))
+EAGLE_SLOW_RESPONSE_SECONDS = float(os.getenv("EAGLE_SLOW_RESPONSE_SECONDS", "8"))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Headless Browser
+# ──────────────────────────────────────────────────────────────────────────────
+# Lean scraping profile: block images, fonts, stylesheets and third-party scripts through
+# CDP and stop waiting for the page once the DOM is ready ('eager'). Page latency and bytes
+# transferred are logged per scrape either way, so the two modes can be compared.
+CHROME_LEAN_PROFILE = os.getenv("CHROME_LEAN_PROFILE", "True").lower() == "true"
+CHROME_PAGE_LOAD_STRATEGY = os.getenv("CHROME_PAGE_LOAD_STRATEGY", "eager" if CHROME_LEAN_PROFILE else "normal").lower()
+# 'none' would let driver.get return before the navigation commits, and the wait for the
+# scraped element could then match the previous page (another player's Score Log).
+if CHROME_PAGE_LOAD_STRATEGY not in ("eager", "normal"):
+    log.warning(f"CHROME_PAGE_LOAD_STRATEGY '{CHROME_PAGE_LOAD_STRATEGY}' is not supported; using 'eager'.")
+    CHROME_PAGE_LOAD_STRATEGY = "eager"
+
+# Number of headless Chrome drivers used for scraping. Chrome locks a user-data-dir
+# to a single process, so every driver after the first runs on a copy of the logged-in
+# profile under CHROME_POOL_DIR.
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+CHROME_POOL_DIR = os.getenv("CHROME_POOL_DIR", os.path.join(tempfile.gettempdir(), "eagle-bot-pool"))
+# Warm standby: each browser keeps a second headless Chrome, started in the background on
+# its own copy of the profile, and swaps it in when its driver dies instead of cold-starting
+# Chrome inline. Costs one extra Chrome process per browser, so it is off by default.
+CHROME_WARM_STANDBY = os.getenv("CHROME_WARM_STANDBY", "False").lower() == "true"
+# Hard deadline for one page navigation (load, wait and read). A driver still busy after it
+# is treated as hung and its chromedriver process tree is killed. 0 disables the watchdog.
+CHROME_NAVIGATION_DEADLINE_SECONDS = float(os.getenv("CHROME_NAVIGATION_DEADLINE_SECONDS", "45"))
+# Memory budget mode for small hosts: low-footprint Chrome flags, the profile cloned into a
+# tmpfs directory, and the driver recycled between scrapes once the RSS of the chromedriver +
+# Chrome process tree passes CHROME_MEMORY_BUDGET_MB or the driver has loaded
+# CHROME_RECYCLE_AFTER_PAGES pages (0 = no page limit). The footprint is sampled and logged
+# every CHROME_RSS_SAMPLE_PAGES page loads.
+CHROME_MEMORY_BUDGET_MODE = os.getenv("CHROME_MEMORY_BUDGET_MODE", "False").lower() == "true"
+CHROME_MEMORY_BUDGET_MB = int(os.getenv("CHROME_MEMORY_BUDGET_MB", "600"))
+CHROME_RECYCLE_AFTER_PAGES = int(os.getenv("CHROME_RECYCLE_AFTER_PAGES", "500"))
+CHROME_RSS_SAMPLE_PAGES = int(os.getenv("CHROME_RSS_SAMPLE_PAGES", "10"))
+CHROME_TMPFS_DIR = os.getenv("CHROME_TMPFS_DIR", "/dev/shm/eagle-bot" if os.path.isdir("/dev/shm") else os.path.join(tempfile.gettempdir(), "eagle-bot-tmpfs"))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Browser Lifecycle
+# ──────────────────────────────────────────────────────────────────────────────
+# The headless browser follows the arcade schedule: it is started (and its eagle.ac login
+# checked) BROWSER_PREWARM_MINUTES before each opening and shut down
+# BROWSER_SHUTDOWN_GRACE_MINUTES after closing. A scrape outside those hours (a command, a
+# session closed after hours) starts it on demand; the next check shuts it down again.
+BROWSER_LIFECYCLE_ENABLED = os.getenv("BROWSER_LIFECYCLE_ENABLED", "True").lower() == "true"
+BROWSER_PREWARM_MINUTES = int(os.getenv("BROWSER_PREWARM_MINUTES", "10"))
+BROWSER_SHUTDOWN_GRACE_MINUTES = int(os.getenv("BROWSER_SHUTDOWN_GRACE_MINUTES", "15"))
+CHRONOS_BROWSER_LIFECYCLE_SECONDS = int(os.getenv("CHRONOS_BROWSER_LIFECYCLE_SECONDS", "60"))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Player Store
+# ──────────────────────────────────────────────────────────────────────────────
+# Players, their recent plays and finished sessions live in one SQLite database (WAL mode).
+# On first start, with the database still empty, data/users.json is imported into it once;
+# the JSON file is left in place as a backup.
+PLAYER_DB_PATH = os.getenv("PLAYER_DB_PATH", "data/eagle.db")
+# The roster is held in memory and read from there; changed players are written to the
+# database in one batch at most PLAYER_FLUSH_SECONDS after the first change, and on shutdown.
+PLAYER_FLUSH_SECONDS = float(os.getenv("PLAYER_FLUSH_SECONDS", "2"))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Session Persistence
+# ──────────────────────────────────────────────────────────────────────────────
+# Session changes are written at most SESSION_FLUSH_SECONDS after the first change, and on
+# shutdown, so every transition made in one tick costs a single (fsynced) write.
+SESSION_FLUSH_SECONDS = float(os.getenv("SESSION_FLUSH_SECONDS", "5"))
+# Transitions are appended as events to the session journal next to sessions.json. Once it
+# holds SESSION_JOURNAL_COMPACT_EVENTS events (and on shutdown) the current sessions are
+# written to sessions.json as a snapshot and the journal starts over; startup replays the
+# snapshot plus the journal.
+SESSION_JOURNAL_COMPACT_EVENTS = int(os.getenv("SESSION_JOURNAL_COMPACT_EVENTS", "500"))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Player Tracking Tiers
+# ──────────────────────────────────────────────────────────────────────────────
+# Profiles are scraped on a per-tier cadence instead of every tick:
+#   active_session  - linked players with an open session, or any activity in the last
+#                     TRACKING_PROMOTION_MINUTES (detected activity promotes a player here)
+#   linked_active   - linked players who played within TRACKING_RECENT_DAYS
+#   linked_dormant  - linked players who haven't played in longer than that
+#   unlinked        - players known only from the arcade leaderboard
+# A budget caps how many profiles of a tier are scraped per tick (0 = no cap); players over
+# budget stay due and are picked first on the next tick.
+TRACKING_CADENCE_SECONDS = {
+    "active_session": int(os.getenv("TRACKING_ACTIVE_SESSION_SECONDS", "0")),
+    "linked_active": int(os.getenv("TRACKING_LINKED_ACTIVE_SECONDS", "300")),
+    "linked_dormant": int(os.getenv("TRACKING_LINKED_DORMANT_SECONDS", "3600")),
+    "unlinked": int(os.getenv("TRACKING_UNLINKED_SECONDS", "21600")),
+}
+TRACKING_BUDGET_PER_TICK = {
+    "active_session": int(os.getenv("TRACKING_ACTIVE_SESSION_BUDGET", "0")),
+    "linked_active": int(os.getenv("TRACKING_LINKED_ACTIVE_BUDGET", "20")),
+    "linked_dormant": int(os.getenv("TRACKING_LINKED_DORMANT_BUDGET", "5")),
+    "unlinked": int(os.getenv("TRACKING_UNLINKED_BUDGET", "3")),
+}
+TRACKING_RECENT_DAYS = int(os.getenv("TRACKING_RECENT_DAYS", "14"))
+TRACKING_PROMOTION_MINUTES = int(os.getenv("TRACKING_PROMOTION_MINUTES", "60"))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Chronos Job Schedule
+# ──────────────────────────────────────────────────────────────────────────────
+# Chronos runs independent fixed-rate jobs instead of one sequential tick. Each start
+# is delayed by up to CHRONOS_JOB_JITTER_SECONDS so jobs don't fire in lockstep.
+CHRONOS_LEADERBOARD_SECONDS = int(os.getenv("CHRONOS_LEADERBOARD_SECONDS", "300"))
+CHRONOS_PROFILE_SWEEP_SECONDS = int(os.getenv("CHRONOS_PROFILE_SWEEP_SECONDS", "60"))
+CHRONOS_STALE_SESSION_SECONDS = int(os.getenv("CHRONOS_STALE_SESSION_SECONDS", "5"))
+CHRONOS_JOB_JITTER_SECONDS = float(os.getenv("CHRONOS_JOB_JITTER_SECONDS", "2"))
+# Low-priority jobs are dropped for a slot while a higher-priority job is overrunning
+# or started more than this many seconds late.
+SCHEDULER_LAG_THRESHOLD_SECONDS = float(os.getenv("SCHEDULER_LAG_THRESHOLD_SECONDS", "10"))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Parse Stage
+# ──────────────────────────────────────────────────────────────────────────────
+# Fetched pages are parsed in a process pool so the driver can load the next page meanwhile
+# and parsing never holds the GIL the event loop needs. 0 parses in a thread instead.
+PARSE_POOL_WORKERS = int(os.getenv("PARSE_POOL_WORKERS", str(min(2, os.cpu_count() or 1))))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Scrape Queue
+# ──────────────────────────────────────────────────────────────────────────────
+# Every scrape goes through one priority queue in front of the browser pool:
+# interactive commands (/linkid, /checkout) > players with an open session > background sweeps.
+# A profile scrape holds its queue worker, and its slot in a profile sweep, through both the
+# fetch and the parse stage. Both therefore default to one per driver (or DevTools page
+# target) plus one per parser process, so a driver handed back after its fetch can start the
+# next page while the previous one is still being parsed.
+# Maximum number of profile scrapes in flight during a profile sweep.
+PROFILE_SCRAPE_CONCURRENCY = int(os.getenv(
+    "PROFILE_SCRAPE_CONCURRENCY", str((CDP_PAGE_TARGETS if SCRAPE_BACKEND == "cdp" else BROWSER_POOL_SIZE) + PARSE_POOL_WORKERS)
+))
+SCRAPE_QUEUE_WORKERS = int(os.getenv("SCRAPE_QUEUE_WORKERS", str(PROFILE_SCRAPE_CONCURRENCY)))
+# Deadline for scrapes made while answering a slash command. Discord expects a response within
+# 3 seconds, so past this the command falls back to the cached profile.
+INTERACTIVE_SCRAPE_TIMEOUT_SECONDS = float(os.getenv("INTERACTIVE_SCRAPE_TIMEOUT_SECONDS", "2.5"))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Circuit Breakers
+# ──────────────────────────────────────────────────────────────────────────────
+# Scrape outcomes are tracked per endpoint (leaderboard, profile pages) and per player. A
+# breaker opens once at least BREAKER_MIN_CALLS outcomes in the last BREAKER_WINDOW_SECONDS
+# are BREAKER_FAILURE_RATE failures; scrapes through an open breaker fail at once without
+# loading a page. After BREAKER_OPEN_SECONDS one trial scrape is let through: success closes
+# the breaker, failure opens it again. An open endpoint breaker marks the system DOWN.
+BREAKER_FAILURE_RATE = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "5"))
+BREAKER_WINDOW_SECONDS = float(os.getenv("BREAKER_WINDOW_SECONDS", "300"))
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", "60"))
+# Players are scraped less often, so their breakers look further back and stay open longer.
+PLAYER_BREAKER_MIN_CALLS = int(os.getenv("PLAYER_BREAKER_MIN_CALLS", "3"))
+PLAYER_BREAKER_WINDOW_SECONDS = float(os.getenv("PLAYER_BREAKER_WINDOW_SECONDS", "1800"))
+PLAYER_BREAKER_OPEN_SECONDS = float(os.getenv("PLAYER_BREAKER_OPEN_SECONDS", "600"))
+# A quarantined player's breaker stays open twice as long after each failed trial, up to this.
+PLAYER_BREAKER_MAX_OPEN_SECONDS = float(os.getenv("PLAYER_BREAKER_MAX_OPEN_SECONDS", "21600"))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Profile Cache
+# ──────────────────────────────────────────────────────────────────────────────
+# Scraped profiles are reused for PROFILE_CACHE_TTL_SECONDS (least recently used entries are
+# evicted past PROFILE_CACHE_MAX_ENTRIES), and concurrent requests for the same player share
+# one in-flight scrape. Interactive requests only accept entries younger than
+# PROFILE_CACHE_INTERACTIVE_MAX_AGE_SECONDS, so /checkout still sees the latest plays.
+PROFILE_CACHE_TTL_SECONDS = float(os.getenv("PROFILE_CACHE_TTL_SECONDS", "30"))
+PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "512"))
+PROFILE_CACHE_INTERACTIVE_MAX_AGE_SECONDS = float(os.getenv("PROFILE_CACHE_INTERACTIVE_MAX_AGE_SECONDS", "5"))
+# Profiles that turned out not to exist or to have no Score Log are not scraped again for this long.
+PROFILE_NEGATIVE_CACHE_TTL_SECONDS = float(os.getenv("PROFILE_NEGATIVE_CACHE_TTL_SECONDS", "1800"))
+# Change detection remembers the last parsed page of at most this many players; the least
+# recently scraped are forgotten first.
+PROFILE_CHANGE_MAX_PLAYERS = int(os.getenv("PROFILE_CHANGE_MAX_PLAYERS", "1024"))
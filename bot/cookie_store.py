@@ -0,0 +1,73 @@
+# bot/cookie_store.py
+import os
+import json
+import time
+import asyncio
+import tempfile
+
+from bot.config import log, EAGLE_COOKIE_FILE
+
+# Fields Network.setCookies accepts; the rest of an exported cookie (size, session, priority...) is read-only.
+CDP_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+
+def cdp_cookie_params(cookies: list) -> list:
+    """Exported cookies trimmed to what Network.setCookies takes. Session cookies (expires -1) get no expiry."""
+    params = []
+    for cookie in cookies:
+        param = {key: cookie[key] for key in CDP_COOKIE_FIELDS if key in cookie}
+        if param.get("expires", -1) < 0:
+            param.pop("expires", None)
+        params.append(param)
+    return params
+
+
+class CookieStore:
+    """
+    The eagle.ac cookie jar on disk, in the format Chrome exports over CDP ({name, value,
+    domain, path, expires, ...}). It is saved after every login and restored into Chrome and the
+    HTTP client on startup, so a restart doesn't have to log in again. One store is shared by
+    every browser in a pool: version goes up on each save, and the lock keeps the browsers from
+    logging in at the same time.
+    """
+    def __init__(self, path: str = EAGLE_COOKIE_FILE):
+        self.path = path
+        self.version = 0
+        self.user_agent = None
+        self.lock = asyncio.Lock()
+
+    def load(self) -> list:
+        """The saved cookies that have not expired; [] if there is no usable jar."""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, json.JSONDecodeError) as e:
+            log.warning(f"COOKIE_STORE: Could not read {self.path}: {e}")
+            return []
+        self.user_agent = data.get("user_agent")
+        now = time.time()
+        cookies = data.get("cookies", [])
+        live = [c for c in cookies if c.get("expires", -1) < 0 or c["expires"] > now]
+        if len(live) < len(cookies):
+            log.info(f"COOKIE_STORE: Dropped {len(cookies) - len(live)} expired cookies from {self.path}.")
+        return live
+
+    def save(self, cookies: list, user_agent: str | None = None):
+        """Writes the jar atomically (temp file + rename), readable by the owner only."""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".cookies-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"saved_at": time.time(), "user_agent": user_agent, "cookies": cookies}, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.user_agent = user_agent
+        self.version += 1
+        log.info(f"COOKIE_STORE: Saved {len(cookies)} eagle.ac cookies to {self.path}.")
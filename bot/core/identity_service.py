@@ -1,94 +1,132 @@
 # bot/core/identity_service.py
-import json
 import re
 import asyncio
-import os
 from datetime import datetime, timezone
 from bot.eagle_browser import EagleBrowser
-from bot.config import log
+from collections import Counter
+from bot.eagle_errors import ScrapeError, SessionExpiredError, ProfileUnavailableError, CircuitOpenError
+from bot.eagle_parser import play_fingerprint
+from bot.scrape_queue import scrape_priority, PRIORITY_ACTIVE_SESSION, PRIORITY_BACKGROUND
+from bot.core.tracking_policy import TrackingPolicy
+from bot.player_store import PlayerStore
+from bot.player_cache import PlayerCache
+from bot.config import log, PROFILE_SCRAPE_CONCURRENCY
 
-class IdentityService:
-    def __init__(self, users_file_path: str, browser: EagleBrowser):
-        self.users_file_path = users_file_path
-        self.browser = browser
+# Outcome of one player's profile scrape within a sweep.
+SCRAPE_OK = "ok"
+SCRAPE_TIMEOUT = "timeout"
+SCRAPE_PARSE_ERROR = "parse_error"
+SCRAPE_AUTH_EXPIRED = "auth_expired"
+SCRAPE_UNAVAILABLE = "unavailable"
+SCRAPE_FAILED = "failed"
+SCRAPE_SKIPPED = "skipped"
 
-    def _blocking_read_users(self) -> dict:
-        try:
-            with open(self.users_file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-        except Exception as e:
-            log.error(f"!!! FAILED TO READ from {self.users_file_path}: {e}", exc_info=True)
-            return {}
 
-    def _blocking_write_users(self, data: dict):
-        try:
-            os.makedirs(os.path.dirname(self.users_file_path), exist_ok=True)
-            with open(self.users_file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            log.error(f"!!! FAILED TO WRITE to {self.users_file_path}: {e}", exc_info=True)
+def classify_scrape_error(e: Exception) -> str:
+    """Maps an exception from a profile scrape to its sweep outcome."""
+    if isinstance(e, CircuitOpenError):
+        return SCRAPE_SKIPPED
+    if isinstance(e, SessionExpiredError):
+        return SCRAPE_AUTH_EXPIRED
+    if isinstance(e, TimeoutError):
+        return SCRAPE_TIMEOUT
+    if isinstance(e, ProfileUnavailableError):
+        return SCRAPE_UNAVAILABLE
+    if isinstance(e, ScrapeError):
+        return SCRAPE_FAILED
+    # Anything else escaped the parser (or the page was malformed in a way it didn't expect).
+    return SCRAPE_PARSE_ERROR
+
+
+class ProfileScrapeResult:
+    def __init__(self, sdvx_id: str, status: str, profile: dict | None = None, error: Exception | None = None):
+        self.sdvx_id = sdvx_id
+        self.status = status
+        self.profile = profile or {}
+        self.error = error
+
+
+class IdentityService:
+    def __init__(self, player_store: PlayerStore, browser: EagleBrowser, scrape_concurrency: int = PROFILE_SCRAPE_CONCURRENCY, tracking_policy: TrackingPolicy | None = None, player_cache: PlayerCache | None = None):
+        self.player_store = player_store
+        # The in-memory roster; reads come from here and changes are written behind to the store.
+        self.players = player_cache or PlayerCache(player_store)
+        self.browser = browser
+        self.scrape_concurrency = max(1, scrape_concurrency)
+        # Without a tracking policy every known player is scraped on every update.
+        self.tracking_policy = tracking_policy
+        # Serializes read-modify-write of the roster (the player cache) between scheduled jobs.
+        self._users_lock = asyncio.Lock()
+        # Running totals of profile scrape outcomes as applied to the store.
+        self.profile_outcomes = {"updated": 0, "unchanged": 0, "failed": 0}
+        # Per-status counts of the last sweep's profile scrapes, and running totals.
+        self.last_sweep = None
+        self.sweep_results = Counter()
 
     async def _read_users(self) -> dict:
-        return await asyncio.to_thread(self._blocking_read_users)
+        return self.players.snapshot()
 
     async def _write_users(self, data: dict):
-        await asyncio.to_thread(self._blocking_write_users, data)
+        self.players.put_many(data)
 
     async def get_user_by_discord_id(self, discord_id: str) -> dict | None:
-        users = await self._read_users()
-        # This linear scan is acceptable for a small number of users.
-        for sdvx_id, user_data in users.items():
-            if user_data.get("discord_id") == discord_id:
-                return user_data
-        return None
+        return self.players.get_by_discord_id(discord_id)
 
     async def link_user(self, discord_id: str, sdvx_id: str) -> bool:
         if not re.fullmatch(r"\d{8}|\d{4}-\d{4}", sdvx_id): return False
         
         normalized_id = sdvx_id.replace("-", "")
-        users = await self._read_users()
-
-        # Unlink any existing account associated with this Discord ID
-        for player_data in users.values():
-            if player_data.get("discord_id") == discord_id:
-                player_data["discord_id"] = None
 
-        player_profile = users.get(normalized_id, {"sdvx_id": normalized_id})
-        
         # Immediately scrape to get the player's name
-        profile_data = await self.browser.scrape_player_profile(normalized_id)
-        if profile_data and profile_data.get("player_name"):
-            player_profile["player_name"] = profile_data["player_name"]
+        try:
+            profile_data = await self.browser.scrape_player_profile(normalized_id)
+        except ScrapeError as e:
+            log.warning(f"IDENTITY_SERVICE: Profile scrape for {normalized_id} failed while linking; linking without a name. {e}")
+            profile_data = None
+
+        # The scrape runs without the lock; only the players this link touches are written
+        # back, from a fresh read, so a sweep that finished meanwhile is kept.
+        async with self._users_lock:
+            users = await self._read_users()
+            changed = {}
+
+            # Unlink any existing account associated with this Discord ID
+            for player_id, player_data in users.items():
+                if player_data.get("discord_id") == discord_id:
+                    player_data["discord_id"] = None
+                    changed[player_id] = player_data
 
-        player_profile["discord_id"] = discord_id
-        player_profile["last_updated"] = datetime.now(timezone.utc).isoformat()
+            player_profile = users.get(normalized_id, {"sdvx_id": normalized_id})
+            if profile_data and profile_data.get("player_name"):
+                player_profile["player_name"] = profile_data["player_name"]
 
-        users[normalized_id] = player_profile
-        await self._write_users(users)
+            player_profile["discord_id"] = discord_id
+            player_profile["last_updated"] = datetime.now(timezone.utc).isoformat()
+
+            changed[normalized_id] = player_profile
+            await self._write_users(changed)
         return True
 
     async def force_unlink(self, discord_id_to_unlink: str) -> bool:
-        users = await self._read_users()
-        user_profile = await self.get_user_by_discord_id(discord_id_to_unlink)
-        if not user_profile: return False
-        user_profile["discord_id"] = None
-        await self._write_users(users)
+        async with self._users_lock:
+            users = await self._read_users()
+            sdvx_id = next((i for i, u in users.items() if u.get("discord_id") == discord_id_to_unlink), None)
+            if not sdvx_id: return False
+            users[sdvx_id]["discord_id"] = None
+            await self._write_users({sdvx_id: users[sdvx_id]})
         return True
 
-    async def update_player_cache(self) -> list:
+    async def _scrape_leaderboard(self) -> list:
         try:
-            leaderboard_players = await self.browser.scrape_leaderboard()
+            return await self.browser.scrape_leaderboard()
         except Exception as e:
-            log.error(f"Leaderboard scraping failed in update_player_cache: {e}", exc_info=True)
+            log.error(f"Leaderboard scraping failed in refresh_leaderboard: {e}", exc_info=True)
             raise
 
-        users = await self._read_users()
+    def _apply_leaderboard(self, users: dict, leaderboard_players: list, now: datetime) -> list:
+        """Discovers new players from the leaderboard and updates core stats. Returns the new players' names."""
         newly_discovered_players = []
-        now_iso = datetime.now(timezone.utc).isoformat()
-
-        # Pass 1: Discover new players from the leaderboard and update core stats
+        now_iso = now.isoformat()
         for lb_player_data in leaderboard_players:
             sdvx_id = lb_player_data.get("sdvx_id", "").replace("-", "")
             if not sdvx_id: continue
@@ -99,40 +137,179 @@ class IdentityService:
                 log.info(f"IDENTITY_SERVICE: Discovered new player from leaderboard: {lb_player_data.get('player_name')}")
             
             user_profile = users[sdvx_id]
+            if self.tracking_policy and user_profile.get("volforce") is not None and lb_player_data.get("volforce") != user_profile["volforce"]:
+                self.tracking_policy.record_activity(sdvx_id, now)
             user_profile["player_name"] = lb_player_data.get("player_name", user_profile.get("player_name"))
             user_profile["volforce"] = lb_player_data.get("volforce", user_profile.get("volforce"))
             user_profile["rank"] = lb_player_data.get("rank", user_profile.get("rank"))
             user_profile["last_updated"] = now_iso
             log.debug(f"IDENTITY_SERVICE: Updated existing player {user_profile.get('player_name')} from leaderboard.")
+        return newly_discovered_players
 
-        # Pass 2: Enrich all known players with detailed data from individual profile scrapes
-        current_sdvx_ids = list(users.keys())
-        for sdvx_id in current_sdvx_ids:
-            user_profile = users[sdvx_id]
-            profile_data_from_scrape = await self.browser.scrape_player_profile(sdvx_id)
-            
-            if profile_data_from_scrape:
-                # Update player name from profile if available, as it's more authoritative
-                if profile_data_from_scrape.get("player_name") is not None:
-                    user_profile["player_name"] = profile_data_from_scrape["player_name"]
-                
-                # --- NEW LOGIC: Store newly scraped fields ---
-                # Check for `is not None` to avoid overwriting good data with nothing
-                if profile_data_from_scrape.get("volforce") is not None:
-                    user_profile["volforce"] = profile_data_from_scrape["volforce"]
-                if profile_data_from_scrape.get("skill_level") is not None:
-                    user_profile["skill_level"] = profile_data_from_scrape["skill_level"]
-                if profile_data_from_scrape.get("total_plays") is not None:
-                    user_profile["total_plays"] = profile_data_from_scrape["total_plays"]
-                
-                user_profile["recent_plays"] = profile_data_from_scrape.get("recent_plays", [])
-                user_profile["last_updated"] = now_iso
-                log.debug(f"IDENTITY_SERVICE: Enriched profile for {sdvx_id} with details.")
+    async def _scrape_due_profiles(self, users: dict, active_discord_ids: set | None, now: datetime) -> list:
+        """
+        Scrapes the profiles that are due and returns a ProfileScrapeResult per player. The
+        tracking policy picks which players are due; without one every known player is.
+        Scrapes fan out up to scrape_concurrency at a time. Any error is captured in that
+        player's result, so one broken profile can't cost the rest of the sweep.
+        """
+        active_discord_ids = active_discord_ids or set()
+        if self.tracking_policy:
+            sdvx_ids = self.tracking_policy.select_due(users, active_discord_ids, now)
+        else:
+            sdvx_ids = list(users.keys())
+        semaphore = asyncio.Semaphore(self.scrape_concurrency)
+
+        async def scrape_profile(sdvx_id: str) -> ProfileScrapeResult:
+            # Players with an open session go ahead of the rest of the sweep in the scrape queue.
+            priority = PRIORITY_ACTIVE_SESSION if users[sdvx_id].get("discord_id") in active_discord_ids else PRIORITY_BACKGROUND
+            async with semaphore:
+                with scrape_priority(priority):
+                    try:
+                        profile = await self.browser.scrape_player_profile(sdvx_id)
+                    except Exception as e:
+                        status = classify_scrape_error(e)
+                        if status == SCRAPE_SKIPPED:
+                            log.debug(f"IDENTITY_SERVICE: Skipping profile scrape for {sdvx_id}: {e}")
+                        elif status == SCRAPE_PARSE_ERROR:
+                            log.error(f"IDENTITY_SERVICE: Profile for {sdvx_id} could not be read: {type(e).__name__}: {e}", exc_info=True)
+                        else:
+                            log.warning(f"IDENTITY_SERVICE: Profile scrape for {sdvx_id} failed: {type(e).__name__}: {e}")
+                        return ProfileScrapeResult(sdvx_id, status, error=e)
+            # The browser returns {} when the Score Log never appeared.
+            return ProfileScrapeResult(sdvx_id, SCRAPE_OK if profile else SCRAPE_TIMEOUT, profile)
+
+        return list(await asyncio.gather(*(scrape_profile(sdvx_id) for sdvx_id in sdvx_ids)))
+
+    def _apply_sweep(self, users: dict, results: list, now: datetime) -> dict:
+        """
+        Applies a sweep's results to the store and records its outcome breakdown. Players
+        skipped by an open circuit breaker are neither counted as failed nor marked as scraped.
+        """
+        breakdown = Counter(result.status for result in results)
+        self.last_sweep = {"at": now.isoformat(), "results": dict(breakdown)}
+        self.sweep_results.update(breakdown)
+        applied = [result for result in results if result.status != SCRAPE_SKIPPED]
+        return self._apply_profiles(users, [r.sdvx_id for r in applied], [r.profile for r in applied], now)
+
+    @staticmethod
+    def _format_breakdown(results: dict) -> str:
+        return ", ".join(f"{count} {status}" for status, count in sorted(results.items(), key=lambda item: -item[1])) or "no scrapes"
+
+    @staticmethod
+    def _profile_unchanged(user_profile: dict, profile_data_from_scrape: dict) -> bool:
+        """True if storing this scrape would change nothing but last_updated."""
+        for field in ("player_name", "volforce", "skill_level", "total_plays"):
+            value = profile_data_from_scrape.get(field)
+            if value is not None and user_profile.get(field) != value:
+                return False
+        return user_profile.get("recent_plays") == profile_data_from_scrape.get("recent_plays", [])
+
+    def _apply_profiles(self, users: dict, sdvx_ids: list, scraped_profiles: list, now: datetime) -> dict:
+        """
+        Enriches known players with detailed data from their profile scrapes, in roster order.
+        Players whose profile didn't change are left untouched. Returns the count of players
+        updated, unchanged and failed.
+        """
+        outcomes = {"updated": 0, "unchanged": 0, "failed": 0}
+        for sdvx_id, profile_data_from_scrape in zip(sdvx_ids, scraped_profiles):
+            user_profile = users.get(sdvx_id)
+            if user_profile is None: continue
+            # Applied to a copy so a profile the store can't take leaves the player as it was.
+            candidate = dict(user_profile)
+            try:
+                outcome = self._apply_profile(sdvx_id, candidate, profile_data_from_scrape, now)
+            except Exception as e:
+                outcome = "failed"
+                log.error(f"IDENTITY_SERVICE: Could not store profile for {sdvx_id}: {type(e).__name__}: {e}", exc_info=True)
             else:
-                log.warning(f"IDENTITY_SERVICE: Failed to scrape individual profile for {sdvx_id}. Recent plays may be missing.")
-                user_profile["recent_plays"] = user_profile.get("recent_plays", [])
-                user_profile["last_updated"] = now_iso
+                users[sdvx_id] = candidate
+            outcomes[outcome] += 1
+        for outcome, count in outcomes.items():
+            self.profile_outcomes[outcome] += count
+        return outcomes
+
+    def _apply_profile(self, sdvx_id: str, user_profile: dict, profile_data_from_scrape: dict, now: datetime) -> str:
+        """Stores one player's scrape; returns "updated", "unchanged" or "failed"."""
+        if self.tracking_policy:
+            self.tracking_policy.record_scrape(sdvx_id, now)
+            old_plays = user_profile.get("recent_plays") or []
+            new_plays = (profile_data_from_scrape or {}).get("recent_plays") or []
+            if new_plays and old_plays and play_fingerprint(new_plays[0]) != play_fingerprint(old_plays[0]):
+                self.tracking_policy.record_activity(sdvx_id, now)
+        if profile_data_from_scrape and self._profile_unchanged(user_profile, profile_data_from_scrape):
+            log.debug(f"IDENTITY_SERVICE: No change in profile for {sdvx_id}; not updating the store.")
+            return "unchanged"
+        if not profile_data_from_scrape:
+            log.warning(f"IDENTITY_SERVICE: Failed to scrape individual profile for {sdvx_id}. Recent plays may be missing.")
+            user_profile["recent_plays"] = user_profile.get("recent_plays", [])
+            user_profile["last_updated"] = now.isoformat()
+            return "failed"
+        # Update player name from profile if available, as it's more authoritative
+        if profile_data_from_scrape.get("player_name") is not None:
+            user_profile["player_name"] = profile_data_from_scrape["player_name"]
+
+        # --- NEW LOGIC: Store newly scraped fields ---
+        # Check for `is not None` to avoid overwriting good data with nothing
+        if profile_data_from_scrape.get("volforce") is not None:
+            user_profile["volforce"] = profile_data_from_scrape["volforce"]
+        if profile_data_from_scrape.get("skill_level") is not None:
+            user_profile["skill_level"] = profile_data_from_scrape["skill_level"]
+        if profile_data_from_scrape.get("total_plays") is not None:
+            user_profile["total_plays"] = profile_data_from_scrape["total_plays"]
+
+        user_profile["recent_plays"] = profile_data_from_scrape.get("recent_plays", [])
+        user_profile["last_updated"] = now.isoformat()
+        log.debug(f"IDENTITY_SERVICE: Enriched profile for {sdvx_id} with details.")
+        return "updated"
+
+    async def refresh_player_profile(self, discord_id: str) -> dict | None:
+        """
+        Scrapes a linked player's profile now, at the caller's scrape priority, and stores it.
+        Returns the stored profile (the cached one if the scrape fails or times out), or None if
+        the Discord user isn't linked.
+        """
+        user_profile = await self.get_user_by_discord_id(discord_id)
+        if not user_profile or not user_profile.get("sdvx_id"):
+            return None
+        sdvx_id = user_profile["sdvx_id"]
+        try:
+            profile_data = await self.browser.scrape_player_profile(sdvx_id)
+        except Exception as e:
+            log.warning(f"IDENTITY_SERVICE: On-demand profile refresh for {sdvx_id} failed; using cached data. {e}")
+            return user_profile
+        if not profile_data:
+            return user_profile
+        now = datetime.now(timezone.utc)
+        async with self._users_lock:
+            users = await self._read_users()
+            if self._apply_profiles(users, [sdvx_id], [profile_data], now)["updated"]:
+                await self._write_users(users)
+        return users.get(sdvx_id)
+
+    async def refresh_leaderboard(self) -> list:
+        """Scheduled job: updates the roster from the arcade leaderboard. Returns newly discovered player names."""
+        leaderboard_players = await self._scrape_leaderboard()
+        async with self._users_lock:
+            users = await self._read_users()
+            newly_discovered_players = self._apply_leaderboard(users, leaderboard_players, datetime.now(timezone.utc))
+            await self._write_users(users)
+        log.info(f"IDENTITY_SERVICE: Leaderboard refresh complete. Discovered {len(newly_discovered_players)} new players.")
+        return newly_discovered_players
 
-        await self._write_users(users)
-        log.info(f"IDENTITY_SERVICE: Completed player cache update. Discovered {len(newly_discovered_players)} new players.")
-        return newly_discovered_players
\ No newline at end of file
+    async def refresh_profiles(self, active_discord_ids: set | None = None):
+        """Scheduled job: scrapes the profiles that are due and stores the results."""
+        now = datetime.now(timezone.utc)
+        results = await self._scrape_due_profiles(await self._read_users(), active_discord_ids, now)
+        # Scrapes run without the lock; results are applied to a fresh read so changes made
+        # meanwhile (links, a leaderboard refresh) are kept.
+        async with self._users_lock:
+            users = await self._read_users()
+            outcomes = self._apply_sweep(users, results, now)
+            if outcomes["updated"] or outcomes["failed"]:
+                await self._write_users(users)
+        log.info(
+            f"IDENTITY_SERVICE: Profile sweep complete: {outcomes['updated']} updated, "
+            f"{outcomes['unchanged']} unchanged, {outcomes['failed']} failed "
+            f"(scrapes: {self._format_breakdown(self.last_sweep['results'])})."
+        )
@@ -1,6 +1,8 @@
-import json
 from typing import Optional
 
+from bot.player_store import PlayerStore
+from bot.player_cache import PlayerCache
+
 class PerformanceService:
     # This data is sourced from a combination of the user's screenshot and community wikis for accuracy.
     VF_CLASSES = [
@@ -46,29 +48,20 @@ class PerformanceService:
         {"name": "Imperial IV", "vf": 23.000},
     ]
 
-    def __init__(self, users_file_path: str):
-        self.users_file_path = users_file_path
+    def __init__(self, player_store: PlayerStore, player_cache: PlayerCache | None = None):
+        self.player_store = player_store
+        # Shared with IdentityService in the bot, so both read the same in-memory roster.
+        self.players = player_cache or PlayerCache(player_store)
         # A direct dependency on IdentityService is better practice,
         # but for this change, we'll keep the current structure.
         self.identity_service = None
 
-    def _read_users(self) -> dict:
-        try:
-            with open(self.users_file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-
     def get_player_stats_from_cache(self, sdvx_id: str) -> dict | None:
-        users = self._read_users()
-        return users.get(sdvx_id)
+        return self.players.get(sdvx_id)
 
     def get_arcade_leaderboard_from_cache(self, limit: int = 10) -> list:
-        users = self._read_users()
-        user_list = list(users.values())
-        user_list = [u for u in user_list if "rank" in u]
-        user_list.sort(key=lambda u: u["rank"])
-        return user_list[:limit]
+        # Ranked players only, in rank order.
+        return self.players.leaderboard(limit)
 
     def analyze_new_scores_for_records(self, recent_plays: list) -> list:
         if not recent_plays:
@@ -1,14 +1,18 @@
 # bot/core/session_service.py
 import json
 import asyncio
-import os
 from datetime import datetime, timezone, timedelta
 
 from bot.core.performance_service import PerformanceService
-from bot.config import log
+from bot.config import log, SESSION_FLUSH_SECONDS, SESSION_JOURNAL_COMPACT_EVENTS
 from bot.eagle_browser import EagleBrowser
+from bot.scrape_queue import scrape_priority, PRIORITY_ACTIVE_SESSION
 from bot.core.role_service import RoleService
 from bot.utils.notification_service import NotificationService
+from bot.player_store import PlayerStore
+from bot.session_journal import (
+    SessionJournal, apply_event, EVENT_STARTED, EVENT_SCORE, EVENT_PAUSED, EVENT_RESUMED, EVENT_ENDED
+)
 
 class SessionService:
     def __init__(
@@ -17,9 +21,12 @@ class SessionService:
         performance_service: PerformanceService,
         browser: EagleBrowser,
         role_service: RoleService,
-        notification_service: NotificationService
+        notification_service: NotificationService,
+        player_store: PlayerStore | None = None
     ):
         self.sessions_file_path = sessions_file_path
+        # Finished sessions are added to the player store's history when one is given.
+        self.player_store = player_store
         self.performance_service = performance_service
         self.browser = browser
         self.role_service = role_service
@@ -27,32 +34,90 @@ class SessionService:
         self.IDLE_TIMEOUT_MIN = 5
         self.BREAK_TIMEOUT_MIN = 5
         self.ON_BREAK_TIMEOUT_HOURS = 8
+        # Snapshot (the sessions file) plus an append-only journal of transitions since it.
+        self.journal = SessionJournal(sessions_file_path)
+        self.compact_after_events = SESSION_JOURNAL_COMPACT_EVENTS
         self.sessions = self._blocking_read_sessions()
         log.info(f"SESSION_SVC: Loaded {len(self.sessions)} sessions into memory.")
+        self._ending = set()
+        # Writes are debounced: transitions queue their events and one append follows.
+        self.flush_seconds = SESSION_FLUSH_SECONDS
+        self._pending_events = []
+        self._dirty = False
+        self._flush_task = None
+        self._flush_lock = asyncio.Lock()
+        self.persist_stats = {"writes": 0, "writes_avoided": 0}
 
     def _get_now(self) -> datetime:
         return datetime.now(timezone.utc)
 
     def _blocking_read_sessions(self) -> dict:
         try:
-            with open(self.sessions_file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+            return self.journal.load()
         except Exception as e:
             log.error(f"!!! FAILED TO READ from {self.sessions_file_path}: {e}", exc_info=True)
             return {}
 
+    async def _record(self, kind: str, discord_id: str, **fields):
+        """Applies one session transition and journals it with the others from this tick."""
+        event = self.journal.event(kind, discord_id, self._get_now().isoformat(), **fields)
+        apply_event(self.sessions, event)
+        self._pending_events.append(event)
+        await self._write_sessions()
+
     async def _write_sessions(self):
-        await asyncio.to_thread(self._blocking_write_sessions)
+        """
+        Marks the sessions dirty. Queued events are written at most flush_seconds later, once
+        for every change made meanwhile; a change that joins a pending write counts as a
+        write avoided.
+        """
+        if self._dirty:
+            self.persist_stats["writes_avoided"] += 1
+        self._dirty = True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
 
-    def _blocking_write_sessions(self):
-        try:
-            os.makedirs(os.path.dirname(self.sessions_file_path), exist_ok=True)
-            with open(self.sessions_file_path, "w", encoding="utf-8") as f:
-                json.dump(self.sessions, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            log.error(f"!!! FAILED TO WRITE SESSIONS: {e}", exc_info=True)
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_seconds)
+        # Shielded so a shutdown arriving mid-write doesn't abandon the batch.
+        await asyncio.shield(self.flush())
+
+    async def flush(self, compact: bool = False):
+        """
+        Appends the queued events to the journal. Once the journal has grown past
+        compact_after_events (or when compact is set) the sessions are snapshotted instead.
+        """
+        async with self._flush_lock:
+            if not self._dirty and not compact:
+                return
+            events, self._pending_events = self._pending_events, []
+            self._dirty = False
+            snapshot = None
+            if compact or self.journal.events_since_snapshot + len(events) >= self.compact_after_events:
+                # Serialized here, on the event loop, so the snapshot matches the last event.
+                snapshot = json.dumps({"seq": self.journal.seq, "sessions": self.sessions}, ensure_ascii=False)
+            try:
+                await asyncio.to_thread(self._blocking_persist, events, snapshot)
+            except Exception as e:
+                self._pending_events = events + self._pending_events
+                self._dirty = True
+                log.error(f"!!! FAILED TO WRITE SESSIONS: {e}", exc_info=True)
+                return
+            self.persist_stats["writes"] += 1
+
+    def _blocking_persist(self, events: list, snapshot: str | None):
+        self.journal.append(events)
+        if snapshot is not None:
+            self.journal.compact(snapshot)
+
+    async def close(self):
+        """Writes pending changes and a fresh snapshot now; called on shutdown."""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        self._flush_task = None
+        await self.flush(compact=True)
+        log.info(f"SESSION_SVC: Sessions saved; {self.persist_stats['writes_avoided']} writes avoided by batching.")
 
     async def get_active_session(self) -> dict | None:
         for session_data in self.sessions.values():
@@ -70,7 +135,7 @@ class SessionService:
         if not session:
             user_profile = await self.performance_service.identity_service.get_user_by_discord_id(discord_id)
             initial_volforce = user_profile.get("volforce") if user_profile else None
-            self.sessions[discord_id] = {
+            await self._record(EVENT_STARTED, discord_id, session={
                 "discord_id": discord_id,
                 "status": "active",
                 "type": "auto",
@@ -79,21 +144,17 @@ class SessionService:
                 "reminder_sent": False,
                 "initial_volforce": initial_volforce,
                 "songs_played_count": 1  # NEW: An auto-session starts on the first song.
-            }
+            })
             if self.role_service:
                 await self.role_service.assign_role(discord_id)
 
         elif session.get("status") in ("on_break", "pending_break"):
-            session["status"] = "active"
-            session["last_activity"] = now_iso
-            session["songs_played_count"] = session.get("songs_played_count", 0) + 1
+            await self._record(EVENT_RESUMED, discord_id)
+            await self._record(EVENT_SCORE, discord_id)
             if self.role_service:
                 await self.role_service.assign_role(discord_id)
         else:
-            session["last_activity"] = now_iso
-            session["songs_played_count"] = session.get("songs_played_count", 0) + 1
-
-        await self._write_sessions()
+            await self._record(EVENT_SCORE, discord_id)
 
     async def start_manual_session(self, discord_id: str) -> bool:
         if await self.get_active_session():
@@ -101,7 +162,7 @@ class SessionService:
         user_profile = await self.performance_service.identity_service.get_user_by_discord_id(discord_id)
         initial_volforce = user_profile.get("volforce") if user_profile else None
         now_iso = self._get_now().isoformat()
-        self.sessions[discord_id] = {
+        await self._record(EVENT_STARTED, discord_id, session={
             "discord_id": discord_id,
             "status": "active",
             "type": "manual",
@@ -110,21 +171,46 @@ class SessionService:
             "initial_volforce": initial_volforce,
             "reminder_sent": False,
             "songs_played_count": 0  # NEW: A manual session starts with 0 songs played.
-        }
-        await self._write_sessions()
+        })
         if self.role_service:
             await self.role_service.assign_role(discord_id)
         return True
 
     async def end_session(self, discord_id: str) -> dict | None:
-        if discord_id in self.sessions:
+        # The summary waits on a profile scrape; claiming the session first stops /checkout and
+        # the stale-session job from both ending it in the meantime.
+        if discord_id not in self.sessions or discord_id in self._ending:
+            return None
+        self._ending.add(discord_id)
+        try:
             session_summary = await self._analyze_session_data(discord_id)
-            del self.sessions[discord_id]
-            await self._write_sessions()
+            session = self.sessions.get(discord_id)
+            if session is None:
+                return None
+            await self._record(EVENT_ENDED, discord_id)
+            await self._record_session_history(discord_id, session, session_summary)
             if self.role_service:
                 await self.role_service.remove_role(discord_id)
             return session_summary
-        return None
+        finally:
+            self._ending.discard(discord_id)
+
+    async def _record_session_history(self, discord_id: str, session: dict, summary: dict):
+        if not self.player_store:
+            return
+        try:
+            await asyncio.to_thread(self.player_store.record_session, {
+                "discord_id": discord_id,
+                "sdvx_id": summary.get("sdvx_id"),
+                "type": session.get("type"),
+                "start_time": session.get("start_time"),
+                "end_time": self._get_now().isoformat(),
+                "songs_played": session.get("songs_played_count", 0),
+                "initial_volforce": session.get("initial_volforce"),
+                "final_volforce": summary.get("final_volforce"),
+            })
+        except Exception as e:
+            log.error(f"SESSION_SVC: Could not record finished session for {discord_id}: {e}", exc_info=True)
 
     async def _analyze_session_data(self, discord_id: str) -> dict:
         session = self.sessions.get(discord_id, {})
@@ -138,6 +224,9 @@ class SessionService:
         except (TypeError, ValueError) as e:
             log.warning(f"Could not parse session start_time for record filtering: {e}")
 
+        # Pull the player's latest plays before summarizing; the scrape runs at the caller's
+        # queue priority (interactive for /checkout) and falls back to the cached profile.
+        await self.performance_service.identity_service.refresh_player_profile(discord_id)
         user_profile = await self.performance_service.identity_service.get_user_by_discord_id(discord_id)
         if not user_profile:
             return {}
@@ -188,9 +277,7 @@ class SessionService:
         session = self.sessions.get(discord_id)
         if not session or session.get("status") != "active":
             return False
-        session["status"] = "on_break"
-        session["last_activity"] = self._get_now().isoformat()
-        await self._write_sessions()
+        await self._record(EVENT_PAUSED, discord_id, status="on_break")
         if self.role_service:
             await self.role_service.remove_role(discord_id)
         return True
@@ -204,18 +291,14 @@ class SessionService:
     async def find_and_end_stale_sessions(self):
         now = self._get_now()
         sessions_to_delete = []
-        changes_made = False
         for discord_id, session in list(self.sessions.items()):
             last_activity_dt = datetime.fromisoformat(session.get("last_activity"))
             minutes_idle = (now - last_activity_dt).total_seconds() / 60
 
             if session.get("status") == "active" and minutes_idle > self.IDLE_TIMEOUT_MIN:
-                session["status"] = "pending_break"
-                session["last_activity"] = now.isoformat()
                 if not session.get("reminder_sent"):
                     await self.notification_service.send_session_reminder_dm(int(discord_id))
-                    session["reminder_sent"] = True
-                changes_made = True
+                await self._record(EVENT_PAUSED, discord_id, status="pending_break", reminder_sent=True)
                 if self.role_service:
                     await self.role_service.remove_role(discord_id)
 
@@ -226,14 +309,15 @@ class SessionService:
                 log.info(f"SESSION_SVC: Cleaning up 'on_break' session for {discord_id}.")
                 sessions_to_delete.append(discord_id)
 
-        if sessions_to_delete:
-            for discord_id in sessions_to_delete:
+        for discord_id in sessions_to_delete:
+            with scrape_priority(PRIORITY_ACTIVE_SESSION):
                 summary = await self.end_session(discord_id)
-                if summary:
-                    await self.notification_service.post_session_summary(summary)
-
-        elif changes_made:
-            await self._write_sessions()
+            if summary:
+                await self.notification_service.post_session_summary(summary)
 
     def get_session_count(self) -> int:
         return len(self.sessions)
+
+    def get_session_discord_ids(self) -> set:
+        """Discord IDs with an open session in any state (active, pending_break or on_break)."""
+        return set(self.sessions.keys())
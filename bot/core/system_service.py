@@ -49,4 +49,25 @@ class SystemService:
                 if now_time < close_time:
                     return True
         
-        return False
\ No newline at end of file
+        return False
+
+    def get_open_windows(self, now: datetime | None = None, days_ahead: int = 7) -> list:
+        """
+        (open, close) UTC datetimes of every opening from yesterday's through days_ahead days
+        from now, in order. Overnight sessions close on the following day.
+        """
+        now = now or self._get_now()
+        windows = []
+        for offset in range(-1, days_ahead + 1):
+            day = (now + timedelta(days=offset)).date()
+            day_schedule = self.schedule.get(day.strftime("%A").lower(), {})
+            if not day_schedule.get("open"):
+                continue
+            open_time = time.fromisoformat(day_schedule["open"])
+            close_time = time.fromisoformat(day_schedule["close"])
+            opens_at = datetime.combine(day, open_time, tzinfo=pytz.utc)
+            closes_at = datetime.combine(day, close_time, tzinfo=pytz.utc)
+            if open_time > close_time:
+                closes_at += timedelta(days=1)
+            windows.append((opens_at, closes_at))
+        return windows
@@ -0,0 +1,103 @@
+# bot/core/tracking_policy.py
+from datetime import datetime, timezone, timedelta
+
+from bot.config import (
+    log, TRACKING_CADENCE_SECONDS, TRACKING_BUDGET_PER_TICK,
+    TRACKING_RECENT_DAYS, TRACKING_PROMOTION_MINUTES
+)
+
+TIER_ACTIVE_SESSION = "active_session"
+TIER_LINKED_ACTIVE = "linked_active"
+TIER_LINKED_DORMANT = "linked_dormant"
+TIER_UNLINKED = "unlinked"
+# Highest priority first; budgets are spent in this order.
+TIERS = [TIER_ACTIVE_SESSION, TIER_LINKED_ACTIVE, TIER_LINKED_DORMANT, TIER_UNLINKED]
+
+PLAY_TIMESTAMP_FORMAT = "%Y-%m-%d %I:%M %p"
+
+
+class TrackingPolicy:
+    """
+    Decides which players' profiles are scraped on a given tick. Each player falls
+    into a tier with its own scrape cadence and per-tick budget, so players at the
+    cabinet are polled every tick while dormant and leaderboard-only players are
+    refreshed occasionally.
+    """
+    def __init__(
+        self,
+        cadence_seconds: dict = None,
+        budget_per_tick: dict = None,
+        recent_days: int = TRACKING_RECENT_DAYS,
+        promotion_minutes: int = TRACKING_PROMOTION_MINUTES
+    ):
+        self.cadence_seconds = cadence_seconds or TRACKING_CADENCE_SECONDS
+        self.budget_per_tick = budget_per_tick or TRACKING_BUDGET_PER_TICK
+        self.recent_window = timedelta(days=recent_days)
+        self.promotion_window = timedelta(minutes=promotion_minutes)
+        self.last_scraped = {}   # sdvx_id -> datetime of the last profile scrape
+        self.last_activity = {}  # sdvx_id -> datetime of the last detected play
+
+    def _latest_play_time(self, sdvx_id: str, user_profile: dict) -> datetime | None:
+        known = self.last_activity.get(sdvx_id)
+        recent_plays = user_profile.get("recent_plays") or []
+        if recent_plays:
+            try:
+                # The scraped timestamp is like "2025-06-18 10:56 PM"
+                played = datetime.strptime(recent_plays[0]["timestamp"], PLAY_TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+                if known is None or played > known:
+                    return played
+            except (ValueError, TypeError, KeyError):
+                pass
+        return known
+
+    def classify(self, sdvx_id: str, user_profile: dict, active_discord_ids: set, now: datetime) -> str:
+        discord_id = user_profile.get("discord_id")
+        last_played = self._latest_play_time(sdvx_id, user_profile)
+        if (discord_id and discord_id in active_discord_ids) or (last_played and now - last_played <= self.promotion_window):
+            return TIER_ACTIVE_SESSION
+        if not discord_id:
+            return TIER_UNLINKED
+        if last_played and now - last_played <= self.recent_window:
+            return TIER_LINKED_ACTIVE
+        return TIER_LINKED_DORMANT
+
+    def select_due(self, users: dict, active_discord_ids: set, now: datetime) -> list:
+        """Returns the sdvx_ids to scrape this tick, highest tier first, most overdue first within a tier."""
+        self.prune(users)
+        due_by_tier = {tier: [] for tier in TIERS}
+        for sdvx_id, user_profile in users.items():
+            tier = self.classify(sdvx_id, user_profile, active_discord_ids, now)
+            last = self.last_scraped.get(sdvx_id)
+            overdue = (now - last).total_seconds() - self.cadence_seconds[tier] if last else float("inf")
+            if overdue >= 0:
+                due_by_tier[tier].append((overdue, sdvx_id))
+
+        selected, summary = [], []
+        for tier in TIERS:
+            due = sorted(due_by_tier[tier], key=lambda item: item[0], reverse=True)
+            budget = self.budget_per_tick.get(tier, 0)
+            picked = due[:budget] if budget > 0 else due
+            selected.extend(sdvx_id for _, sdvx_id in picked)
+            summary.append(f"{tier}={len(picked)}/{len(due)}")
+        log.info(f"TRACKING: Scraping {len(selected)}/{len(users)} profiles this tick ({', '.join(summary)} due).")
+        return selected
+
+    def prune(self, users: dict):
+        """Forgets the scrape and activity times of players no longer on the roster."""
+        pruned = 0
+        for times in (self.last_scraped, self.last_activity):
+            for sdvx_id in [sdvx_id for sdvx_id in times if sdvx_id not in users]:
+                del times[sdvx_id]
+                pruned += 1
+        if pruned:
+            log.debug(f"TRACKING: Forgot {pruned} entries of players no longer on the roster.")
+
+    def record_scrape(self, sdvx_id: str, now: datetime):
+        self.last_scraped[sdvx_id] = now
+
+    def record_activity(self, sdvx_id: str, when: datetime):
+        """Promotes a player to the active tier after a new play (or VF change) is detected."""
+        previous = self.last_activity.get(sdvx_id)
+        if previous is None or when > previous:
+            self.last_activity[sdvx_id] = when
+            log.debug(f"TRACKING: Activity detected for {sdvx_id}; promoted to {TIER_ACTIVE_SESSION}.")
@@ -1,7 +1,11 @@
 # bot/eagle_browser.py
 import os
+import time
+import shutil
 import asyncio
-from bs4 import BeautifulSoup
+import threading
+import aiohttp
+from contextlib import asynccontextmanager, contextmanager
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -9,18 +13,165 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException, InvalidSessionIdException
+from selenium.common.exceptions import TimeoutException, WebDriverException, InvalidSessionIdException, JavascriptException
 
 from bot.config import (
     EAGLE_EMAIL, EAGLE_PASSWORD, CHROME_DRIVER_PATH,
-    CHROME_USER_DATA_DIR, CHROME_PROFILE_DIR, log, ARCADE_ID
+    CHROME_USER_DATA_DIR, CHROME_PROFILE_DIR, log, ARCADE_ID,
+    EAGLE_BASE_URL, SCRAPE_BACKEND, SCRAPE_EXTRACTION, BROWSER_POOL_SIZE, CHROME_POOL_DIR,
+    CHROME_LEAN_PROFILE, CHROME_PAGE_LOAD_STRATEGY, CHROME_WARM_STANDBY, CHROME_NAVIGATION_DEADLINE_SECONDS,
+    CHROME_MEMORY_BUDGET_MODE, CHROME_MEMORY_BUDGET_MB, CHROME_RECYCLE_AFTER_PAGES, CHROME_RSS_SAMPLE_PAGES, CHROME_TMPFS_DIR,
+    EAGLE_LOGIN_STEP_SECONDS
 )
+from bot.eagle_errors import SessionExpiredError, ScrapeError, ScrapeTimeoutError, ProfileNotFoundError, EmptyProfileError
+from bot.eagle_http import EagleHttpClient
+from bot.cookie_store import CookieStore, cdp_cookie_params
+from bot.rate_limiter import RateLimiter
+from bot.parse_pool import ParsePool
+from bot.change_detector import ProfileChangeDetector
+from bot.utils.metrics import StageStats, StartupTimer, scrape_stage_stats
+from bot.utils.proc import kill_process_tree, tree_rss
+from bot.eagle_parser import (
+    parse_leaderboard_html, parse_profile_html, leaderboard_from_rows, profile_from_extract,
+    classify_profile_html, profile_content_hash, LEADERBOARD_EXTRACT_JS, PROFILE_EXTRACT_JS, PROFILE_CLASSIFY_JS,
+    SESSION_CHECK_JS, PAGE_READY, PAGE_LOGIN, PAGE_NOT_FOUND, PAGE_EMPTY,
+    LOGIN_STATE_JS, LOGIN_LINK, LOGIN_FORM, LOGIN_AUTHORIZE, LOGIN_DONE, CHALLENGE_CHECK_JS
+)
+
+# Requests the scraper never needs: we only read table text out of the DOM.
+LEAN_BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*.css", "*.mp3", "*.mp4", "*.webm",
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+]
+
+# Memory budget mode: one renderer, no background services, small caches and V8 heap.
+LOW_MEMORY_CHROME_ARGS = [
+    "--renderer-process-limit=1", "--disable-site-isolation-trials",
+    "--disable-extensions", "--disable-background-networking", "--disable-component-update",
+    "--disable-default-apps", "--disable-sync", "--no-first-run", "--mute-audio",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,BackForwardCache",
+    "--disk-cache-size=1048576", "--media-cache-size=1048576", "--js-flags=--max-old-space-size=128",
+]
+
+LEADERBOARD_PANEL_LOCATOR = (By.XPATH, "//div[contains(@class, 'panel-primary') and .//h3[contains(text(), 'Arcade Top 10')]]")
+PLAYSTABLE_LOCATOR = (By.ID, "playstable")
+
+# Bytes actually transferred for the document and every subresource fetched so far.
+PAGE_TRANSFER_JS = """
+const nav = performance.getEntriesByType("navigation")[0];
+const res = performance.getEntriesByType("resource");
+return {bytes: (nav ? nav.transferSize : 0) + res.reduce((n, r) => n + (r.transferSize || 0), 0), requests: res.length + 1};
+"""
+
+# A standby that failed to start isn't retried for this long.
+STANDBY_RETRY_SECONDS = 60
+
+def profile_outcome_error(outcome: str, page_label: str) -> ScrapeError:
+    """Maps a non-ready profile page outcome to the error the scrape raises."""
+    if outcome == PAGE_LOGIN:
+        return SessionExpiredError(f"{page_label} redirected to the kailua login")
+    if outcome == PAGE_NOT_FOUND:
+        return ProfileNotFoundError(f"{page_label} does not exist on eagle.ac")
+    if outcome == PAGE_EMPTY:
+        return EmptyProfileError(f"{page_label} has no Score Log")
+    return ScrapeError(f"{page_label} loaded as unexpected page '{outcome}'")
+
+def export_eagle_cookies(driver) -> list:
+    """The eagle.ac cookies held by a driver's Chrome profile."""
+    cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+    return [c for c in cookies if "eagle.ac" in c.get("domain", "")]
+
+def perform_login(driver, start_url: str, step_seconds: float = EAGLE_LOGIN_STEP_SECONDS) -> bool:
+    """
+    Walks the kailua login from start_url: login link, credentials form, Authorize, back on
+    eagle.ac. Each step waits only until LOGIN_STATE_JS reports a new state, so steps the
+    session skips (already logged in, already authorized) cost nothing. False if it stalls.
+    """
+    driver.get(start_url)
+    last_state = None
+    for _ in range(6):
+        try:
+            state = WebDriverWait(driver, step_seconds).until(
+                lambda d: (current := d.execute_script(LOGIN_STATE_JS)) != last_state and current
+            )
+        except TimeoutException:
+            log.error(f"LOGIN: Login stalled after step '{last_state}' ({driver.current_url}).")
+            return False
+        if state == LOGIN_DONE:
+            return True
+        if state == LOGIN_LINK:
+            driver.find_element(By.CSS_SELECTOR, 'a[href$="/auth/kailua"]').click()
+        elif state == LOGIN_FORM:
+            if not (EAGLE_EMAIL and EAGLE_PASSWORD):
+                log.error("LOGIN: eagle.ac asked for credentials but EAGLE_EMAIL / EAGLE_PASSWORD are not set.")
+                return False
+            email_fld = driver.find_element(By.NAME, "email")
+            pass_fld = driver.find_element(By.NAME, "password")
+            email_fld.clear(); email_fld.send_keys(EAGLE_EMAIL)
+            pass_fld.clear(); pass_fld.send_keys(EAGLE_PASSWORD)
+            pass_fld.submit()
+            log.info("LOGIN: Submitted Eagle credentials.")
+        elif state == LOGIN_AUTHORIZE:
+            driver.find_element(By.XPATH, "//button[contains(text(),'Authorize') or contains(text(),'Allow')]").click()
+            log.info("LOGIN: Clicked 'Authorize'.")
+        last_state = state
+    log.error("LOGIN: Login did not finish within 6 steps.")
+    return False
 
 class EagleBrowser:
-    def __init__(self):
+    def __init__(
+        self, backend: str = SCRAPE_BACKEND, base_url: str = EAGLE_BASE_URL, user_data_dir: str = CHROME_USER_DATA_DIR,
+        extraction: str = SCRAPE_EXTRACTION, lean: bool = CHROME_LEAN_PROFILE, standby: bool = CHROME_WARM_STANDBY,
+        standby_dir_prefix: str | None = None, navigation_deadline: float = CHROME_NAVIGATION_DEADLINE_SECONDS,
+        memory_budget: bool = CHROME_MEMORY_BUDGET_MODE, tmpfs_user_data_dir: str | None = None,
+        cookie_store: CookieStore | None = None, change_detector: ProfileChangeDetector | None = None,
+        rate_limiter: RateLimiter | None = None, stage_stats: dict | None = None, startup_timer: StartupTimer | None = None,
+        parse_pool: ParsePool | None = None
+    ):
         self.headless_driver = None
+        self.user_data_dir = user_data_dir
+        self.standby = standby
+        self.standby_driver = None
+        self.standby_user_data_dir = None
+        self.standby_dir_prefix = standby_dir_prefix or os.path.join(CHROME_POOL_DIR, "standby")
+        self._standby_task = None
+        self._standby_retry_at = 0.0
+        self.navigation_deadline = navigation_deadline
+        self.memory_budget = memory_budget
+        self.tmpfs_user_data_dir = tmpfs_user_data_dir or os.path.join(CHROME_TMPFS_DIR, "main")
+        self.memory_budget_mb = CHROME_MEMORY_BUDGET_MB
+        self.recycle_after_pages = CHROME_RECYCLE_AFTER_PAGES
+        self.pages_since_start = 0   # navigations by the current driver
+        self._pages_at_last_sample = 0
+        self.last_rss_mb = None
+        self.restart_counts = {"restarts": 0, "standby_swaps": 0, "cold_starts": 0, "watchdog_kills": 0, "recycles": 0}
+        self.restart_ms = {"standby_swaps": 0.0, "cold_starts": 0.0}
+        self.cookie_store = cookie_store or CookieStore()
+        self.change_detector = change_detector or ProfileChangeDetector()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.stage_stats = stage_stats or scrape_stage_stats()
+        self.startup_timer = startup_timer or StartupTimer()
+        self.parse_pool = parse_pool or ParsePool()
+        self._cookie_version = None  # cookie_store version the current driver has; None = not restored yet
+        self.logins = 0
+        self.base_url = base_url.rstrip("/")
+        self.backend = backend
+        self.extraction = extraction
+        self.lean = lean
+        self.page_stats = {"loads": 0, "total_ms": 0.0, "total_bytes": 0}
+        # With the 'http' backend, Chrome is only used to hold (and refresh) the login.
+        self.http_client = EagleHttpClient(rate_limiter=self.rate_limiter) if backend == "http" else None
+
+    def _profile_url(self, sdvx_id: str) -> str:
+        return f"{self.base_url}/game/sdvx/profile/{sdvx_id}"
+
+    def _leaderboard_url(self) -> str:
+        return f"{self.base_url}/arcade/{ARCADE_ID}"
 
     def run_oauth_login(self, sdvx_id: str) -> bool:
+        """First-time login in a visible Chrome window. Later logins reuse the saved cookie jar, or relogin()."""
         log.info("🔐 Starting OAuth login flow in a visible Chrome window…")
         options = Options()
         options.add_argument(f"--user-data-dir={CHROME_USER_DATA_DIR}")
@@ -32,34 +183,9 @@ class EagleBrowser:
         driver = None
         try:
             driver = webdriver.Chrome(service=service, options=options)
-            wait = WebDriverWait(driver, 15)
-            target_url = f"https://eagle.ac/game/sdvx/profile/{sdvx_id}"
-            driver.get(target_url)
-
-            try:
-                log.info("Looking for main login button...")
-                main_login_button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "a[href='https://eagle.ac/auth/kailua']")))
-                log.info("✅ Main login button found, clicking it.")
-                main_login_button.click()
-            except TimeoutException:
-                log.info("ℹ️ Did not find main login button, assuming direct redirect to form.")
-            try:
-                email_fld = wait.until(EC.presence_of_element_located((By.NAME, "email")))
-                pass_fld = driver.find_element(By.NAME, "password")
-                email_fld.clear(); email_fld.send_keys(EAGLE_EMAIL)
-                pass_fld.clear(); pass_fld.send_keys(EAGLE_PASSWORD)
-                pass_fld.submit()
-                log.info("✅ Submitted Eagle credentials.")
-            except TimeoutException:
-                log.info("ℹ️ No login form detected; assuming already logged in.")
-            try:
-                authorize_btn = wait.until(EC.element_to_be_clickable((By.XPATH,"//button[contains(text(),'Authorize') or contains(text(),'Allow')]")))
-                authorize_btn.click()
-                log.info("✅ Clicked ‘Authorize’ button.")
-            except TimeoutException:
-                log.info("ℹ️ No ‘Authorize’ button detected; maybe already authorized.")
-
-            wait.until(EC.title_contains("Sound Voltex"))
+            if not perform_login(driver, self._profile_url(sdvx_id)):
+                return False
+            self.cookie_store.save(export_eagle_cookies(driver), user_agent=driver.execute_script("return navigator.userAgent"))
             log.info("✅ OAuth login complete.")
             return True
         except Exception as e:
@@ -69,155 +195,630 @@ class EagleBrowser:
             if driver:
                 driver.quit()
 
-    def init_headless_chrome(self) -> bool:
-        log.info("☁️ Initializing headless ChromeDriver for scraping…")
+    def _start_driver(self, user_data_dir: str):
         options = Options()
         options.add_argument("--headless=new"); options.add_argument("--disable-gpu")
         options.add_argument("--no-sandbox"); options.add_argument("--disable-dev-shm-usage")
-        options.add_argument(f"--user-data-dir={CHROME_USER_DATA_DIR}")
+        options.add_argument(f"--user-data-dir={user_data_dir}")
         options.add_argument(f"--profile-directory={CHROME_PROFILE_DIR}")
+        if self.lean:
+            options.page_load_strategy = CHROME_PAGE_LOAD_STRATEGY
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        if self.memory_budget:
+            for arg in LOW_MEMORY_CHROME_ARGS:
+                options.add_argument(arg)
         service = Service(executable_path=CHROME_DRIVER_PATH)
+        driver = webdriver.Chrome(service=service, options=options)
+        if self.lean:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URL_PATTERNS})
+        return driver
+
+    def init_headless_chrome(self) -> bool:
+        log.info("☁️ Initializing headless ChromeDriver for scraping…")
         try:
-            self.headless_driver = webdriver.Chrome(service=service, options=options)
-            log.info("✅ Headless ChromeDriver initialized successfully.")
+            if self.memory_budget:
+                # A fresh copy in RAM each start: disk I/O stays off the SD card and nothing
+                # Chrome accumulated in the profile survives a recycle.
+                self.user_data_dir = clone_chrome_profile(self.tmpfs_user_data_dir)
+            self.headless_driver = self._start_driver(self.user_data_dir)
+            self.pages_since_start = self._pages_at_last_sample = 0
+            self._cookie_version = None
+            log.info(f"✅ Headless ChromeDriver initialized successfully ({'lean' if self.lean else 'full'} profile).")
             return True
         except Exception as e:
             log.error(f"❌ Failed to initialize headless ChromeDriver: {e}", exc_info=True)
             return False
 
+    @staticmethod
+    def _quit_driver(driver, label: str):
+        try:
+            driver.quit()
+            log.info(f"⚪️ {label} closed.")
+        except Exception as e:
+            log.warning(f"Could not quit {label.lower()} gracefully: {e}")
+
     def quit_headless(self):
         if self.headless_driver:
             try:
-                self.headless_driver.quit()
-                log.info("⚪️ Headless browser closed.")
-            except Exception as e:
-                log.warning(f"Could not quit headless browser gracefully: {e}")
+                self._quit_driver(self.headless_driver, "Headless browser")
             finally:
                 self.headless_driver = None
+        if self.standby_driver:
+            try:
+                self._quit_driver(self.standby_driver, "Standby browser")
+            finally:
+                self.standby_driver = None
 
     def is_alive(self) -> bool:
-        if not self.headless_driver: return False
+        return self._driver_is_alive(self.headless_driver)
+
+    @staticmethod
+    def _driver_is_alive(driver) -> bool:
+        if not driver: return False
         try:
-            _ = self.headless_driver.title
+            _ = driver.title
             return True
         except WebDriverException:
             return False
 
+    def _next_standby_dir(self) -> str:
+        # Two standby directories take turns, so the one being (re)cloned is never the one in use.
+        for i in (0, 1):
+            candidate = f"{self.standby_dir_prefix}-{i}"
+            if candidate != self.user_data_dir:
+                return candidate
+
+    def _start_standby_sync(self) -> tuple:
+        start = time.perf_counter()
+        user_data_dir = clone_chrome_profile(self._next_standby_dir())
+        driver = self._start_driver(user_data_dir)
+        log.info(f"BROWSER: Warm standby driver ready in {(time.perf_counter() - start) * 1000:.0f} ms.")
+        return driver, user_data_dir
+
+    async def _refill_standby(self):
+        try:
+            self.standby_driver, self.standby_user_data_dir = await asyncio.to_thread(self._start_standby_sync)
+        except Exception as e:
+            self._standby_retry_at = time.monotonic() + STANDBY_RETRY_SECONDS
+            log.error(f"BROWSER: Could not start a warm standby driver: {e}")
+
+    def _ensure_standby(self):
+        """Starts a standby driver in the background if one is enabled and missing."""
+        if not self.standby or self.standby_driver is not None or time.monotonic() < self._standby_retry_at:
+            return
+        if self._standby_task is None or self._standby_task.done():
+            self._standby_task = asyncio.create_task(self._refill_standby())
+
+    def _swap_in_standby(self) -> bool:
+        standby, self.standby_driver = self.standby_driver, None
+        if standby is None:
+            return False
+        if not self._driver_is_alive(standby):
+            self._quit_driver(standby, "Standby browser")
+            return False
+        self.headless_driver = standby
+        self.user_data_dir = self.standby_user_data_dir
+        self.pages_since_start = self._pages_at_last_sample = 0
+        self._cookie_version = None
+        return True
+
+    def sample_footprint(self) -> tuple[int, int] | None:
+        """(RSS bytes, process count) of this driver's chromedriver + Chrome tree, or None if unknown."""
+        try:
+            pid = self.headless_driver.service.process.pid
+        except AttributeError:
+            return None
+        return tree_rss(pid)
+
+    async def _check_memory_budget(self):
+        """Samples the driver's footprint every few pages and recycles it if it is over budget."""
+        if not self.memory_budget or not self.headless_driver:
+            return
+        pages = self.pages_since_start
+        over_pages = self.recycle_after_pages > 0 and pages >= self.recycle_after_pages
+        if not over_pages and pages - self._pages_at_last_sample < CHROME_RSS_SAMPLE_PAGES:
+            return
+        self._pages_at_last_sample = pages
+        footprint = await asyncio.to_thread(self.sample_footprint)
+        if footprint is not None:
+            rss_bytes, processes = footprint
+            self.last_rss_mb = rss_bytes / (1024 * 1024)
+            log.info(
+                f"BROWSER: Chrome footprint {self.last_rss_mb:.0f} MB over {processes} processes "
+                f"after {pages} pages (budget {self.memory_budget_mb} MB)."
+            )
+        if over_pages:
+            reason = f"{pages} pages loaded"
+        elif self.last_rss_mb is not None and footprint is not None and self.last_rss_mb > self.memory_budget_mb:
+            reason = f"{self.last_rss_mb:.0f} MB over the {self.memory_budget_mb} MB budget"
+        else:
+            return
+        log.info(f"BROWSER: Recycling the headless driver ({reason}).")
+        self.restart_counts["recycles"] += 1
+        await self._replace_driver()
+
+    async def _replace_driver(self):
+        start = time.perf_counter()
+        if self.headless_driver:
+            self._quit_driver(self.headless_driver, "Headless browser")
+            self.headless_driver = None
+        if self._swap_in_standby():
+            kind = "standby_swaps"
+        elif await asyncio.to_thread(self.init_headless_chrome):
+            kind = "cold_starts"
+        else:
+            raise RuntimeError("Headless browser is unavailable and could not be restarted.")
+        self._record_restart(kind, (time.perf_counter() - start) * 1000)
+
+    def _record_restart(self, kind: str, elapsed_ms: float):
+        self.restart_counts["restarts"] += 1
+        self.restart_counts[kind] += 1
+        self.restart_ms[kind] += elapsed_ms
+        how = "swapping in the warm standby" if kind == "standby_swaps" else "a cold start"
+        log.info(f"BROWSER: Driver replaced by {how} in {elapsed_ms:.0f} ms (restart #{self.restart_counts['restarts']}).")
+
+    def restart_stats(self) -> dict:
+        counts = self.restart_counts
+        return {
+            **counts,
+            "avg_swap_ms": self.restart_ms["standby_swaps"] / counts["standby_swaps"] if counts["standby_swaps"] else None,
+            "avg_cold_start_ms": self.restart_ms["cold_starts"] / counts["cold_starts"] if counts["cold_starts"] else None,
+            "standby_ready": int(self.standby_driver is not None),
+            "rss_mb": self.last_rss_mb,
+        }
+
     async def ensure_browser_is_ready(self):
         if not self.is_alive():
             log.warning("Browser session is not alive. Attempting to restart...")
-            self.quit_headless()
-            if not await asyncio.to_thread(self.init_headless_chrome):
-                raise RuntimeError("Headless browser is unavailable and could not be restarted.")
+            await self._replace_driver()
+        else:
+            await self._check_memory_budget()
+        if self._cookie_version != self.cookie_store.version:
+            await self._restore_cookies()
+        self._ensure_standby()
 
-    def _scrape_leaderboard_sync(self) -> list:
-        log.info("BACKGROUND SCRAPE: Getting leaderboard page...")
-        url = f"https://eagle.ac/arcade/{ARCADE_ID}"
+    @contextmanager
+    def _navigation_watchdog(self, page_label: str):
+        """
+        Enforces navigation_deadline on the driver thread's work for one page. If it passes,
+        the chromedriver process tree is killed, which makes the blocked driver call fail and
+        frees the thread; the scrape raises ScrapeTimeoutError and the next one gets a new driver.
+        """
+        if not self.navigation_deadline or not self.headless_driver:
+            yield
+            return
+        driver = self.headless_driver
+        fired = threading.Event()
+
+        def on_deadline():
+            fired.set()
+            self.restart_counts["watchdog_kills"] += 1
+            try:
+                pid = driver.service.process.pid
+            except AttributeError:
+                log.error(f"BROWSER: {page_label} passed its {self.navigation_deadline:.0f}s deadline and the driver process is unknown.")
+                return
+            killed = kill_process_tree(pid)
+            log.error(f"BROWSER: {page_label} passed its {self.navigation_deadline:.0f}s deadline; killed the chromedriver process tree ({killed} processes).")
+
+        timer = threading.Timer(self.navigation_deadline, on_deadline)
+        timer.daemon = True
+        timer.start()
+        try:
+            yield
+        except Exception as e:
+            if fired.is_set():
+                raise ScrapeTimeoutError(f"{page_label} hung past {self.navigation_deadline:.0f}s; driver killed") from e
+            raise
+        finally:
+            timer.cancel()
+        if fired.is_set():
+            raise ScrapeTimeoutError(f"{page_label} hung past {self.navigation_deadline:.0f}s; driver killed")
+
+    def _check_login_sync(self) -> bool:
+        with self._navigation_watchdog("login check"):
+            # A logged-out session ends up on the kailua login and never shows the panel; the
+            # check below runs on whatever page the wait ended on.
+            self._load_page(self._leaderboard_url(), LEADERBOARD_PANEL_LOCATOR, "login check")
+            return bool(self.headless_driver.execute_script(SESSION_CHECK_JS))
+
+    async def check_login(self) -> bool:
+        """Loads the arcade page and reports whether Chrome's eagle.ac session is still logged in."""
+        await self.ensure_browser_is_ready()
+        await self.rate_limiter.acquire()
+        logged_in = await asyncio.to_thread(self._check_login_sync)
+        if logged_in:
+            self.startup_timer.record_scrape()
+        return logged_in
+
+    async def _restore_cookies(self):
+        """Loads the saved cookie jar into Chrome (and the HTTP client), e.g. after a start or another browser's login."""
+        cookies = self.cookie_store.load()
+        if cookies:
+            await asyncio.to_thread(self.headless_driver.execute_cdp_cmd, "Network.setCookies", {"cookies": cdp_cookie_params(cookies)})
+            if self.http_client:
+                self.http_client.load_cookies(cookies, user_agent=self.cookie_store.user_agent)
+            log.info(f"BROWSER: Restored {len(cookies)} saved eagle.ac cookies.")
+        self._cookie_version = self.cookie_store.version
+
+    async def _save_cookies_from_chrome(self):
+        cookies = await asyncio.to_thread(self.export_session_cookies)
+        user_agent = await asyncio.to_thread(self.headless_driver.execute_script, "return navigator.userAgent")
+        self.cookie_store.save(cookies, user_agent=user_agent)
+        self._cookie_version = self.cookie_store.version
+        if self.http_client:
+            self.http_client.load_cookies(cookies, user_agent=user_agent)
+
+    def _login_sync(self) -> bool:
+        return perform_login(self.headless_driver, f"{self.base_url}/auth/kailua")
+
+    async def relogin(self) -> bool:
+        """
+        Called when a scrape finds the session expired. Runs the kailua login in this headless
+        browser and saves the new cookie jar. If another browser saved a newer jar while this
+        one waited for the lock, that jar is restored instead of logging in again.
+        """
+        seen_version = self._cookie_version
+        async with self.cookie_store.lock:
+            if self.cookie_store.version != seen_version:
+                await self.ensure_browser_is_ready()
+                return True
+            await self.ensure_browser_is_ready()
+            log.info("BROWSER: eagle.ac session expired; logging in again in the headless browser...")
+            start = time.perf_counter()
+            await self.rate_limiter.acquire()
+            if not await asyncio.to_thread(self._login_sync):
+                log.error("BROWSER: Re-login failed; scrapes will keep failing until the eagle.ac login works.")
+                return False
+            await self._save_cookies_from_chrome()
+            self.logins += 1
+            log.info(f"BROWSER: Logged in again in {(time.perf_counter() - start) * 1000:.0f} ms.")
+            return True
+
+    async def shutdown(self):
+        """Quits Chrome (and the standby) until the next scrape or init_headless_chrome starts it again."""
+        if self._standby_task is not None:
+            await asyncio.gather(self._standby_task, return_exceptions=True)
+        await asyncio.to_thread(self.quit_headless)
+
+    async def close(self):
+        if self.http_client:
+            await self.http_client.close()
+        if self._standby_task is not None:
+            # A standby still starting would otherwise be left running after shutdown.
+            await asyncio.gather(self._standby_task, return_exceptions=True)
+        self.quit_headless()
+        if self.memory_budget:
+            # The tmpfs clone lives in RAM until removed.
+            shutil.rmtree(self.tmpfs_user_data_dir, ignore_errors=True)
+
+    def export_session_cookies(self) -> list:
+        """Returns the eagle.ac cookies held by the headless Chrome profile."""
+        return export_eagle_cookies(self.headless_driver)
+
+    async def _sync_http_cookies(self):
+        await self.ensure_browser_is_ready()
+        await self._save_cookies_from_chrome()
+
+    async def _fetch_html_via_http(self, url: str) -> str:
+        if not self.http_client.cookies_loaded:
+            # The saved jar lets the HTTP backend scrape without starting Chrome at all.
+            cookies = self.cookie_store.load()
+            if cookies:
+                self.http_client.load_cookies(cookies, user_agent=self.cookie_store.user_agent)
+            else:
+                await self._sync_http_cookies()
+        try:
+            return await self.http_client.fetch_html(url)
+        except SessionExpiredError:
+            # Chrome may hold fresher cookies than our copy; re-export once before giving up.
+            log.info("HTTP_CLIENT: Session rejected, re-exporting cookies from Chrome...")
+            await self._sync_http_cookies()
+            return await self.http_client.fetch_html(url)
+
+    def _run_extract_script(self, script: str, page_label: str):
+        """Runs an in-page extraction script. Returns None when extraction mode is 'soup' or the script fails."""
+        if self.extraction != "js":
+            return None
+        try:
+            return self.headless_driver.execute_script(script)
+        except JavascriptException as e:
+            log.warning(f"SCRAPER: In-page extraction failed for {page_label}, falling back to page_source: {e.msg}")
+            return None
+
+    def _load_page(self, url: str, locator: tuple, page_label: str, classify_script: str | None = None) -> bool:
+        """
+        Navigates to url and waits only until the element we scrape is present.
+        Logs the load latency and bytes transferred. Returns False on timeout.
+
+        With a classify_script, the wait polls that script instead; it also recognizes pages
+        that will never have the element (login redirect, not found, empty profile), which
+        end the wait immediately and raise the matching ScrapeError.
+        """
+        start = time.perf_counter()
+        self.pages_since_start += 1
         self.headless_driver.get(url)
+        if classify_script:
+            condition = lambda driver: driver.execute_script(classify_script)
+        else:
+            condition = EC.presence_of_element_located(locator)
         try:
-            WebDriverWait(self.headless_driver, 10).until(EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'panel-primary') and .//h3[contains(text(), 'Arcade Top 10')]]")))
-            html = self.headless_driver.page_source
+            outcome = WebDriverWait(self.headless_driver, 10).until(condition)
         except TimeoutException:
-            log.error("SCRAPER: Timed out waiting for leaderboard panel to load.")
-            return []
-        soup = BeautifulSoup(html, "html.parser")
-        panel_h3 = soup.find("h3", class_="panel-title", string=lambda t: t and "Arcade Top 10" in t)
-        if not panel_h3:
-            return []
-        lead_table = panel_h3.find_parent("div", class_="panel-primary").find("table", class_="table")
-        if not lead_table:
-            return []
-        output = []
-        for row in lead_table.select("tbody > tr"):
-            cols = row.find_all("td")
-            if len(cols) < 4: continue
-            try:
-                rank = int(cols[0].get_text(strip=True))
-                vf_val = float(cols[3].get_text(strip=True))
-                output.append({"rank": rank, "sdvx_id": cols[1].get_text(strip=True), "player_name": cols[2].get_text(strip=True), "volforce": vf_val})
-            except (ValueError, TypeError):
-                log.warning(f"SCRAPER: Could not parse row: {cols}")
-                continue
+            self.rate_limiter.report(time.perf_counter() - start, challenge=self._is_challenge_page())
+            return False
+        if not classify_script:
+            outcome = PAGE_READY
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.rate_limiter.report(elapsed_ms / 1000)
+        try:
+            transfer = self.headless_driver.execute_script(PAGE_TRANSFER_JS) or {}
+        except WebDriverException:
+            transfer = {}
+        page_bytes = int(transfer.get("bytes") or 0)
+        stats = self.page_stats
+        stats["loads"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["total_bytes"] += page_bytes
+        log.info(
+            f"SCRAPER: {page_label} {outcome} in {elapsed_ms:.0f} ms, {page_bytes / 1024:.1f} KB over "
+            f"{transfer.get('requests', '?')} requests ({'lean' if self.lean else 'full'} profile; "
+            f"avg {stats['total_ms'] / stats['loads']:.0f} ms, {stats['total_bytes'] / stats['loads'] / 1024:.1f} KB "
+            f"over {stats['loads']} loads)"
+        )
+        if outcome != PAGE_READY:
+            raise profile_outcome_error(outcome, page_label)
+        return True
+
+    def _is_challenge_page(self) -> bool:
+        try:
+            return bool(self.headless_driver.execute_script(CHALLENGE_CHECK_JS))
+        except WebDriverException:
+            return False
+
+    def _scrape_leaderboard_sync(self) -> list:
+        log.info("BACKGROUND SCRAPE: Getting leaderboard page...")
+        with self._navigation_watchdog("leaderboard"):
+            if not self._load_page(self._leaderboard_url(), LEADERBOARD_PANEL_LOCATOR, "leaderboard"):
+                log.error("SCRAPER: Timed out waiting for leaderboard panel to load.")
+                return []
+            rows = self._run_extract_script(LEADERBOARD_EXTRACT_JS, "leaderboard")
+            page_source = self.headless_driver.page_source if rows is None else None
+        output = leaderboard_from_rows(rows) if rows is not None else parse_leaderboard_html(page_source)
         log.info(f"BACKGROUND SCRAPE: Found {len(output)} players on leaderboard.")
         return output
 
     async def scrape_leaderboard(self) -> list:
+        if self.http_client:
+            try:
+                html = await self._fetch_html_via_http(self._leaderboard_url())
+                output = await self.parse_pool.run(parse_leaderboard_html, html, stats=self.stage_stats["parse"])
+                if output:
+                    log.info(f"BACKGROUND SCRAPE: Found {len(output)} players on leaderboard (http).")
+                    return output
+                log.warning("SCRAPER: HTTP leaderboard page had no Top 10 panel; falling back to Selenium.")
+            except (SessionExpiredError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                log.warning(f"SCRAPER: HTTP leaderboard fetch failed ({e}); falling back to Selenium.")
+        output = await self._run_on_driver("leaderboard scrape", self._scrape_leaderboard_sync)
+        if output:
+            self.startup_timer.record_scrape()
+        return output
+
+    def _fetch_player_profile_sync(self, sdvx_id: str) -> str | dict:
+        """
+        Fetch stage on the driver thread: returns the page HTML for the parse stage, or the
+        finished profile when extraction is 'js' (nothing left to parse). {} on timeout.
+        """
+        log.debug(f"SCRAPER: Getting player profile page for {sdvx_id}...")
+        with self._navigation_watchdog(f"profile {sdvx_id}"):
+            if not self._load_page(self._profile_url(sdvx_id), PLAYSTABLE_LOCATOR, f"profile {sdvx_id}", classify_script=PROFILE_CLASSIFY_JS):
+                log.warning(f"SCRAPER: Timed out waiting for Score Log table for {sdvx_id}.")
+                return {}
+            raw = self._run_extract_script(PROFILE_EXTRACT_JS, f"profile {sdvx_id}")
+            if raw is None:
+                return self.headless_driver.page_source
+        return profile_from_extract(raw, sdvx_id)
+
+    def _scrape_player_profile_sync(self, sdvx_id: str) -> dict:
+        """Fetch and parse in the calling thread."""
+        page = self._fetch_player_profile_sync(sdvx_id)
+        return page if isinstance(page, dict) else parse_profile_html(page, sdvx_id)
+
+    async def _fetch_player_profile(self, sdvx_id: str) -> str | dict:
+        if self.http_client:
+            try:
+                html = await self._fetch_html_via_http(self._profile_url(sdvx_id))
+                if 'id="playstable"' in html:
+                    return html
+                outcome = await asyncio.to_thread(classify_profile_html, html)
+                if outcome in (PAGE_NOT_FOUND, PAGE_EMPTY):
+                    raise profile_outcome_error(outcome, f"profile {sdvx_id}")
+                log.warning(f"SCRAPER: HTTP profile page for {sdvx_id} had no Score Log; falling back to Selenium.")
+            except (SessionExpiredError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                log.warning(f"SCRAPER: HTTP profile fetch for {sdvx_id} failed ({e}); falling back to Selenium.")
+        return await self._run_on_driver("profile scrape", self._fetch_player_profile_sync, sdvx_id)
+
+    async def _run_on_driver(self, label: str, func, *args):
+        """
+        Runs func (one page load) on the driver thread, retrying once after a driver restart or
+        a re-login. The rate limit is waited out here, before a driver thread is taken.
+        """
         await self.ensure_browser_is_ready()
+        await self.rate_limiter.acquire()
         try:
-            return await asyncio.to_thread(self._scrape_leaderboard_sync)
+            return await asyncio.to_thread(func, *args)
         except InvalidSessionIdException:
-            log.warning("Caught InvalidSessionIdException during leaderboard scrape. Retrying once...")
+            log.warning(f"Caught InvalidSessionIdException during {label}. Retrying once...")
             await self.ensure_browser_is_ready()
-            return await asyncio.to_thread(self._scrape_leaderboard_sync)
+        except SessionExpiredError:
+            if not await self.relogin():
+                raise
+        await self.rate_limiter.acquire()
+        return await asyncio.to_thread(func, *args)
 
-    def _scrape_player_profile_sync(self, sdvx_id: str) -> dict:
-        url = f"https://eagle.ac/game/sdvx/profile/{sdvx_id}"
-        log.debug(f"SCRAPER: Getting player profile page for {sdvx_id}...")
-        self.headless_driver.get(url)
+    async def fetch_player_profile(self, sdvx_id: str) -> str | dict:
+        """Fetch stage of a profile scrape; hand the result to parse_profile_page."""
+        start = time.perf_counter()
+        ok = False
         try:
-            WebDriverWait(self.headless_driver, 10).until(EC.presence_of_element_located((By.ID, "playstable")))
-            html = self.headless_driver.page_source
-        except TimeoutException:
-            log.warning(f"SCRAPER: Timed out waiting for Score Log table for {sdvx_id}.")
-            return {}
+            page = await self._fetch_player_profile(sdvx_id)
+            ok = bool(page)
+            if ok:
+                self.startup_timer.record_scrape()
+            return page
+        finally:
+            self.stage_stats["fetch"].record(time.perf_counter() - start, ok=ok)
 
-        soup = BeautifulSoup(html, "html.parser")
-        player_name, volforce, skill_level, total_plays = None, None, None, None
+    async def scrape_player_profile(self, sdvx_id: str) -> dict:
+        page = await self.fetch_player_profile(sdvx_id)
+        return await parse_profile_page(page, sdvx_id, self.change_detector, self.parse_pool, self.stage_stats["parse"])
 
-        name_div = soup.select_one("h2.page-header div.col-xs-7")
-        if name_div:
-            player_name = name_div.find(text=True, recursive=False).strip()
 
-        try:
-            skill_level_b_tag = soup.find("b", string="Skill Level:")
-            if skill_level_b_tag and skill_level_b_tag.find_next_sibling("i"):
-                skill_level = skill_level_b_tag.find_next_sibling("i").get_text(strip=True)
-        except Exception as e:
-            log.warning(f"SCRAPER: Could not parse Skill Level for {sdvx_id}: {e}")
-        try:
-            total_plays_b_tag = soup.find("b", string="Plays:")
-            if total_plays_b_tag:
-                value_string = list(total_plays_b_tag.parent.stripped_strings)[-1]
-                total_plays = int(value_string.replace(',', ''))
-        except Exception as e:
-            log.warning(f"SCRAPER: Could not parse Total Plays for {sdvx_id}: {e}")
-
-        recent_plays = []
-        play_table = soup.find("table", id="playstable")
-        if play_table:
-            for row in play_table.select("tbody > tr"):
-                if "accordion-toggle" not in row.get("class", []): continue
-                cols = row.find_all("td")
-                if len(cols) < 8: continue
+async def parse_profile_page(
+    page: str | dict, sdvx_id: str, change_detector: ProfileChangeDetector, parse_pool: ParsePool, parse_stats: StageStats | None = None
+) -> dict:
+    """
+    Parse stage of a profile scrape: HTML goes to the parser process pool; extracted profiles
+    pass through. A page whose content hash matches the player's last page is not parsed
+    again; the profile parsed from that page is returned instead.
+    """
+    content_hash = profile_content_hash(page)
+    unchanged = change_detector.lookup(sdvx_id, content_hash)
+    if unchanged is not None:
+        return unchanged
+    profile = page if isinstance(page, dict) else await parse_pool.run(parse_profile_html, page, sdvx_id, stats=parse_stats)
+    change_detector.remember(sdvx_id, content_hash, profile)
+    return profile
+
+def clone_chrome_profile(dest_user_data_dir: str) -> str:
+    """
+    Copies the logged-in Chrome profile into dest_user_data_dir so a second Chrome
+    process can use it. Lock files and caches are skipped. Returns dest_user_data_dir.
+    """
+    src_profile = os.path.join(CHROME_USER_DATA_DIR, CHROME_PROFILE_DIR)
+    dest_profile = os.path.join(dest_user_data_dir, CHROME_PROFILE_DIR)
+    shutil.rmtree(dest_user_data_dir, ignore_errors=True)
+    shutil.copytree(
+        src_profile, dest_profile,
+        ignore=shutil.ignore_patterns("Singleton*", "*.lock", "LOCK", "Cache", "Code Cache", "GPUCache", "Service Worker"),
+    )
+    local_state = os.path.join(CHROME_USER_DATA_DIR, "Local State")
+    if os.path.exists(local_state):
+        shutil.copy2(local_state, dest_user_data_dir)
+    return dest_user_data_dir
+
+
+class EagleBrowserPool:
+    """
+    N EagleBrowser instances, each with its own headless driver, behind the same
+    scrape_leaderboard / scrape_player_profile coroutines as a single EagleBrowser.
+    A scrape checks out an idle browser and health-checks only that driver
+    (ensure_browser_is_ready), so a dead driver is restarted by the one request
+    that finds it and never blocks the other drivers. Profile scrapes hold the
+    browser for the fetch stage only; the page is parsed after it is returned.
+    """
+    def __init__(self, size: int = BROWSER_POOL_SIZE, backend: str = SCRAPE_BACKEND, pool_dir: str = CHROME_POOL_DIR,
+                 change_detector: ProfileChangeDetector | None = None, rate_limiter: RateLimiter | None = None,
+                 stage_stats: dict | None = None, startup_timer: StartupTimer | None = None, parse_pool: ParsePool | None = None):
+        self.size = max(1, size)
+        self.pool_dir = pool_dir
+        # One cookie jar for the pool: a re-login by any browser is picked up by the others.
+        self.cookie_store = CookieStore()
+        # Shared too, so a player's last page is known whichever driver fetches it.
+        self.change_detector = change_detector or ProfileChangeDetector()
+        # One request budget for eagle.ac, however many drivers are fetching.
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.stage_stats = stage_stats or scrape_stage_stats()
+        self.startup_timer = startup_timer or StartupTimer()
+        self.parse_pool = parse_pool or ParsePool()
+        self.browsers = [
+            EagleBrowser(
+                backend=backend,
+                user_data_dir=CHROME_USER_DATA_DIR if i == 0 else os.path.join(pool_dir, f"worker-{i}"),
+                standby_dir_prefix=os.path.join(pool_dir, f"worker-{i}-standby"),
+                tmpfs_user_data_dir=os.path.join(CHROME_TMPFS_DIR, f"worker-{i}"),
+                cookie_store=self.cookie_store,
+                change_detector=self.change_detector,
+                rate_limiter=self.rate_limiter,
+                stage_stats=self.stage_stats,
+                startup_timer=self.startup_timer,
+                parse_pool=self.parse_pool,
+            )
+            for i in range(self.size)
+        ]
+        self._idle = asyncio.Queue()
+        for browser in self.browsers:
+            self._idle.put_nowait(browser)
+
+    def init_headless_chrome(self) -> bool:
+        started = 0
+        for i, browser in enumerate(self.browsers):
+            if i > 0 and not browser.memory_budget:
+                # In memory budget mode each browser clones its own profile into tmpfs.
                 try:
-                    recent_plays.append({
-                        "song_title": cols[1].find("b").get_text(strip=True) if cols[1].find("b") else None,
-                        "chart": cols[2].get_text(strip=True),
-                        "clear_type": cols[3].find("strong").get_text(strip=True),
-                        "grade": cols[4].find("strong").get_text(strip=True),
-                        "score": cols[5].get_text(strip=True),
-                        "vf_per_play": float(cols[6].get_text(strip=True)) if cols[6].get_text(strip=True) else None,
-                        "timestamp": cols[7].find("small").get_text(strip=True),
-                        "is_new_record": bool(cols[0].find("i", class_="fa fa-star"))
-                    })
-                except Exception as e:
-                    # RESTORED: Logging for row parse errors
-                    log.warning(f"SCRAPER: Could not parse a play row for {sdvx_id}. Error: {e}")
+                    clone_chrome_profile(browser.user_data_dir)
+                except OSError as e:
+                    log.error(f"❌ BROWSER_POOL: Could not clone Chrome profile for worker {i}: {e}")
                     continue
-        
-        log.debug(f"SCRAPER: Profile scraped for {sdvx_id}. Name: {player_name}, Recent Plays: {len(recent_plays)}")
-        return { 
-            "player_name": player_name,
-            "skill_level": skill_level,
-            "total_plays": total_plays,
-            "recent_plays": recent_plays 
-        }
+            if browser.init_headless_chrome():
+                started += 1
+        log.info(f"BROWSER_POOL: {started}/{self.size} headless drivers started.")
+        return started > 0
 
-    async def scrape_player_profile(self, sdvx_id: str) -> dict:
-        await self.ensure_browser_is_ready()
+    def quit_headless(self):
+        for browser in self.browsers:
+            browser.quit_headless()
+
+    async def close(self):
+        for browser in self.browsers:
+            await browser.close()
+
+    def is_alive(self) -> bool:
+        return any(browser.is_alive() for browser in self.browsers)
+
+    def restart_stats(self) -> dict:
+        """Restart counters summed over the pool; swap and cold-start latencies averaged."""
+        per_browser = [browser.restart_stats() for browser in self.browsers]
+        totals = {key: sum(stats[key] for stats in per_browser) for key in ("restarts", "standby_swaps", "cold_starts", "watchdog_kills", "recycles", "standby_ready")}
+        sampled = [stats["rss_mb"] for stats in per_browser if stats["rss_mb"] is not None]
+        totals["rss_mb"] = sum(sampled) if sampled else None
+        for avg_key, count_key in (("avg_swap_ms", "standby_swaps"), ("avg_cold_start_ms", "cold_starts")):
+            total_ms = sum(stats[avg_key] * stats[count_key] for stats in per_browser if stats[avg_key] is not None)
+            totals[avg_key] = total_ms / totals[count_key] if totals[count_key] else None
+        return totals
+
+    async def check_login(self) -> bool:
+        async with self.checkout() as browser:
+            return await browser.check_login()
+
+    async def relogin(self) -> bool:
+        async with self.checkout() as browser:
+            return await browser.relogin()
+
+    async def shutdown(self):
+        """Quits every driver once it is idle; a scrape in progress finishes first."""
+        checked_out = [await self._idle.get() for _ in self.browsers]
         try:
-            return await asyncio.to_thread(self._scrape_player_profile_sync, sdvx_id)
-        except InvalidSessionIdException:
-            log.warning("Caught InvalidSessionIdException during profile scrape. Retrying once...")
-            await self.ensure_browser_is_ready()
-            return await asyncio.to_thread(self._scrape_player_profile_sync, sdvx_id)
\ No newline at end of file
+            for browser in checked_out:
+                await browser.shutdown()
+        finally:
+            for browser in checked_out:
+                self._idle.put_nowait(browser)
+
+    @asynccontextmanager
+    async def checkout(self):
+        browser = await self._idle.get()
+        try:
+            yield browser
+        finally:
+            self._idle.put_nowait(browser)
+
+    async def scrape_leaderboard(self) -> list:
+        async with self.checkout() as browser:
+            return await browser.scrape_leaderboard()
+
+    async def scrape_player_profile(self, sdvx_id: str) -> dict:
+        async with self.checkout() as browser:
+            page = await browser.fetch_player_profile(sdvx_id)
+        return await parse_profile_page(page, sdvx_id, self.change_detector, self.parse_pool, self.stage_stats["parse"])
@@ -0,0 +1,566 @@
+# bot/eagle_cdp.py
+#
+# Browser backend that speaks the Chrome DevTools Protocol directly over one asyncio
+# websocket instead of going through chromedriver. Every command is a message on that
+# socket, so a scrape waiting on Chrome costs a coroutine rather than a thread, and
+# concurrency comes from several page targets (tabs) in the same browser rather than one
+# Chrome + chromedriver per worker.
+import os
+import json
+import time
+import asyncio
+import itertools
+import subprocess
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+from bot.config import (
+    log, EAGLE_BASE_URL, ARCADE_ID, EAGLE_EMAIL, EAGLE_PASSWORD, CHROME_USER_DATA_DIR, CHROME_PROFILE_DIR,
+    CHROME_LEAN_PROFILE, CHROME_NAVIGATION_DEADLINE_SECONDS, SCRAPE_EXTRACTION, EAGLE_LOGIN_STEP_SECONDS,
+    CDP_PAGE_TARGETS, CHROME_BINARY_PATH, CHROME_CDP_URL
+)
+from bot.eagle_errors import ScrapeError, ScrapeTimeoutError, SessionExpiredError
+from bot.eagle_browser import LEAN_BLOCKED_URL_PATTERNS, profile_outcome_error, parse_profile_page
+from bot.cookie_store import CookieStore, cdp_cookie_params
+from bot.change_detector import ProfileChangeDetector
+from bot.rate_limiter import RateLimiter
+from bot.parse_pool import ParsePool
+from bot.utils.metrics import StartupTimer, scrape_stage_stats
+from bot.eagle_parser import (
+    parse_leaderboard_html, leaderboard_from_rows, profile_from_extract,
+    LEADERBOARD_EXTRACT_JS, PROFILE_EXTRACT_JS, PROFILE_CLASSIFY_JS, SESSION_CHECK_JS, PAGE_READY,
+    LOGIN_STATE_JS, LOGIN_LINK, LOGIN_FORM, LOGIN_AUTHORIZE, LOGIN_DONE, CHALLENGE_CHECK_JS
+)
+
+# Same condition as the Selenium backend's LEADERBOARD_PANEL_LOCATOR.
+LEADERBOARD_READY_JS = """
+return Array.from(document.querySelectorAll("div.panel-primary h3")).some(h => h.textContent.includes("Arcade Top 10")) ? "ready" : null;
+"""
+PAGE_SOURCE_JS = "return document.documentElement.outerHTML;"
+
+LOGIN_ACTION_JS = {
+    LOGIN_LINK: """document.querySelector('a[href$="/auth/kailua"]').click();""",
+    LOGIN_AUTHORIZE: """Array.from(document.querySelectorAll("button")).find(b => /Authorize|Allow/.test(b.textContent)).click();""",
+}
+
+# How long a page waits for its element, and how often it checks.
+PAGE_WAIT_SECONDS = 10
+PAGE_POLL_SECONDS = 0.1
+
+
+class CdpError(ScrapeError):
+    """A DevTools command failed, or the connection to Chrome was lost."""
+
+
+class CdpConnection:
+    """
+    One DevTools websocket. Replies are matched to commands by id; events are delivered to
+    whoever subscribed to them for that session, and dropped otherwise.
+    """
+    def __init__(self, ws_url: str):
+        self.ws_url = ws_url
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._subscribers = {}     # (sessionId, method) -> queues
+        self._session = None
+        self._ws = None
+        self._reader = None
+
+    @property
+    def closed(self) -> bool:
+        return self._ws is None or self._ws.closed
+
+    async def connect(self):
+        self._session = aiohttp.ClientSession()
+        try:
+            self._ws = await self._session.ws_connect(self.ws_url, max_msg_size=0)
+        except Exception:
+            await self._session.close()
+            raise
+        self._reader = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self):
+        try:
+            async for msg in self._ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                data = json.loads(msg.data)
+                if "method" in data:
+                    for queue in self._subscribers.get((data.get("sessionId"), data["method"]), ()):
+                        queue.put_nowait(data.get("params", {}))
+                    continue
+                future = self._pending.get(data.get("id"))
+                if future is None or future.done():
+                    continue
+                if "error" in data:
+                    future.set_exception(CdpError(f"{data['error'].get('message')} ({data['error'].get('code')})"))
+                else:
+                    future.set_result(data.get("result", {}))
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CdpError("DevTools connection closed"))
+
+    async def send(self, method: str, params: dict | None = None, session_id: str | None = None, timeout: float = 30) -> dict:
+        if self.closed:
+            raise CdpError(f"DevTools connection closed before {method}")
+        command_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[command_id] = future
+        message = {"id": command_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        try:
+            await self._ws.send_json(message)
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise CdpError(f"{method} got no reply within {timeout}s")
+        finally:
+            self._pending.pop(command_id, None)
+
+    def subscribe(self, session_id: str | None, method: str) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        self._subscribers.setdefault((session_id, method), []).append(queue)
+        return queue
+
+    def unsubscribe(self, session_id: str | None, method: str, queue: asyncio.Queue):
+        queues = self._subscribers.get((session_id, method), [])
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            self._subscribers.pop((session_id, method), None)
+
+    async def close(self):
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+
+
+class CdpPage:
+    """A page target attached to the browser connection with its own (flattened) session."""
+    def __init__(self, connection: CdpConnection, target_id: str, session_id: str):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+
+    @classmethod
+    async def open(cls, connection: CdpConnection, lean: bool) -> "CdpPage":
+        target = await connection.send("Target.createTarget", {"url": "about:blank"})
+        attached = await connection.send("Target.attachToTarget", {"targetId": target["targetId"], "flatten": True})
+        page = cls(connection, target["targetId"], attached["sessionId"])
+        # Page events tell navigate() when the new document has replaced the old one.
+        await page.send("Page.enable")
+        if lean:
+            await page.send("Network.enable")
+            await page.send("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URL_PATTERNS})
+        return page
+
+    async def send(self, method: str, params: dict | None = None) -> dict:
+        return await self.connection.send(method, params, session_id=self.session_id)
+
+    async def evaluate(self, script: str):
+        """Runs a script written for execute_script (a function body that may 'return') and returns its value."""
+        reply = await self.send("Runtime.evaluate", {"expression": f"(() => {{\n{script}\n}})()", "returnByValue": True})
+        if "exceptionDetails" in reply:
+            raise CdpError(f"Script failed: {reply['exceptionDetails'].get('text')}")
+        return reply.get("result", {}).get("value")
+
+    async def navigate(self, url: str, timeout: float = PAGE_WAIT_SECONDS):
+        """
+        Navigates and returns once the new document has committed in the main frame. Pages are
+        reused between scrapes, so until then scripts would still run against the previous
+        page, e.g. another player's Score Log.
+        """
+        navigated = self.connection.subscribe(self.session_id, "Page.frameNavigated")
+        try:
+            reply = await self.send("Page.navigate", {"url": url})
+            if reply.get("errorText"):
+                raise ScrapeError(f"Navigation to {url} failed: {reply['errorText']}")
+            loader_id = reply.get("loaderId")
+            if loader_id is None:
+                return  # same-document navigation; nothing is replaced
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while True:
+                try:
+                    frame = (await asyncio.wait_for(navigated.get(), deadline - loop.time())).get("frame", {})
+                except asyncio.TimeoutError:
+                    raise ScrapeTimeoutError(f"Navigation to {url} did not commit within {timeout}s")
+                if frame.get("loaderId") == loader_id and not frame.get("parentId"):
+                    return
+        finally:
+            self.connection.unsubscribe(self.session_id, "Page.frameNavigated", navigated)
+
+    async def wait_for(self, script: str, timeout: float = PAGE_WAIT_SECONDS):
+        """Polls script until it returns a truthy value; None on timeout. Errors while the page is still loading count as not ready."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            try:
+                value = await self.evaluate(script)
+                if value:
+                    return value
+            except CdpError:
+                if self.connection.closed:
+                    raise
+            if loop.time() >= deadline:
+                return None
+            await asyncio.sleep(PAGE_POLL_SECONDS)
+
+    async def close(self):
+        try:
+            await self.connection.send("Target.closeTarget", {"targetId": self.target_id}, timeout=5)
+        except CdpError:
+            pass
+
+
+async def cdp_login(page: CdpPage, start_url: str, step_seconds: float = EAGLE_LOGIN_STEP_SECONDS) -> bool:
+    """The kailua login of perform_login, driven through a page target."""
+    await page.navigate(start_url)
+    last_state = None
+    for _ in range(6):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + step_seconds
+        state = None
+        while loop.time() < deadline:
+            state = await page.wait_for(LOGIN_STATE_JS, timeout=deadline - loop.time())
+            if state != last_state:
+                break
+            await asyncio.sleep(PAGE_POLL_SECONDS)
+        if state is None or state == last_state:
+            log.error(f"LOGIN: Login stalled after step '{last_state}'.")
+            return False
+        if state == LOGIN_DONE:
+            return True
+        if state == LOGIN_FORM:
+            if not (EAGLE_EMAIL and EAGLE_PASSWORD):
+                log.error("LOGIN: eagle.ac asked for credentials but EAGLE_EMAIL / EAGLE_PASSWORD are not set.")
+                return False
+            await page.evaluate(
+                f"""const email = document.querySelector('input[name="email"]');
+                email.value = {json.dumps(EAGLE_EMAIL)};
+                document.querySelector('input[name="password"]').value = {json.dumps(EAGLE_PASSWORD)};
+                email.form.submit();"""
+            )
+            log.info("LOGIN: Submitted Eagle credentials.")
+        else:
+            await page.evaluate(LOGIN_ACTION_JS[state])
+        last_state = state
+    log.error("LOGIN: Login did not finish within 6 steps.")
+    return False
+
+
+class EagleCdpBrowser:
+    """
+    One headless Chrome driven over CDP, with `pages` page targets scraping concurrently.
+    Exposes the same coroutines as EagleBrowserPool, so it can sit behind the ScrapeQueue in
+    its place. Chrome is launched from CHROME_BINARY_PATH, or an already running Chrome is
+    used when CHROME_CDP_URL is set. A page that passes the navigation deadline is closed and
+    replaced; a lost connection restarts Chrome on the next scrape.
+    """
+    def __init__(
+        self, pages: int = CDP_PAGE_TARGETS, base_url: str = EAGLE_BASE_URL, user_data_dir: str = CHROME_USER_DATA_DIR,
+        chrome_path: str = CHROME_BINARY_PATH, cdp_url: str | None = CHROME_CDP_URL, lean: bool = CHROME_LEAN_PROFILE,
+        extraction: str = SCRAPE_EXTRACTION, navigation_deadline: float = CHROME_NAVIGATION_DEADLINE_SECONDS,
+        cookie_store: CookieStore | None = None, change_detector: ProfileChangeDetector | None = None,
+        rate_limiter: RateLimiter | None = None, stage_stats: dict | None = None, startup_timer: StartupTimer | None = None,
+        parse_pool: ParsePool | None = None
+    ):
+        self.pages = max(1, pages)
+        self.base_url = base_url.rstrip("/")
+        self.user_data_dir = user_data_dir
+        self.chrome_path = chrome_path
+        self.cdp_url = cdp_url
+        self.lean = lean
+        self.extraction = extraction
+        self.navigation_deadline = navigation_deadline
+        self.cookie_store = cookie_store or CookieStore()
+        self.change_detector = change_detector or ProfileChangeDetector()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.stage_stats = stage_stats or scrape_stage_stats()
+        self.startup_timer = startup_timer or StartupTimer()
+        self.parse_pool = parse_pool or ParsePool()
+        self.ws_url = cdp_url
+        self._process = None
+        self._connection = None
+        self._idle = asyncio.Queue()
+        self._start_lock = asyncio.Lock()
+        self._cookie_version = None
+        self.logins = 0
+        self.restart_counts = {"restarts": 0, "cold_starts": 0, "watchdog_kills": 0}
+        self.cold_start_ms = 0.0
+
+    def _profile_url(self, sdvx_id: str) -> str:
+        return f"{self.base_url}/game/sdvx/profile/{sdvx_id}"
+
+    def _leaderboard_url(self) -> str:
+        return f"{self.base_url}/arcade/{ARCADE_ID}"
+
+    # ─── Chrome process ───
+
+    def init_headless_chrome(self) -> bool:
+        """Launches Chrome with a DevTools port (not needed with CHROME_CDP_URL). The websocket connects on first use."""
+        if self.cdp_url:
+            self.ws_url = self.cdp_url
+            return True
+        log.info("☁️ Launching headless Chrome for DevTools scraping…")
+        port_file = os.path.join(self.user_data_dir, "DevToolsActivePort")
+        try:
+            if os.path.exists(port_file):
+                os.unlink(port_file)
+            self._process = subprocess.Popen(
+                [
+                    self.chrome_path, "--headless=new", "--disable-gpu", "--no-sandbox", "--disable-dev-shm-usage",
+                    "--remote-debugging-port=0", f"--user-data-dir={self.user_data_dir}",
+                    f"--profile-directory={CHROME_PROFILE_DIR}", "about:blank",
+                ],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            deadline = time.monotonic() + 20
+            while not os.path.exists(port_file):
+                if self._process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"Chrome did not open a DevTools port (exit code {self._process.poll()})")
+                time.sleep(0.1)
+            time.sleep(0.05)  # the file is written in two lines
+            with open(port_file) as f:
+                port, path = f.read().split()[:2]
+            self.ws_url = f"ws://127.0.0.1:{port}{path}"
+            log.info(f"✅ Headless Chrome listening for DevTools on port {port}.")
+            return True
+        except Exception as e:
+            log.error(f"❌ Failed to launch headless Chrome: {e}", exc_info=True)
+            self.quit_headless()
+            return False
+
+    def _process_alive(self) -> bool:
+        if self.cdp_url:
+            return True
+        return self._process is not None and self._process.poll() is None
+
+    def quit_headless(self):
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            log.info("⚪️ Headless Chrome closed.")
+        self._process = None
+
+    def is_alive(self) -> bool:
+        return self._process_alive() and (self._connection is None or not self._connection.closed)
+
+    async def _disconnect(self):
+        connection, self._connection = self._connection, None
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        if connection is not None:
+            await connection.close()
+
+    async def ensure_browser_is_ready(self):
+        async with self._start_lock:
+            if self._connection is not None and not self._connection.closed and self._process_alive():
+                return
+            restarting = self._connection is not None
+            start = time.perf_counter()
+            await self._disconnect()
+            if not self._process_alive() or not self.ws_url:
+                await asyncio.to_thread(self.quit_headless)
+                if not await asyncio.to_thread(self.init_headless_chrome):
+                    raise RuntimeError("Headless browser is unavailable and could not be restarted.")
+            connection = CdpConnection(self.ws_url)
+            await connection.connect()
+            self._connection = connection
+            for _ in range(self.pages):
+                self._idle.put_nowait(await CdpPage.open(connection, self.lean))
+            self._cookie_version = None
+            await self._restore_cookies()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if restarting:
+                self.restart_counts["restarts"] += 1
+                self.restart_counts["cold_starts"] += 1
+                self.cold_start_ms += elapsed_ms
+            log.info(f"BROWSER: DevTools connection ready with {self.pages} page targets in {elapsed_ms:.0f} ms.")
+
+    @asynccontextmanager
+    async def _checkout(self):
+        await self.ensure_browser_is_ready()
+        if self._cookie_version != self.cookie_store.version:
+            await self._restore_cookies()
+        page = await self._idle.get()
+        try:
+            yield page
+        finally:
+            # Pages of a connection that has since been replaced are dropped.
+            if page.connection is self._connection and not page.connection.closed:
+                self._idle.put_nowait(page)
+
+    async def _run_page(self, label: str, func, *args):
+        """Runs func(page, *args) on an idle page under the navigation deadline; a page that misses it is replaced."""
+        await self.rate_limiter.acquire()
+        async with self._checkout() as page:
+            try:
+                return await asyncio.wait_for(func(page, *args), self.navigation_deadline or None)
+            except asyncio.TimeoutError:
+                self.restart_counts["watchdog_kills"] += 1
+                log.error(f"BROWSER: {label} passed its {self.navigation_deadline:.0f}s deadline; replacing its page target.")
+                await self._replace_page(page)
+                raise ScrapeTimeoutError(f"{label} hung past {self.navigation_deadline:.0f}s; page target replaced")
+
+    async def _replace_page(self, page: CdpPage):
+        connection = page.connection
+        await page.close()
+        # Marks the old page stale so _checkout doesn't return it; a new one takes its place.
+        page.connection = None
+        if connection is self._connection and not connection.closed:
+            self._idle.put_nowait(await CdpPage.open(connection, self.lean))
+
+    # ─── Cookies and login ───
+
+    async def _restore_cookies(self):
+        cookies = self.cookie_store.load()
+        if cookies and self._connection is not None:
+            await self._connection.send("Storage.setCookies", {"cookies": cdp_cookie_params(cookies)})
+            log.info(f"BROWSER: Restored {len(cookies)} saved eagle.ac cookies.")
+        self._cookie_version = self.cookie_store.version
+
+    async def _save_cookies(self, page: CdpPage):
+        cookies = (await self._connection.send("Storage.getCookies")).get("cookies", [])
+        cookies = [c for c in cookies if "eagle.ac" in c.get("domain", "")]
+        user_agent = await page.evaluate("return navigator.userAgent;")
+        self.cookie_store.save(cookies, user_agent=user_agent)
+        self._cookie_version = self.cookie_store.version
+
+    async def relogin(self) -> bool:
+        """Same contract as EagleBrowser.relogin: one login at a time, a newer saved jar wins."""
+        seen_version = self._cookie_version
+        async with self.cookie_store.lock:
+            if self.cookie_store.version != seen_version:
+                await self._restore_cookies()
+                return True
+            log.info("BROWSER: eagle.ac session expired; logging in again over DevTools...")
+            await self.rate_limiter.acquire()
+            start = time.perf_counter()
+            async with self._checkout() as page:
+                logged_in = await cdp_login(page, f"{self.base_url}/auth/kailua")
+                self.rate_limiter.report(time.perf_counter() - start)
+                if not logged_in:
+                    log.error("BROWSER: Re-login failed; scrapes will keep failing until the eagle.ac login works.")
+                    return False
+                await self._save_cookies(page)
+            self.logins += 1
+            log.info(f"BROWSER: Logged in again in {(time.perf_counter() - start) * 1000:.0f} ms.")
+            return True
+
+    async def _check_login_page(self, page: CdpPage) -> bool:
+        await page.navigate(self._leaderboard_url())
+        await page.wait_for(LEADERBOARD_READY_JS)
+        return bool(await page.evaluate(SESSION_CHECK_JS))
+
+    async def check_login(self) -> bool:
+        logged_in = await self._run_page("login check", self._check_login_page)
+        if logged_in:
+            self.startup_timer.record_scrape()
+        return logged_in
+
+    # ─── Scrapes ───
+
+    async def _load(self, page: CdpPage, url: str, ready_script: str, page_label: str) -> bool:
+        start = time.perf_counter()
+        await page.navigate(url)
+        outcome = await page.wait_for(ready_script)
+        if outcome is None:
+            try:
+                challenge = bool(await page.evaluate(CHALLENGE_CHECK_JS))
+            except CdpError:
+                challenge = False
+            self.rate_limiter.report(time.perf_counter() - start, challenge=challenge)
+            return False
+        self.rate_limiter.report(time.perf_counter() - start)
+        log.info(f"SCRAPER: {page_label} {outcome} in {(time.perf_counter() - start) * 1000:.0f} ms (cdp)")
+        if outcome != PAGE_READY:
+            raise profile_outcome_error(outcome, page_label)
+        return True
+
+    async def _read(self, page: CdpPage, extract_script: str):
+        """The in-page extraction result in 'js' mode, otherwise the page HTML."""
+        if self.extraction == "js":
+            try:
+                raw = await page.evaluate(extract_script)
+                if raw is not None:
+                    return raw
+            except CdpError as e:
+                log.warning(f"SCRAPER: In-page extraction failed, falling back to page source: {e}")
+        return await page.evaluate(PAGE_SOURCE_JS)
+
+    async def _leaderboard_page(self, page: CdpPage):
+        if not await self._load(page, self._leaderboard_url(), LEADERBOARD_READY_JS, "leaderboard"):
+            log.error("SCRAPER: Timed out waiting for leaderboard panel to load.")
+            return None
+        return await self._read(page, LEADERBOARD_EXTRACT_JS)
+
+    async def _profile_page(self, page: CdpPage, sdvx_id: str):
+        if not await self._load(page, self._profile_url(sdvx_id), PROFILE_CLASSIFY_JS, f"profile {sdvx_id}"):
+            log.warning(f"SCRAPER: Timed out waiting for Score Log table for {sdvx_id}.")
+            return {}
+        return await self._read(page, PROFILE_EXTRACT_JS)
+
+    async def _run_scrape(self, label: str, func, *args):
+        """_run_page, retried once after a re-login if the session has expired."""
+        try:
+            return await self._run_page(label, func, *args)
+        except SessionExpiredError:
+            if not await self.relogin():
+                raise
+        return await self._run_page(label, func, *args)
+
+    async def scrape_leaderboard(self) -> list:
+        raw = await self._run_scrape("leaderboard", self._leaderboard_page)
+        if raw is None:
+            return []
+        output = leaderboard_from_rows(raw) if isinstance(raw, list) else await self.parse_pool.run(parse_leaderboard_html, raw, stats=self.stage_stats["parse"])
+        if output:
+            self.startup_timer.record_scrape()
+        log.info(f"BACKGROUND SCRAPE: Found {len(output)} players on leaderboard (cdp).")
+        return output
+
+    async def fetch_player_profile(self, sdvx_id: str) -> str | dict:
+        """Fetch stage of a profile scrape; hand the result to parse_profile_page."""
+        start = time.perf_counter()
+        ok = False
+        try:
+            raw = await self._run_scrape(f"profile {sdvx_id}", self._profile_page, sdvx_id)
+            page = profile_from_extract(raw, sdvx_id) if isinstance(raw, dict) and raw else raw
+            ok = bool(page)
+            if ok:
+                self.startup_timer.record_scrape()
+            return page
+        finally:
+            self.stage_stats["fetch"].record(time.perf_counter() - start, ok=ok)
+
+    async def scrape_player_profile(self, sdvx_id: str) -> dict:
+        return await parse_profile_page(await self.fetch_player_profile(sdvx_id), sdvx_id, self.change_detector, self.parse_pool, self.stage_stats["parse"])
+
+    # ─── Lifecycle ───
+
+    def restart_stats(self) -> dict:
+        counts = self.restart_counts
+        return {
+            **counts,
+            "standby_swaps": 0, "recycles": 0, "standby_ready": 0, "avg_swap_ms": None,
+            "avg_cold_start_ms": self.cold_start_ms / counts["cold_starts"] if counts["cold_starts"] else None,
+            "rss_mb": None,
+        }
+
+    async def shutdown(self):
+        """Closes the connection and quits Chrome until the next scrape starts it again."""
+        async with self._start_lock:
+            await self._disconnect()
+            await asyncio.to_thread(self.quit_headless)
+
+    async def close(self):
+        await self.shutdown()
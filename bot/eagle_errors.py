@@ -0,0 +1,28 @@
+# bot/eagle_errors.py
+
+class ScrapeError(Exception):
+    """Base class for failures while fetching or reading an eagle.ac page."""
+
+
+class SessionExpiredError(ScrapeError):
+    """The eagle.ac session cookies are no longer valid; the page redirected to the kailua login."""
+
+
+class ScrapeTimeoutError(ScrapeError, TimeoutError):
+    """A queued scrape did not finish before its deadline."""
+
+
+class ProfileUnavailableError(ScrapeError):
+    """The profile page loaded but has no Score Log to read."""
+
+
+class ProfileNotFoundError(ProfileUnavailableError):
+    """eagle.ac has no player with this SDVX ID."""
+
+
+class EmptyProfileError(ProfileUnavailableError):
+    """The player exists but the profile shows no Score Log (no plays yet, or hidden)."""
+
+
+class CircuitOpenError(ScrapeError):
+    """The scrape was refused without loading a page because its circuit breaker is open."""
@@ -0,0 +1,85 @@
+# bot/eagle_http.py
+import time
+import aiohttp
+from http.cookies import SimpleCookie
+from yarl import URL
+
+from bot.config import log, HTTP_POOL_SIZE, HTTP_TIMEOUT_SECONDS
+from bot.eagle_errors import SessionExpiredError
+from bot.eagle_parser import is_challenge_html
+from bot.rate_limiter import RateLimiter
+
+def is_login_url(url: URL) -> bool:
+    return (url.host or "").startswith("kailua.") or url.path.startswith("/auth/kailua")
+
+class EagleHttpClient:
+    """
+    Fetches eagle.ac pages over plain HTTP with a pooled, keep-alive aiohttp session.
+    It holds no credentials of its own: the cookies come from the Chrome profile that
+    ran the OAuth login (see EagleBrowser.export_session_cookies).
+    """
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE, timeout_seconds: float = HTTP_TIMEOUT_SECONDS, rate_limiter: RateLimiter | None = None):
+        self.pool_size = pool_size
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.timeout_seconds = timeout_seconds
+        self.user_agent = None
+        self.cookies_loaded = False
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=aiohttp.CookieJar(),
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+            )
+        return self._session
+
+    def load_cookies(self, cookies: list, user_agent: str | None = None):
+        """Loads cookies in the Selenium/CDP dict format ({name, value, domain, path, ...})."""
+        if user_agent:
+            self.user_agent = user_agent
+        session = self._get_session()
+        session.cookie_jar.clear()
+        for cookie in cookies:
+            domain = cookie.get("domain", "").lstrip(".")
+            if not domain:
+                continue
+            morsel = SimpleCookie()
+            morsel[cookie["name"]] = cookie["value"]
+            morsel[cookie["name"]]["domain"] = cookie["domain"]
+            morsel[cookie["name"]]["path"] = cookie.get("path", "/")
+            if cookie.get("secure"):
+                morsel[cookie["name"]]["secure"] = True
+            session.cookie_jar.update_cookies(morsel, response_url=URL(f"https://{domain}/"))
+        self.cookies_loaded = True
+        log.info(f"HTTP_CLIENT: Loaded {len(cookies)} session cookies.")
+
+    async def fetch_html(self, url: str) -> str:
+        session = self._get_session()
+        headers = {"User-Agent": self.user_agent} if self.user_agent else None
+        await self.rate_limiter.acquire()
+        start = time.perf_counter()
+        async with session.get(url, headers=headers) as resp:
+            if is_login_url(resp.url):
+                self.cookies_loaded = False
+                raise SessionExpiredError(f"Redirected to login while fetching {url}")
+            html = await resp.text()
+            retry_after = resp.headers.get("Retry-After", "")
+            self.rate_limiter.report(
+                time.perf_counter() - start, status=resp.status, challenge=is_challenge_html(html),
+                retry_after=float(retry_after) if retry_after.isdigit() else None,
+            )
+            resp.raise_for_status()
+        if "/profile/" in url and 'id="playstable"' not in html and "/auth/kailua" in html:
+            # Logged-out profile pages render a login button instead of the Score Log.
+            self.cookies_loaded = False
+            raise SessionExpiredError(f"Profile page {url} was served without a session")
+        return html
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self.cookies_loaded = False
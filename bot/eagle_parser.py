@@ -0,0 +1,369 @@
+# bot/eagle_parser.py
+#
+# Parsing for eagle.ac pages. Each page is read in two steps: an extraction step that
+# pulls the raw strings out of the DOM, and a normalization step (leaderboard_from_rows /
+# profile_from_extract) that turns them into the dicts the services use. The extraction
+# runs either in Python over the HTML (BeautifulSoup) or inside Chrome through a single
+# execute_script call (LEADERBOARD_EXTRACT_JS / PROFILE_EXTRACT_JS); both feed the same
+# normalization, so both modes return identical dicts.
+#
+# The Python extraction uses lxml as the tree builder when it is installed, and for the
+# leaderboard only builds the panels it reads (see LEADERBOARD_STRAINER).
+import hashlib
+import importlib.util
+import json
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from bot.config import log, HTML_PARSER_BACKEND
+
+# Mirrors BeautifulSoup's get_text(strip=True) / stripped_strings so the in-page
+# extraction returns exactly the strings the Python extraction would.
+_JS_TEXT_HELPERS = """
+const strings = (el) => {
+    const out = [];
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        const t = walker.currentNode.nodeValue.trim();
+        if (t) out.push(t);
+    }
+    return out;
+};
+const text = (el) => strings(el).join("");
+"""
+
+LEADERBOARD_EXTRACT_JS = _JS_TEXT_HELPERS + """
+const h3 = Array.from(document.querySelectorAll("h3.panel-title")).find(h => h.textContent.includes("Arcade Top 10"));
+if (!h3) return [];
+const panel = h3.closest("div.panel-primary");
+if (!panel) return [];
+const table = panel.querySelector("table.table");
+if (!table) return [];
+return Array.from(table.querySelectorAll("tbody > tr")).map(tr => Array.from(tr.querySelectorAll("td")).map(text));
+"""
+
+PROFILE_EXTRACT_JS = _JS_TEXT_HELPERS + """
+const table = document.getElementById("playstable");
+if (!table) return null;
+const label = (s) => Array.from(document.getElementsByTagName("b")).find(b => b.textContent === s);
+
+let playerName = null;
+const nameDiv = document.querySelector("h2.page-header div.col-xs-7");
+if (nameDiv) {
+    const node = Array.from(nameDiv.childNodes).find(n => n.nodeType === Node.TEXT_NODE);
+    if (node) playerName = node.nodeValue.trim();
+}
+let skillLevel = null;
+const skillB = label("Skill Level:");
+if (skillB) {
+    let sib = skillB.nextElementSibling;
+    while (sib && sib.tagName !== "I") sib = sib.nextElementSibling;
+    if (sib) skillLevel = text(sib);
+}
+let playsText = null;
+const playsB = label("Plays:");
+if (playsB) {
+    const values = strings(playsB.parentElement);
+    playsText = values.length ? values[values.length - 1] : null;
+}
+const rows = [];
+for (const tr of table.querySelectorAll("tbody > tr")) {
+    if (!tr.classList.contains("accordion-toggle")) continue;
+    const cols = tr.querySelectorAll("td");
+    if (cols.length < 8) continue;
+    const pick = (i, sel) => { const el = cols[i].querySelector(sel); return el ? text(el) : null; };
+    rows.push({
+        title: pick(1, "b"), chart: text(cols[2]), clear: pick(3, "strong"), grade: pick(4, "strong"),
+        score: text(cols[5]), vf: text(cols[6]), timestamp: pick(7, "small"),
+        is_new_record: cols[0].querySelector("i.fa.fa-star") !== null
+    });
+}
+return {player_name: playerName, skill_level: skillLevel, plays_text: playsText, rows: rows};
+"""
+
+
+# Outcomes of loading a profile page. Anything but PAGE_READY means there is no Score Log to
+# parse, and the scrape can stop right away instead of waiting out the full timeout.
+PAGE_READY = "ready"
+PAGE_LOGIN = "login"
+PAGE_NOT_FOUND = "not_found"
+PAGE_EMPTY = "empty"
+PAGE_UNKNOWN = "unknown"
+
+NOT_FOUND_PATTERN = re.compile(r"not\s*found|does not exist|no such player", re.IGNORECASE)
+
+# Polled by WebDriverWait while a profile page loads. Returns null while the outcome isn't
+# known yet. Not-found and empty are only decided once the page has finished loading.
+PROFILE_CLASSIFY_JS = """
+if (location.hostname.startsWith("kailua.") || location.pathname.startsWith("/auth/kailua")) return "login";
+if (document.getElementById("playstable")) return "ready";
+if (document.readyState !== "complete") return null;
+const headings = Array.from(document.querySelectorAll("title, h1, h2, .alert")).map(el => el.textContent).join(" ");
+if (/not\\s*found|does not exist|no such player/i.test(headings)) return "not_found";
+if (document.querySelector('a[href*="/auth/kailua"]')) return "login";
+if (document.querySelector("h2.page-header")) return "empty";
+return null;
+"""
+
+
+PARSER_BACKENDS = ("lxml", "html.parser")
+
+def _has_class(value, name: str) -> bool:
+    # While the page is being parsed the class attribute is still the raw "a b c" string.
+    if not value:
+        return False
+    return name in (value.split() if isinstance(value, str) else value)
+
+
+# Only the panels are built when parsing the leaderboard; everything else (head, scripts) is
+# skipped by the tree builder. Profile pages are parsed whole, as their fields are found by
+# label text wherever the page puts them.
+LEADERBOARD_STRAINER = SoupStrainer("div", attrs={"class": lambda value: _has_class(value, "panel-primary")})
+
+
+def available_parser_backends() -> list:
+    return [name for name in PARSER_BACKENDS if name == "html.parser" or importlib.util.find_spec(name) is not None]
+
+
+def resolve_parser_backend(requested: str = HTML_PARSER_BACKEND) -> str:
+    """Picks the tree builder: the requested one if installed, else the fastest available."""
+    available = available_parser_backends()
+    if requested in available:
+        return requested
+    if requested not in ("auto", ""):
+        log.warning(f"SCRAPER: HTML parser backend '{requested}' is not available; using '{available[0]}'.")
+    return available[0]
+
+
+PARSER_BACKEND = resolve_parser_backend()
+
+
+def make_soup(html: str, parse_only: SoupStrainer | None = None, backend: str | None = None) -> BeautifulSoup:
+    return BeautifulSoup(html, backend or PARSER_BACKEND, parse_only=parse_only)
+
+
+# True when the loaded page was served to a logged-in session (the nav shows Logout).
+SESSION_CHECK_JS = """
+if (location.hostname.startsWith("kailua.") || location.pathname.startsWith("/auth/kailua")) return false;
+return document.querySelector('a[href$="/logout"]') !== null;
+"""
+
+# Interstitials (Cloudflare-style) served instead of the page when the site is throttling us.
+CHALLENGE_MARKERS = ("challenge-platform", "cf-chl-", "<title>Just a moment...</title>", "<title>Attention Required!")
+CHALLENGE_CHECK_JS = """
+if (document.title.startsWith("Just a moment") || document.title.startsWith("Attention Required")) return true;
+return document.querySelector('[id^="cf-chl-"], script[src*="challenge-platform"]') !== null;
+"""
+
+def is_challenge_html(html: str) -> bool:
+    return any(marker in html for marker in CHALLENGE_MARKERS)
+
+# Where the kailua login stands on the current page, so the login can act as soon as the next
+# step appears instead of waiting out steps the session skips. null while a page is loading.
+LOGIN_LINK, LOGIN_FORM, LOGIN_AUTHORIZE, LOGIN_DONE = "link", "form", "authorize", "done"
+LOGIN_STATE_JS = """
+if (document.querySelector('input[name="email"]')) return "form";
+if ([...document.querySelectorAll("button")].some(b => /Authorize|Allow/.test(b.textContent))) return "authorize";
+if (location.hostname.startsWith("kailua.")) return null;
+if (document.querySelector('a[href$="/logout"]')) return "done";
+if (document.querySelector('a[href$="/auth/kailua"]')) return "link";
+return null;
+"""
+
+
+def classify_profile_soup(soup: BeautifulSoup) -> str:
+    """Same rules as PROFILE_CLASSIFY_JS, for pages fetched over HTTP."""
+    if soup.find("table", id="playstable"):
+        return PAGE_READY
+    headings = " ".join(el.get_text(" ", strip=True) for el in soup.select("title, h1, h2, .alert"))
+    if NOT_FOUND_PATTERN.search(headings):
+        return PAGE_NOT_FOUND
+    if soup.select_one('a[href*="/auth/kailua"]'):
+        return PAGE_LOGIN
+    if soup.select_one("h2.page-header"):
+        return PAGE_EMPTY
+    return PAGE_UNKNOWN
+
+
+def classify_profile_html(html: str, backend: str | None = None) -> str:
+    return classify_profile_soup(make_soup(html, backend=backend))
+
+
+def leaderboard_from_rows(rows: list) -> list:
+    """Normalizes the Top 10 table, given as a list of rows of cell strings."""
+    output = []
+    for cols in rows:
+        if len(cols) < 4: continue
+        try:
+            output.append({"rank": int(cols[0]), "sdvx_id": cols[1], "player_name": cols[2], "volforce": float(cols[3])})
+        except (ValueError, TypeError):
+            log.warning(f"SCRAPER: Could not parse row: {cols}")
+            continue
+    return output
+
+
+def profile_from_extract(raw: dict | None, sdvx_id: str) -> dict:
+    """Normalizes a raw profile extract (see PROFILE_EXTRACT_JS). Returns {} if the page had no Score Log."""
+    if not raw:
+        return {}
+    total_plays = None
+    if raw.get("plays_text") is not None:
+        try:
+            total_plays = int(raw["plays_text"].replace(',', ''))
+        except ValueError as e:
+            log.warning(f"SCRAPER: Could not parse Total Plays for {sdvx_id}: {e}")
+
+    recent_plays = []
+    for row in raw.get("rows", []):
+        try:
+            missing = [field for field in ("clear", "grade", "timestamp") if row.get(field) is None]
+            if missing:
+                raise ValueError(f"missing {', '.join(missing)}")
+            recent_plays.append({
+                "song_title": row["title"],
+                "chart": row["chart"],
+                "clear_type": row["clear"],
+                "grade": row["grade"],
+                "score": row["score"],
+                "vf_per_play": float(row["vf"]) if row["vf"] else None,
+                "timestamp": row["timestamp"],
+                "is_new_record": row["is_new_record"]
+            })
+        except Exception as e:
+            log.warning(f"SCRAPER: Could not parse a play row for {sdvx_id}. Error: {e}")
+            continue
+
+    return {
+        "player_name": raw.get("player_name"),
+        "skill_level": raw.get("skill_level"),
+        "total_plays": total_plays,
+        "recent_plays": recent_plays
+    }
+
+
+_TABLE_TAG = re.compile(r"<(/?)table\b", re.IGNORECASE)
+
+
+def _profile_region(html: str) -> str | None:
+    """
+    The part of a profile page the parser reads: from the page header through the end of the
+    Score Log table (tracking nested tables in the detail rows). None without a Score Log.
+    """
+    table_id = html.find('id="playstable"')
+    if table_id < 0:
+        return None
+    table_start = html.rfind("<table", 0, table_id)
+    depth = 0
+    for match in _TABLE_TAG.finditer(html, table_start):
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            header_start = html.rfind('<h2 class="page-header"', 0, table_start)
+            return html[header_start if header_start >= 0 else table_start:html.find(">", match.end()) + 1]
+    return None
+
+
+def profile_content_hash(page: str | dict) -> str | None:
+    """
+    Hash of what a profile page says, for change detection: the header-to-Score-Log region of
+    the HTML, or the extracted fields when the page was read in Chrome. None if there is nothing
+    to compare (no Score Log, empty extract).
+    """
+    if isinstance(page, dict):
+        if not page:
+            return None
+        content = json.dumps(page, sort_keys=True, ensure_ascii=False)
+    else:
+        content = _profile_region(page)
+        if content is None:
+            return None
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def play_fingerprint(play: dict) -> str:
+    """
+    Stable identity of a Score Log row: title, chart, score, timestamp and record flag.
+    Two rows only share a fingerprint if the same chart got the same score in the same minute.
+    """
+    key = "\x1f".join(str(play.get(field)) for field in ("song_title", "chart", "score", "timestamp", "is_new_record"))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def new_plays_since(recent_plays: list, known_fingerprints: set) -> tuple[list, bool]:
+    """
+    Walks a newest-first Score Log and stops at the first row already seen. Returns the new
+    plays (newest first) and whether a seen row was reached; False means every row on the page
+    is new, so plays older than the page may have been missed.
+    """
+    new_plays = []
+    for play in recent_plays:
+        if play_fingerprint(play) in known_fingerprints:
+            return new_plays, True
+        new_plays.append(play)
+    return new_plays, False
+
+
+def parse_leaderboard_html(html: str, backend: str | None = None) -> list:
+    soup = make_soup(html, LEADERBOARD_STRAINER, backend)
+    panel_h3 = soup.find("h3", class_="panel-title", string=lambda t: t and "Arcade Top 10" in t)
+    if not panel_h3:
+        return []
+    panel = panel_h3.find_parent("div", class_="panel-primary")
+    lead_table = panel.find("table", class_="table") if panel else None
+    if not lead_table:
+        return []
+    rows = [[td.get_text(strip=True) for td in row.find_all("td")] for row in lead_table.select("tbody > tr")]
+    return leaderboard_from_rows(rows)
+
+
+def _extract_profile_soup(soup: BeautifulSoup, sdvx_id: str) -> dict | None:
+    play_table = soup.find("table", id="playstable")
+    if not play_table:
+        return None
+
+    raw = {"player_name": None, "skill_level": None, "plays_text": None, "rows": []}
+    name_div = soup.select_one("h2.page-header div.col-xs-7")
+    if name_div:
+        name_text = name_div.find(string=True, recursive=False)
+        if name_text is not None:
+            raw["player_name"] = name_text.strip()
+
+    try:
+        skill_level_b_tag = soup.find("b", string="Skill Level:")
+        if skill_level_b_tag and skill_level_b_tag.find_next_sibling("i"):
+            raw["skill_level"] = skill_level_b_tag.find_next_sibling("i").get_text(strip=True)
+    except Exception as e:
+        log.warning(f"SCRAPER: Could not parse Skill Level for {sdvx_id}: {e}")
+    try:
+        total_plays_b_tag = soup.find("b", string="Plays:")
+        if total_plays_b_tag:
+            raw["plays_text"] = list(total_plays_b_tag.parent.stripped_strings)[-1]
+    except Exception as e:
+        log.warning(f"SCRAPER: Could not parse Total Plays for {sdvx_id}: {e}")
+
+    for row in play_table.select("tbody > tr"):
+        if "accordion-toggle" not in row.get("class", []): continue
+        cols = row.find_all("td")
+        if len(cols) < 8: continue
+
+        def pick(i: int, tag: str) -> str | None:
+            el = cols[i].find(tag)
+            return el.get_text(strip=True) if el else None
+
+        raw["rows"].append({
+            "title": pick(1, "b"),
+            "chart": cols[2].get_text(strip=True),
+            "clear": pick(3, "strong"),
+            "grade": pick(4, "strong"),
+            "score": cols[5].get_text(strip=True),
+            "vf": cols[6].get_text(strip=True),
+            "timestamp": pick(7, "small"),
+            "is_new_record": bool(cols[0].find("i", class_="fa fa-star"))
+        })
+    return raw
+
+
+def parse_profile_html(html: str, sdvx_id: str, backend: str | None = None) -> dict:
+    """Parses an SDVX profile page. Returns {} if the page has no Score Log table."""
+    soup = make_soup(html, backend=backend)
+    return profile_from_extract(_extract_profile_soup(soup, sdvx_id), sdvx_id)
@@ -4,14 +4,24 @@ import asyncio
 import discord
 from discord.ext import commands
 
-from bot.config import log, DISCORD_BOT_TOKEN
-from bot.eagle_browser import EagleBrowser
+from bot.config import log, DISCORD_BOT_TOKEN, BROWSER_POOL_SIZE, BROWSER_LIFECYCLE_ENABLED, SCRAPE_BACKEND, PLAYER_DB_PATH
+from bot.eagle_browser import EagleBrowserPool
+from bot.eagle_cdp import EagleCdpBrowser
+from bot.scrape_queue import ScrapeQueue
+from bot.parse_pool import ParsePool
+from bot.player_store import PlayerStore
+from bot.player_cache import PlayerCache
+from bot.change_detector import ProfileChangeDetector
+from bot.rate_limiter import RateLimiter
+from bot.utils.metrics import StartupTimer, scrape_stage_stats
 from bot.core.identity_service import IdentityService
+from bot.core.tracking_policy import TrackingPolicy
 from bot.core.session_service import SessionService
 from bot.core.performance_service import PerformanceService
 from bot.core.system_service import SystemService
 from bot.core.role_service import RoleService
 from bot.utils.chronos import Chronos
+from bot.utils.browser_lifecycle import BrowserLifecycle
 from bot.utils.error_handler import ScrapeErrorHandler
 from bot.utils.notification_service import NotificationService # Import the new service
 
@@ -27,13 +37,37 @@ async def main():
     intents = discord.Intents.all()
     bot = commands.Bot(command_prefix="!", intents=intents)
 
-    browser = EagleBrowser()
-    if not browser.init_headless_chrome():
+    system_service = SystemService("data/arcade_schedule.json")
+
+    # Every scrape goes through the priority queue in front of the browser pool.
+    change_detector = ProfileChangeDetector()
+    rate_limiter = RateLimiter()
+    stage_stats = scrape_stage_stats()
+    startup_timer = StartupTimer()
+    parse_pool = ParsePool()
+    if SCRAPE_BACKEND == "cdp":
+        backend = EagleCdpBrowser(change_detector=change_detector, rate_limiter=rate_limiter, stage_stats=stage_stats,
+                                  startup_timer=startup_timer, parse_pool=parse_pool)
+    else:
+        backend = EagleBrowserPool(size=BROWSER_POOL_SIZE, change_detector=change_detector, rate_limiter=rate_limiter,
+                                   stage_stats=stage_stats, startup_timer=startup_timer, parse_pool=parse_pool)
+    browser = ScrapeQueue(backend)
+    browser_lifecycle = BrowserLifecycle(browser, system_service, startup_timer=startup_timer, parse_pool=parse_pool) if BROWSER_LIFECYCLE_ENABLED else None
+    if browser_lifecycle and not browser_lifecycle.should_run():
+        log.info("Arcade is closed; the headless browser will be started before it opens.")
+    elif not browser.init_headless_chrome():
         log.error("❌ Bot cannot start without a headless browser. Exiting.")
         return
 
-    identity_service = IdentityService("data/users.json", browser)
-    performance_service = PerformanceService("data/users.json")
+    player_store = PlayerStore(PLAYER_DB_PATH)
+    if player_store.is_empty():
+        # One-shot migration from the JSON roster the bot used before the database.
+        player_store.import_users_json("data/users.json")
+    player_cache = PlayerCache(player_store)
+    player_cache.load()
+
+    identity_service = IdentityService(player_store, browser, tracking_policy=TrackingPolicy(), player_cache=player_cache)
+    performance_service = PerformanceService(player_store, player_cache=player_cache)
     performance_service.identity_service = identity_service
     role_service = RoleService(bot, GUILD_ID, NOW_PLAYING_ROLE_NAME)
     
@@ -46,22 +80,27 @@ async def main():
         performance_service=performance_service,
         browser=browser,
         role_service=role_service,
-        notification_service=notification_service
+        notification_service=notification_service,
+        player_store=player_store
     )
-    system_service = SystemService("data/arcade_schedule.json")
-    
     # The error handler can now also use the real notification service
-    error_handler = ScrapeErrorHandler(notification_service=notification_service)
+    error_handler = ScrapeErrorHandler(notification_service=notification_service, breakers=browser.breakers)
 
     log.info("Attaching services to bot instance...")
     bot.identity_service = identity_service
     bot.performance_service = performance_service
     bot.session_service = session_service
     bot.error_handler = error_handler
+    bot.scrape_queue = browser
+    bot.change_detector = change_detector
+    bot.rate_limiter = rate_limiter
+    bot.stage_stats = stage_stats
+    bot.startup_timer = startup_timer
     bot.role_service = role_service
     bot.notification_service = notification_service # Attach new service
 
-    chronos = Chronos(system_service, identity_service, session_service, error_handler=error_handler)
+    chronos = Chronos(system_service, identity_service, session_service, error_handler=error_handler, browser_lifecycle=browser_lifecycle)
+    bot.scheduler = chronos.scheduler
 
     @bot.event
     async def on_ready():
@@ -109,7 +148,16 @@ async def main():
         await bot.start(DISCORD_BOT_TOKEN)
     finally:
         log.info("🛑 Bot shutting down. Closing headless browser.")
-        browser.quit_headless()
+        try:
+            await session_service.close()
+            await browser.close()
+            parse_pool.shutdown()
+        finally:
+            # Runs even if Chrome hangs on close, so the roster's write-behind buffer is flushed.
+            try:
+                await player_cache.close()
+            finally:
+                player_store.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,58 @@
+# bot/parse_pool.py
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from bot.config import log, PARSE_POOL_WORKERS
+from bot.utils.metrics import StageStats
+
+
+class ParsePool:
+    """
+    The parser processes of the parse stage. They start on the first parse and stop with
+    shutdown() until the next one; main.py builds one and shares it between the browser
+    backend and the browser lifecycle, which shuts it down outside opening hours.
+    """
+    def __init__(self, workers: int = PARSE_POOL_WORKERS):
+        self.workers = workers
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor | None:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            # 'spawn' so workers don't inherit the driver threads and sockets of the bot process.
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            log.info(f"PARSE_POOL: Started {self.workers} parser processes.")
+        return self._executor
+
+    async def run(self, func, *args, stats: StageStats | None = None):
+        """
+        Runs a parse function (module-level, picklable arguments) in the parser process pool and
+        records it in stats, the caller's 'parse' stage. Falls back to a thread if the pool has broken.
+        """
+        start = time.perf_counter()
+        ok = False
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                result = await asyncio.to_thread(func, *args)
+            else:
+                try:
+                    result = await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+                except BrokenProcessPool:
+                    log.error("PARSE_POOL: Parser process pool broke; restarting it and parsing this page in a thread.")
+                    self._executor = None
+                    result = await asyncio.to_thread(func, *args)
+            ok = True
+            return result
+        finally:
+            if stats is not None:
+                stats.record(time.perf_counter() - start, ok=ok)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,124 @@
+# bot/player_cache.py
+import asyncio
+
+from bot.config import log, PLAYER_FLUSH_SECONDS
+from bot.player_store import PlayerStore
+
+
+class PlayerCache:
+    """
+    The authoritative player roster, held in memory and shared by the services. It is loaded
+    from the PlayerStore once; after that reads never touch the database. Players are found
+    by sdvx_id or discord_id in O(1), and the leaderboard order is kept until a rank changes.
+
+    Reads hand out copies, and changes come back through put_many, which writes the changed
+    players behind: they are marked dirty and saved to the store in one transaction at most
+    flush_seconds later, however many changes were made meanwhile. close() saves what is left.
+    """
+    def __init__(self, store: PlayerStore, flush_seconds: float = PLAYER_FLUSH_SECONDS):
+        self.store = store
+        self.flush_seconds = flush_seconds
+        self._players = None
+        self._by_discord_id = {}
+        self._leaderboard = None
+        self._dirty = set()
+        self._flush_task = None
+        self.flushes = 0
+        self.players_flushed = 0
+
+    def load(self):
+        """Reads the roster from the store. Called at startup; the first read does it otherwise."""
+        self._players = self.store.load_players()
+        self._by_discord_id = {p["discord_id"]: sdvx_id for sdvx_id, p in self._players.items() if p.get("discord_id")}
+        self._leaderboard = None
+        log.info(f"PLAYER_CACHE: Loaded {len(self._players)} players from {self.store.path}.")
+
+    def _roster(self) -> dict:
+        if self._players is None:
+            self.load()
+        return self._players
+
+    def snapshot(self) -> dict:
+        """A copy of the whole roster as {sdvx_id: player}, safe to modify and put back."""
+        return {sdvx_id: dict(player) for sdvx_id, player in self._roster().items()}
+
+    def get(self, sdvx_id: str) -> dict | None:
+        player = self._roster().get(sdvx_id)
+        return dict(player) if player else None
+
+    def get_by_discord_id(self, discord_id: str) -> dict | None:
+        self._roster()
+        sdvx_id = self._by_discord_id.get(discord_id)
+        return self.get(sdvx_id) if sdvx_id else None
+
+    def leaderboard(self, limit: int = 10) -> list:
+        """The top ranked players, best rank first."""
+        if self._leaderboard is None:
+            ranked = [p for p in self._roster().values() if p.get("rank") is not None]
+            self._leaderboard = sorted(ranked, key=lambda p: p["rank"])
+        return [dict(p) for p in self._leaderboard[:limit]]
+
+    def put_many(self, players: dict) -> int:
+        """
+        Takes back changed players (from a snapshot or get) and schedules them to be written.
+        Players equal to the cached copy are ignored. Returns the number that changed.
+        """
+        roster = self._roster()
+        changed = 0
+        for sdvx_id, player in players.items():
+            old = roster.get(sdvx_id)
+            if old == player:
+                continue
+            player = dict(player)
+            roster[sdvx_id] = player
+            old_discord_id = old.get("discord_id") if old else None
+            if old_discord_id != player.get("discord_id"):
+                if old_discord_id and self._by_discord_id.get(old_discord_id) == sdvx_id:
+                    del self._by_discord_id[old_discord_id]
+                if player.get("discord_id"):
+                    self._by_discord_id[player["discord_id"]] = sdvx_id
+            if (old or {}).get("rank") is not None or player.get("rank") is not None:
+                self._leaderboard = None
+            self._dirty.add(sdvx_id)
+            changed += 1
+        if changed:
+            self._schedule_flush()
+        return changed
+
+    def pending_count(self) -> int:
+        return len(self._dirty)
+
+    def _schedule_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_seconds)
+        await self.flush()
+        if self._dirty:
+            # Changes made while the batch was being written go out in the next one.
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self):
+        """Writes every dirty player to the store in one transaction."""
+        if not self._dirty:
+            return
+        batch = {sdvx_id: self._players[sdvx_id] for sdvx_id in self._dirty}
+        self._dirty = set()
+        try:
+            await asyncio.to_thread(self.store.save_players, batch)
+        except Exception as e:
+            self._dirty.update(batch)
+            log.error(f"PLAYER_CACHE: Could not write {len(batch)} players to {self.store.path}; will retry. {e}", exc_info=True)
+            return
+        self.flushes += 1
+        self.players_flushed += len(batch)
+        log.debug(f"PLAYER_CACHE: Wrote {len(batch)} changed players to {self.store.path}.")
+
+    async def close(self):
+        """Cancels the pending delayed write and writes everything still dirty now."""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        self._flush_task = None
+        await self.flush()
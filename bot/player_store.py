@@ -0,0 +1,187 @@
+# bot/player_store.py
+import os
+import json
+import sqlite3
+import threading
+
+from bot.config import log, PLAYER_DB_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    sdvx_id TEXT PRIMARY KEY,
+    discord_id TEXT,
+    player_name TEXT,
+    rank INTEGER,
+    volforce REAL,
+    skill_level TEXT,
+    total_plays INTEGER,
+    last_updated TEXT,
+    extra TEXT
+);
+
+CREATE TABLE IF NOT EXISTS plays (
+    sdvx_id TEXT NOT NULL REFERENCES players (sdvx_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (sdvx_id, position)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    discord_id TEXT NOT NULL,
+    sdvx_id TEXT,
+    type TEXT,
+    start_time TEXT,
+    end_time TEXT NOT NULL,
+    songs_played INTEGER,
+    initial_volforce REAL,
+    final_volforce REAL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_discord_id ON sessions (discord_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_sdvx_id ON sessions (sdvx_id);
+"""
+
+# Player fields with their own column; anything else a player dict carries goes in `extra`.
+PLAYER_COLUMNS = ("discord_id", "player_name", "rank", "volforce", "skill_level", "total_plays", "last_updated")
+
+
+def _player_row(sdvx_id: str, player: dict) -> tuple:
+    extra = {k: v for k, v in player.items() if k not in PLAYER_COLUMNS and k not in ("sdvx_id", "recent_plays")}
+    return (sdvx_id, *(player.get(column) for column in PLAYER_COLUMNS), json.dumps(extra) if extra else None)
+
+
+def _normalized(sdvx_id: str, player: dict) -> str:
+    """A player serialized the way it reads back from the store, to tell whether it changed."""
+    player = {k: v for k, v in player.items() if v is not None or k not in PLAYER_COLUMNS}
+    player.update(sdvx_id=sdvx_id, discord_id=player.get("discord_id"), recent_plays=player.get("recent_plays") or [])
+    return json.dumps(player, sort_keys=True)
+
+
+class PlayerStore:
+    """
+    The player database: one row per player, their recent plays in roster order, and a
+    history of finished sessions. Players read back as the same dicts users.json held.
+
+    The roster is read whole, once, by PlayerCache, which serves every lookup from memory.
+    save_players writes a batch in one transaction and skips players unchanged since they
+    were last read or written. The connection is shared between threads (callers use
+    asyncio.to_thread) and serialized by a lock.
+    """
+    def __init__(self, path: str = PLAYER_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        # sdvx_id -> serialized player as last read or written, to skip unchanged rows.
+        self._known = {}
+        self.rows_written = 0
+        self.rows_skipped = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL with synchronous=NORMAL is durable across application crashes and only
+            # loses the last transactions on power loss.
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _players(self, conn: sqlite3.Connection) -> list:
+        rows = conn.execute("SELECT * FROM players").fetchall()
+        if not rows:
+            return []
+        plays = {}
+        for sdvx_id, data in conn.execute("SELECT sdvx_id, data FROM plays ORDER BY sdvx_id, position"):
+            plays.setdefault(sdvx_id, []).append(json.loads(data))
+        players = []
+        for row in rows:
+            player = {"sdvx_id": row["sdvx_id"], "discord_id": row["discord_id"]}
+            for column in PLAYER_COLUMNS[1:]:
+                if row[column] is not None:
+                    player[column] = row[column]
+            if row["extra"]:
+                player.update(json.loads(row["extra"]))
+            player["recent_plays"] = plays.get(row["sdvx_id"], [])
+            self._known[row["sdvx_id"]] = _normalized(row["sdvx_id"], player)
+            players.append(player)
+        return players
+
+    def load_players(self) -> dict:
+        """The whole roster as {sdvx_id: player}."""
+        with self._lock:
+            return {player["sdvx_id"]: player for player in self._players(self._connect())}
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._connect().execute("SELECT 1 FROM players LIMIT 1").fetchone() is None
+
+    def save_players(self, players: dict) -> int:
+        """
+        Upserts every player in players that changed, with their recent plays, in one
+        transaction. Players missing from the dict are kept. Returns the rows written.
+        """
+        with self._lock:
+            changed = []
+            for sdvx_id, player in players.items():
+                serialized = _normalized(sdvx_id, player)
+                if self._known.get(sdvx_id) != serialized:
+                    changed.append((sdvx_id, player, serialized))
+            self.rows_skipped += len(players) - len(changed)
+            if not changed:
+                return 0
+            conn = self._connect()
+            placeholders = ", ".join("?" * (len(PLAYER_COLUMNS) + 2))
+            updates = ", ".join(f"{column} = excluded.{column}" for column in (*PLAYER_COLUMNS, "extra"))
+            with conn:
+                conn.execute("BEGIN")
+                conn.executemany(
+                    f"INSERT INTO players VALUES ({placeholders}) ON CONFLICT (sdvx_id) DO UPDATE SET {updates}",
+                    [_player_row(sdvx_id, player) for sdvx_id, player, _ in changed],
+                )
+                conn.executemany("DELETE FROM plays WHERE sdvx_id = ?", [(sdvx_id,) for sdvx_id, _, _ in changed])
+                conn.executemany(
+                    "INSERT INTO plays VALUES (?, ?, ?)",
+                    [(sdvx_id, position, json.dumps(play)) for sdvx_id, player, _ in changed
+                     for position, play in enumerate(player.get("recent_plays") or [])],
+                )
+            for sdvx_id, _, serialized in changed:
+                self._known[sdvx_id] = serialized
+            self.rows_written += len(changed)
+            return len(changed)
+
+    def record_session(self, summary: dict):
+        """Adds a finished session to the history."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO sessions (discord_id, sdvx_id, type, start_time, end_time, songs_played, initial_volforce, final_volforce) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (summary["discord_id"], summary.get("sdvx_id"), summary.get("type"), summary.get("start_time"), summary["end_time"],
+                     summary.get("songs_played"), summary.get("initial_volforce"), summary.get("final_volforce")),
+                )
+
+    def import_users_json(self, users_file_path: str) -> int:
+        """One-shot import of a users.json roster. Returns the number of players imported."""
+        try:
+            with open(users_file_path, "r", encoding="utf-8") as f:
+                users = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except (OSError, json.JSONDecodeError) as e:
+            log.error(f"PLAYER_STORE: Could not import {users_file_path}: {e}")
+            return 0
+        count = self.save_players(users)
+        log.info(f"PLAYER_STORE: Imported {count} players from {users_file_path} into {self.path}.")
+        return count
@@ -0,0 +1,136 @@
+# bot/profile_cache.py
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from typing import Callable, Awaitable
+
+from bot.config import log, PROFILE_CACHE_TTL_SECONDS, PROFILE_CACHE_MAX_ENTRIES, PROFILE_NEGATIVE_CACHE_TTL_SECONDS
+from bot.eagle_errors import ProfileUnavailableError
+
+
+class _InFlight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class ProfileCache:
+    """
+    TTL + LRU cache of scraped profiles with single-flight fetching: while a scrape for an
+    sdvx_id is running, further requests for it wait on that scrape instead of starting
+    another. Empty results and transient errors are never cached.
+
+    IDs whose page has no Score Log at all (ProfileUnavailableError: not found, empty
+    profile) are negatively cached for negative_ttl_seconds; requests for them re-raise
+    the cached error without loading the page.
+    """
+    def __init__(self, ttl_seconds: float = PROFILE_CACHE_TTL_SECONDS, max_entries: int = PROFILE_CACHE_MAX_ENTRIES, negative_ttl_seconds: float = PROFILE_NEGATIVE_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._entries = OrderedDict()  # sdvx_id -> (fetched_at, profile), least recently used first
+        self._negative = {}            # sdvx_id -> (failed_at, ProfileUnavailableError)
+        self._in_flight = {}           # sdvx_id -> _InFlight
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.negative_hits = 0
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def get(self, sdvx_id: str, max_age: float | None = None) -> dict | None:
+        entry = self._entries.get(sdvx_id)
+        if entry is None:
+            return None
+        fetched_at, profile = entry
+        age = self._now() - fetched_at
+        if age > self.ttl_seconds:
+            del self._entries[sdvx_id]
+            return None
+        if max_age is not None and age > max_age:
+            return None
+        self._entries.move_to_end(sdvx_id)
+        return profile
+
+    def put(self, sdvx_id: str, profile: dict):
+        self._entries[sdvx_id] = (self._now(), profile)
+        self._entries.move_to_end(sdvx_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, sdvx_id: str):
+        self._entries.pop(sdvx_id, None)
+        self._negative.pop(sdvx_id, None)
+
+    def _get_negative(self, sdvx_id: str) -> ProfileUnavailableError | None:
+        entry = self._negative.get(sdvx_id)
+        if entry is None:
+            return None
+        failed_at, error = entry
+        if self._now() - failed_at > self.negative_ttl_seconds:
+            del self._negative[sdvx_id]
+            return None
+        return error
+
+    async def _fetch_and_store(self, sdvx_id: str, fetch: Callable[[], Awaitable[dict]]) -> dict:
+        try:
+            profile = await fetch()
+            if profile:
+                self.put(sdvx_id, profile)
+                self._negative.pop(sdvx_id, None)
+            return profile
+        except ProfileUnavailableError as e:
+            self._negative[sdvx_id] = (self._now(), e)
+            log.info(f"PROFILE_CACHE: Not scraping {sdvx_id} again for {self.negative_ttl_seconds:.0f}s ({type(e).__name__}).")
+            raise
+        finally:
+            entry = self._in_flight.get(sdvx_id)
+            if entry is not None and entry.task is asyncio.current_task():
+                del self._in_flight[sdvx_id]
+
+    async def get_or_fetch(self, sdvx_id: str, fetch: Callable[[], Awaitable[dict]], max_age: float | None = None) -> dict:
+        known_bad = self._get_negative(sdvx_id)
+        if known_bad is not None:
+            self.negative_hits += 1
+            raise known_bad
+
+        cached = self.get(sdvx_id, max_age)
+        if cached is not None:
+            self.hits += 1
+            return copy.deepcopy(cached)
+
+        entry = self._in_flight.get(sdvx_id)
+        if entry is not None:
+            self.coalesced += 1
+            log.debug(f"PROFILE_CACHE: Joined the in-flight scrape for {sdvx_id}.")
+        else:
+            self.misses += 1
+            entry = self._in_flight[sdvx_id] = _InFlight(asyncio.ensure_future(self._fetch_and_store(sdvx_id, fetch)))
+
+        entry.waiters += 1
+        try:
+            return copy.deepcopy(await asyncio.shield(entry.task))
+        finally:
+            entry.waiters -= 1
+            if entry.waiters == 0 and not entry.task.done():
+                # Everyone waiting gave up (deadline or cancellation): cancel the scrape itself.
+                if self._in_flight.get(sdvx_id) is entry:
+                    del self._in_flight[sdvx_id]
+                entry.task.cancel()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "negative_hits": self.negative_hits,
+            "entries": len(self._entries),
+            "negative_entries": len(self._negative),
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,108 @@
+# bot/rate_limiter.py
+import asyncio
+import time
+
+from bot.config import (
+    log, EAGLE_RATE_LIMIT_PER_SECOND, EAGLE_RATE_LIMIT_BURST, EAGLE_RATE_LIMIT_MIN_PER_SECOND, EAGLE_SLOW_RESPONSE_SECONDS
+)
+
+# Backoffs closer together than this count once, so a burst of concurrent failures halves the rate only once.
+BACKOFF_COOLDOWN_SECONDS = 5.0
+# Each fast response gives back this fraction of max_rate.
+RECOVERY_STEP = 0.05
+
+
+class RateLimiter:
+    """
+    Token bucket for every request to eagle.ac: `rate` requests per second on average, with
+    bursts of up to `burst`. Requests are scheduled in order of arrival; acquire() sleeps until
+    the request's slot comes up.
+
+    The rate adapts to how the site responds (report()): a 429/5xx, a challenge page or a page
+    slower than slow_seconds halves it, down to min_rate, and every fast response raises it by
+    a step until it is back at max_rate. A 429's Retry-After pauses every request until then.
+    A max_rate of 0 turns the limiter off.
+
+    main.py builds one and hands it to the browser backend, which shares it between every
+    fetch path (Selenium, HTTP, DevTools; scrapes, logins and login checks).
+    """
+    def __init__(
+        self, rate: float = EAGLE_RATE_LIMIT_PER_SECOND, burst: int = EAGLE_RATE_LIMIT_BURST,
+        min_rate: float = EAGLE_RATE_LIMIT_MIN_PER_SECOND, slow_seconds: float = EAGLE_SLOW_RESPONSE_SECONDS
+    ):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min(min_rate, rate) if rate > 0 else min_rate
+        self.slow_seconds = slow_seconds
+        self._next_slot = 0.0      # theoretical arrival time of the next request at the current rate
+        self._paused_until = 0.0
+        self._last_backoff = float("-inf")
+        self.requests = 0
+        self.delayed = 0
+        self.total_wait_seconds = 0.0
+        self.backoffs = 0
+        self.last_backoff_reason = None
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def reserve(self) -> float:
+        """Books the next request slot; returns how long the caller must wait for it."""
+        self.requests += 1
+        if self.max_rate <= 0:
+            return 0.0
+        now = self._now()
+        interval = 1.0 / self.rate
+        slot = max(self._next_slot, now)
+        self._next_slot = slot + interval
+        delay = max(slot - (self.burst - 1) * interval - now, self._paused_until - now, 0.0)
+        if delay > 0:
+            self.delayed += 1
+            self.total_wait_seconds += delay
+        return delay
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def report(self, seconds: float, status: int | None = None, challenge: bool = False, retry_after: float | None = None):
+        """Feeds back how a request went: its duration, HTTP status (if known) and whether it hit a challenge page."""
+        if self.max_rate <= 0:
+            return
+        if status == 429:
+            if retry_after:
+                self._paused_until = max(self._paused_until, self._now() + retry_after)
+            self._back_off(f"HTTP 429{f', retry after {retry_after:.0f}s' if retry_after else ''}")
+        elif status is not None and status >= 500:
+            self._back_off(f"HTTP {status}")
+        elif challenge:
+            self._back_off("challenge page")
+        elif seconds > self.slow_seconds:
+            self._back_off(f"{seconds:.1f}s response")
+        elif self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_STEP)
+            if self.rate == self.max_rate:
+                log.info(f"RATE_LIMIT: eagle.ac responses are healthy again; back to {self.rate:.2f} requests/s.")
+
+    def _back_off(self, reason: str):
+        now = self._now()
+        self.last_backoff_reason = reason
+        if now - self._last_backoff < BACKOFF_COOLDOWN_SECONDS:
+            return
+        self._last_backoff = now
+        self.backoffs += 1
+        self.rate = max(self.min_rate, self.rate / 2)
+        log.warning(f"RATE_LIMIT: Backing off to {self.rate:.2f} requests/s ({reason}).")
+
+    def stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "max_rate": self.max_rate,
+            "requests": self.requests,
+            "delayed": self.delayed,
+            "avg_wait_ms": self.total_wait_seconds / self.delayed * 1000 if self.delayed else 0.0,
+            "backoffs": self.backoffs,
+            "last_backoff_reason": self.last_backoff_reason,
+        }
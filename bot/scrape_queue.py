@@ -0,0 +1,204 @@
+# bot/scrape_queue.py
+import asyncio
+import contextlib
+import contextvars
+import itertools
+
+from bot.config import log, SCRAPE_QUEUE_WORKERS, PROFILE_CACHE_INTERACTIVE_MAX_AGE_SECONDS
+from bot.eagle_errors import ScrapeTimeoutError, ProfileUnavailableError, SessionExpiredError, CircuitOpenError
+from bot.profile_cache import ProfileCache
+from bot.utils.circuit_breaker import CircuitBreakers
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_ACTIVE_SESSION = 1
+PRIORITY_BACKGROUND = 2
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_ACTIVE_SESSION: "active_session", PRIORITY_BACKGROUND: "background"}
+
+# (priority, timeout_seconds) applied to scrapes submitted from the current task.
+_scrape_context = contextvars.ContextVar("scrape_context", default=(PRIORITY_BACKGROUND, None))
+
+
+@contextlib.contextmanager
+def scrape_priority(priority: int, timeout: float | None = None):
+    """
+    Sets the queue priority (and optional deadline) for every scrape awaited inside the block,
+    so callers deep in a service don't need to thread it through each call:
+
+        with scrape_priority(PRIORITY_INTERACTIVE, timeout=2.5):
+            await session_service.end_session(discord_id)
+    """
+    token = _scrape_context.set((priority, timeout))
+    try:
+        yield
+    finally:
+        _scrape_context.reset(token)
+
+
+class ScrapeRequest:
+    def __init__(self, label: str, func, args: tuple, future: asyncio.Future, enqueued_at: float):
+        self.label = label
+        self.func = func
+        self.args = args
+        self.future = future
+        self.enqueued_at = enqueued_at
+
+
+class ScrapeQueue:
+    """
+    Central priority queue in front of the browser (or browser pool). Workers, one per
+    scrape that may run at once, always take the highest-priority request next, so a
+    /checkout scrape waits for at most the scrapes already running rather than a whole sweep.
+    A profile scrape keeps its worker while its page is parsed, so there are more workers
+    than drivers (SCRAPE_QUEUE_WORKERS) to keep the drivers fetching meanwhile.
+
+    A request whose caller gave up (deadline passed or task cancelled) is dropped from the
+    queue. A scrape that has already started is left to finish, because the driver can't be
+    interrupted mid-page safely; its result is discarded.
+
+    Profile scrapes go through a ProfileCache first, so repeated and concurrent requests for
+    the same player cost one page load.
+
+    Page loads are guarded by circuit breakers, one per endpoint and one per player. While a
+    breaker is open its scrapes fail at once with CircuitOpenError instead of queueing.
+    """
+    def __init__(self, browser, workers: int = SCRAPE_QUEUE_WORKERS, profile_cache: ProfileCache | None = None, breakers: CircuitBreakers | None = None):
+        self.browser = browser
+        self.workers = max(1, workers)
+        self.profile_cache = profile_cache or ProfileCache()
+        self.breakers = breakers or CircuitBreakers()
+        self._queue = None
+        self._worker_tasks = []
+        self._seq = itertools.count()
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "timed_out": 0, "dropped": 0}
+
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        if not self._worker_tasks:
+            self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            priority, _, request = await self._queue.get()
+            try:
+                if request.future.done():
+                    self.stats["dropped"] += 1
+                    log.debug(f"SCRAPE_QUEUE: Dropped {request.label}; the caller is no longer waiting.")
+                    continue
+                waited = loop.time() - request.enqueued_at
+                if priority == PRIORITY_INTERACTIVE:
+                    log.info(f"SCRAPE_QUEUE: Starting interactive {request.label} after {waited * 1000:.0f} ms in queue.")
+                try:
+                    result = await request.func(*request.args)
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                else:
+                    self.stats["completed"] += 1
+                    if not request.future.done():
+                        request.future.set_result(result)
+            finally:
+                self._queue.task_done()
+
+    async def _submit(self, label: str, priority: int, func, *args):
+        self._ensure_workers()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put_nowait((priority, next(self._seq), ScrapeRequest(label, func, args, future, loop.time())))
+        self.stats["submitted"] += 1
+        return await future
+
+    async def _wait(self, label: str, priority: int, timeout: float | None, awaitable):
+        if timeout is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            self.stats["timed_out"] += 1
+            raise ScrapeTimeoutError(f"{label} did not finish within {timeout}s ({PRIORITY_NAMES.get(priority, priority)} priority)")
+
+    def pending_count(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def _guarded(self, label: str, breakers: list, awaitable):
+        """
+        Awaits a page load through its circuit breakers, endpoint last. Empty results count as
+        failures, as the browser returns them when a page couldn't be read; a missing or empty
+        profile is a valid answer from eagle.ac and counts as a success. A caller giving up
+        (deadline or cancellation) records nothing, as the wait may have been spent queued,
+        and an expired login is held against the endpoint only, not the player.
+        """
+        for i, breaker in enumerate(breakers):
+            if not breaker.allow():
+                for allowed in breakers[:i]:
+                    allowed.release()
+                awaitable.close()
+                raise CircuitOpenError(f"{label} skipped; {breaker.name} circuit breaker is open (retry in {breaker.retry_in():.0f}s)")
+        endpoint, players = breakers[-1], breakers[:-1]
+        try:
+            result = await awaitable
+        except ProfileUnavailableError:
+            for breaker in breakers:
+                breaker.record_success()
+            raise
+        except asyncio.CancelledError:
+            for breaker in breakers:
+                breaker.release()
+            raise
+        except SessionExpiredError:
+            for breaker in players:
+                breaker.release()
+            endpoint.record_failure()
+            raise
+        except Exception:
+            for breaker in breakers:
+                breaker.record_failure()
+            raise
+        for breaker in breakers:
+            breaker.record_success() if result else breaker.record_failure()
+        return result
+
+    async def scrape_leaderboard(self) -> list:
+        priority, timeout = _scrape_context.get()
+        label = "leaderboard scrape"
+        guarded = self._guarded(label, [self.breakers.endpoint("leaderboard")], self._submit(label, priority, self.browser.scrape_leaderboard))
+        return await self._wait(label, priority, timeout, guarded)
+
+    async def scrape_player_profile(self, sdvx_id: str) -> dict:
+        priority, timeout = _scrape_context.get()
+        label = f"profile scrape for {sdvx_id}"
+        max_age = PROFILE_CACHE_INTERACTIVE_MAX_AGE_SECONDS if priority == PRIORITY_INTERACTIVE else None
+        # The player's breaker is asked first so a known-bad player doesn't take the endpoint's half-open trial.
+        breakers = [self.breakers.player(sdvx_id), self.breakers.endpoint("profile")]
+        fetch = lambda: self._guarded(label, breakers, self._submit(label, priority, self.browser.scrape_player_profile, sdvx_id))
+        return await self._wait(label, priority, timeout, self.profile_cache.get_or_fetch(sdvx_id, fetch, max_age=max_age))
+
+    def init_headless_chrome(self) -> bool:
+        return self.browser.init_headless_chrome()
+
+    def quit_headless(self):
+        self.browser.quit_headless()
+
+    def is_alive(self) -> bool:
+        return self.browser.is_alive()
+
+    def restart_stats(self) -> dict:
+        return self.browser.restart_stats()
+
+    async def check_login(self) -> bool:
+        return await self._submit("login check", PRIORITY_BACKGROUND, self.browser.check_login)
+
+    async def relogin(self) -> bool:
+        return await self._submit("re-login", PRIORITY_BACKGROUND, self.browser.relogin)
+
+    async def shutdown_browser(self):
+        await self.browser.shutdown()
+
+    async def close(self):
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        await self.browser.close()
@@ -0,0 +1,139 @@
+# bot/session_journal.py
+import os
+import json
+import tempfile
+
+from bot.config import log
+
+# Session transitions, as recorded in the journal.
+EVENT_STARTED = "started"
+EVENT_SCORE = "score"
+EVENT_PAUSED = "paused"
+EVENT_RESUMED = "resumed"
+EVENT_ENDED = "ended"
+
+
+def apply_event(sessions: dict, event: dict):
+    """
+    Applies one journal event to the session map. SessionService makes every change through
+    here too, so replaying the journal rebuilds exactly the state it had.
+    """
+    kind, discord_id = event["event"], event["discord_id"]
+    if kind == EVENT_STARTED:
+        sessions[discord_id] = dict(event["session"])
+        return
+    if kind == EVENT_ENDED:
+        sessions.pop(discord_id, None)
+        return
+    session = sessions.get(discord_id)
+    if session is None:
+        log.warning(f"SESSION_JOURNAL: {kind} event #{event['seq']} for {discord_id}, who has no session; ignored.")
+        return
+    session["last_activity"] = event["at"]
+    if kind == EVENT_SCORE:
+        session["songs_played_count"] = session.get("songs_played_count", 0) + 1
+    elif kind == EVENT_RESUMED:
+        session["status"] = "active"
+    elif kind == EVENT_PAUSED:
+        session["status"] = event.get("status", "on_break")
+        if "reminder_sent" in event:
+            session["reminder_sent"] = event["reminder_sent"]
+
+
+class SessionJournal:
+    """
+    Session state on disk as a snapshot (the sessions file) plus an append-only journal of
+    the events since it, one JSON object per line. Events are numbered; the snapshot records
+    the last event it includes, so a journal left behind by a crash during compaction is
+    skipped up to that point on replay. The journal doubles as an audit trail of every
+    session transition since the last snapshot.
+    """
+    def __init__(self, snapshot_path: str, journal_path: str | None = None):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + ".journal"
+        self.seq = 0
+        self.events_since_snapshot = 0
+
+    def event(self, kind: str, discord_id: str, at: str, **fields) -> dict:
+        self.seq += 1
+        return {"seq": self.seq, "event": kind, "discord_id": discord_id, "at": at, **fields}
+
+    def load(self) -> dict:
+        """Rebuilds the sessions from the snapshot and the journal events after it."""
+        sessions, snapshot_seq = self._read_snapshot()
+        self.seq = snapshot_seq
+        self.events_since_snapshot = 0
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            lines = []
+        for number, line in enumerate(lines, 1):
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                # Only the last line can be torn, by a crash in the middle of an append.
+                log.warning(f"SESSION_JOURNAL: Skipping unreadable line {number} of {self.journal_path}.")
+                continue
+            if event["seq"] <= snapshot_seq:
+                continue
+            apply_event(sessions, event)
+            self.seq = event["seq"]
+            self.events_since_snapshot += 1
+        if self.events_since_snapshot:
+            log.info(f"SESSION_JOURNAL: Replayed {self.events_since_snapshot} events after the snapshot (event #{snapshot_seq}).")
+        return sessions
+
+    def _read_snapshot(self) -> tuple[dict, int]:
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}, 0
+        except OSError as e:
+            log.error(f"!!! FAILED TO READ from {self.snapshot_path}: {e}", exc_info=True)
+            return {}, 0
+        if "sessions" in data and "seq" in data:
+            return data["sessions"], data["seq"]
+        # A sessions file from before the journal: the plain session map.
+        return data, 0
+
+    def append(self, events: list):
+        """Appends events to the journal and fsyncs it."""
+        if not events:
+            return
+        directory = os.path.dirname(self.journal_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n" for event in events))
+            f.flush()
+            os.fsync(f.fileno())
+        self.events_since_snapshot += len(events)
+
+    def compact(self, snapshot: str):
+        """
+        Replaces the snapshot with `snapshot` (the serialized {"seq", "sessions"} state) and
+        empties the journal. The snapshot goes first, so a crash in between loses nothing.
+        """
+        directory = os.path.dirname(self.snapshot_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".sessions-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+        with open(self.journal_path, "w", encoding="utf-8") as f:
+            os.fsync(f.fileno())
+        log.info(f"SESSION_JOURNAL: Compacted {self.events_since_snapshot} events into {self.snapshot_path}.")
+        self.events_since_snapshot = 0
@@ -0,0 +1,78 @@
+# bot/utils/browser_lifecycle.py
+import asyncio
+from datetime import datetime, timedelta
+
+from bot.config import log, BROWSER_PREWARM_MINUTES, BROWSER_SHUTDOWN_GRACE_MINUTES
+from bot.core.system_service import SystemService
+from bot.eagle_errors import ScrapeError
+from bot.parse_pool import ParsePool
+from bot.utils.metrics import StartupTimer
+
+
+class BrowserLifecycle:
+    """
+    Keeps the headless browser running only around the arcade's opening hours. check() runs
+    as a Chronos job: from prewarm before opening until the grace period after closing it makes
+    sure Chrome is up and its eagle.ac login still works, so the first sweep after opening
+    doesn't pay for a cold start or discover an expired session. The rest of the week Chrome and
+    the parser processes are shut down.
+    """
+    def __init__(self, browser, system_service: SystemService, prewarm_minutes: int = BROWSER_PREWARM_MINUTES, shutdown_grace_minutes: int = BROWSER_SHUTDOWN_GRACE_MINUTES, startup_timer: StartupTimer | None = None, parse_pool: ParsePool | None = None):
+        self.browser = browser
+        self.system_service = system_service
+        self.startup_timer = startup_timer or StartupTimer()
+        self.parse_pool = parse_pool or ParsePool()
+        self.prewarm = timedelta(minutes=prewarm_minutes)
+        self.grace = timedelta(minutes=shutdown_grace_minutes)
+        self.login_ok = None
+        self.starts = 0
+        self.stops = 0
+
+    def should_run(self, now: datetime | None = None) -> bool:
+        now = now or self.system_service._get_now()
+        return any(opens - self.prewarm <= now < closes + self.grace for opens, closes in self.system_service.get_open_windows(now))
+
+    def next_start(self, now: datetime | None = None) -> datetime | None:
+        now = now or self.system_service._get_now()
+        starts = [opens - self.prewarm for opens, _ in self.system_service.get_open_windows(now) if opens - self.prewarm > now]
+        return min(starts) if starts else None
+
+    async def start(self) -> bool:
+        log.info("BROWSER_LIFECYCLE: Arcade opens soon; starting the headless browser.")
+        self.startup_timer.begin("browser prewarm")
+        if not await asyncio.to_thread(self.browser.init_headless_chrome):
+            log.error("BROWSER_LIFECYCLE: Could not start the headless browser; scrapes will retry on demand.")
+            return False
+        self.starts += 1
+        try:
+            self.login_ok = await self.browser.check_login()
+        except (ScrapeError, RuntimeError) as e:
+            log.warning(f"BROWSER_LIFECYCLE: Login check failed: {type(e).__name__}: {e}")
+            self.login_ok = False
+        if not self.login_ok:
+            # Renew the session now rather than on the first scrape after opening.
+            try:
+                self.login_ok = await self.browser.relogin()
+            except (ScrapeError, RuntimeError) as e:
+                log.warning(f"BROWSER_LIFECYCLE: Re-login failed: {type(e).__name__}: {e}")
+        if self.login_ok:
+            log.info("BROWSER_LIFECYCLE: Browser is warm and the eagle.ac login is valid.")
+        else:
+            log.error("BROWSER_LIFECYCLE: The eagle.ac login could not be confirmed; scrapes will fail until it is renewed.")
+        return True
+
+    async def stop(self):
+        await self.browser.shutdown_browser()
+        self.parse_pool.shutdown()
+        self.stops += 1
+        next_start = self.next_start()
+        until = f"until {next_start:%A %H:%M} UTC" if next_start else "until the schedule has an opening"
+        log.info(f"BROWSER_LIFECYCLE: Arcade closed; headless browser shut down {until}.")
+
+    async def check(self):
+        wanted = self.should_run()
+        alive = await asyncio.to_thread(self.browser.is_alive)
+        if wanted and not alive:
+            await self.start()
+        elif alive and not wanted:
+            await self.stop()
@@ -1,42 +1,67 @@
 # bot/utils/chronos.py
-import asyncio
-from bot.config import log
+from bot.config import (
+    log, CHRONOS_LEADERBOARD_SECONDS, CHRONOS_PROFILE_SWEEP_SECONDS,
+    CHRONOS_STALE_SESSION_SECONDS, CHRONOS_JOB_JITTER_SECONDS, CHRONOS_BROWSER_LIFECYCLE_SECONDS
+)
 from bot.core.system_service import SystemService
 from bot.core.identity_service import IdentityService
 from bot.core.session_service import SessionService
 from bot.utils.error_handler import ScrapeErrorHandler # Import new dependency
+from bot.utils.scheduler import JobScheduler, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
+from bot.utils.browser_lifecycle import BrowserLifecycle
+from bot.eagle_parser import play_fingerprint, new_plays_since
 
 class Chronos:
     # Add error_handler to the constructor
-    def __init__(self, system_service: SystemService, identity_service: IdentityService, session_service: SessionService, error_handler: ScrapeErrorHandler, interval_seconds: int = 60):
+    def __init__(self, system_service: SystemService, identity_service: IdentityService, session_service: SessionService, error_handler: ScrapeErrorHandler, scheduler: JobScheduler | None = None, browser_lifecycle: BrowserLifecycle | None = None):
         self.system_service = system_service
         self.identity_service = identity_service
         self.session_service = session_service
-        self.interval_seconds = interval_seconds
-        self.last_known_play_timestamps = {}
+        # sdvx_id -> fingerprints of the plays in the last Score Log we processed
+        self.known_play_fingerprints = {}
         self._is_first_tick = True
         self.error_handler = error_handler
 
-        # Apply the decorator to the _tick method instance
-        self._tick = self.error_handler.handle_scrape_failures()(self._tick)
+        # Scrape failures in the scheduled jobs go through the error handler
+        self._leaderboard_job = self.error_handler.handle_scrape_failures()(self._leaderboard_job)
+        self._profile_sweep_job = self.error_handler.handle_scrape_failures()(self._profile_sweep_job)
+
+        self.scheduler = scheduler or JobScheduler()
+        self.scheduler.add_job("stale_sessions", self._stale_session_job, CHRONOS_STALE_SESSION_SECONDS, priority=PRIORITY_HIGH)
+        self.scheduler.add_job("profile_sweep", self._profile_sweep_job, CHRONOS_PROFILE_SWEEP_SECONDS, priority=PRIORITY_NORMAL, jitter_seconds=CHRONOS_JOB_JITTER_SECONDS)
+        self.scheduler.add_job("leaderboard", self._leaderboard_job, CHRONOS_LEADERBOARD_SECONDS, priority=PRIORITY_LOW, jitter_seconds=CHRONOS_JOB_JITTER_SECONDS)
+        self.browser_lifecycle = browser_lifecycle
+        if browser_lifecycle:
+            self.scheduler.add_job("browser_lifecycle", browser_lifecycle.check, CHRONOS_BROWSER_LIFECYCLE_SECONDS, priority=PRIORITY_HIGH)
 
     async def start(self):
-        while True:
-            await self._tick()
-            await asyncio.sleep(self.interval_seconds)
+        await self.scheduler.run()
+
+    async def _leaderboard_job(self):
+        if not self.system_service.is_within_arcade_hours():
+            return
+        await self.identity_service.refresh_leaderboard()
+
+    async def _profile_sweep_job(self):
+        if not self.system_service.is_within_arcade_hours():
+            return
+        await self.identity_service.refresh_profiles(active_discord_ids=self.session_service.get_session_discord_ids())
+        await self._check_for_new_scores()
+
+    async def _stale_session_job(self):
+        # Doesn't touch eagle.ac, so it runs outside arcade hours too and closes sessions left open at closing time.
+        await self.session_service.find_and_end_stale_sessions()
 
     async def _check_for_new_scores(self):
         all_users = await self.identity_service._read_users()
 
         if self._is_first_tick:
-            log.info("CHRONOS: First tick, populating initial play timestamps...")
+            log.info("CHRONOS: First tick, recording the plays already in each Score Log...")
             for sdvx_id, user_data in all_users.items():
                 if user_data.get("recent_plays"):
-                    latest_play_timestamp = user_data["recent_plays"][0].get("timestamp")
-                    if latest_play_timestamp:
-                        self.last_known_play_timestamps[sdvx_id] = latest_play_timestamp
+                    self.known_play_fingerprints[sdvx_id] = {play_fingerprint(p) for p in user_data["recent_plays"]}
             self._is_first_tick = False
-            log.info(f"CHRONOS: Initialized timestamps for {len(self.last_known_play_timestamps)} players.")
+            log.info(f"CHRONOS: Initialized Score Log fingerprints for {len(self.known_play_fingerprints)} players.")
             return
 
         for sdvx_id, user_data in all_users.items():
@@ -44,24 +69,22 @@ class Chronos:
             recent_plays = user_data.get("recent_plays")
 
             if not discord_id or not recent_plays: continue
-            latest_play_timestamp = recent_plays[0].get("timestamp")
-            if not latest_play_timestamp: continue
-            
-            last_known_timestamp = self.last_known_play_timestamps.get(sdvx_id)
-            if latest_play_timestamp != last_known_timestamp:
-                log.info(f"CHRONOS: New score detected for player {sdvx_id} ({user_data.get('player_name')}).")
-                try:
-                    await self.session_service.process_new_score(discord_id)
-                    self.last_known_play_timestamps[sdvx_id] = latest_play_timestamp
-                    log.info(f"CHRONOS: Session processed and timestamp updated for {sdvx_id}.")
-                except Exception as e:
-                    log.error(f"CHRONOS: Error processing new score for {discord_id}: {e}", exc_info=True)
+            known = self.known_play_fingerprints.get(sdvx_id)
+            if known is None:
+                # First Score Log seen for this player (e.g. linked since startup): baseline only.
+                self.known_play_fingerprints[sdvx_id] = {play_fingerprint(p) for p in recent_plays}
+                continue
+            new_plays, reached_known = new_plays_since(recent_plays, known)
+            if not new_plays: continue
 
-    async def _tick(self):
-        # The old try/except block is removed from here. The decorator now handles failures.
-        if not self.system_service.is_within_arcade_hours():
-            return
-        
-        await self.identity_service.update_player_cache()
-        await self._check_for_new_scores()
-        await self.session_service.find_and_end_stale_sessions()
\ No newline at end of file
+            if not reached_known:
+                log.warning(f"CHRONOS: Every play on {sdvx_id}'s Score Log is new; plays older than the page may have been missed.")
+            log.info(f"CHRONOS: {len(new_plays)} new score(s) detected for player {sdvx_id} ({user_data.get('player_name')}).")
+            try:
+                # One event per play, oldest first, so the session's song count stays exact.
+                for play in reversed(new_plays):
+                    await self.session_service.process_new_score(discord_id)
+                self.known_play_fingerprints[sdvx_id] = {play_fingerprint(p) for p in recent_plays}
+                log.info(f"CHRONOS: Session processed and Score Log fingerprints updated for {sdvx_id}.")
+            except Exception as e:
+                log.error(f"CHRONOS: Error processing new score for {discord_id}: {e}", exc_info=True)
@@ -0,0 +1,157 @@
+# bot/utils/circuit_breaker.py
+import time
+from collections import deque
+
+from bot.config import (
+    log, BREAKER_FAILURE_RATE, BREAKER_MIN_CALLS, BREAKER_WINDOW_SECONDS, BREAKER_OPEN_SECONDS,
+    PLAYER_BREAKER_MIN_CALLS, PLAYER_BREAKER_WINDOW_SECONDS, PLAYER_BREAKER_OPEN_SECONDS, PLAYER_BREAKER_MAX_OPEN_SECONDS
+)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one endpoint or player. Outcomes are kept for
+    window_seconds; once at least min_calls are in the window and failure_rate of them failed,
+    the breaker opens and allow() refuses calls for open_seconds. It then goes half-open and
+    lets one trial call through: a success closes it, a failure opens it again.
+
+    With max_open_seconds set, each failed trial doubles how long the breaker stays open, up
+    to that cap, so a call that keeps failing is retried less and less often.
+    """
+    def __init__(self, name: str, failure_rate: float, min_calls: int, window_seconds: float, open_seconds: float, on_change=None, max_open_seconds: float | None = None):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = max(1, min_calls)
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max(open_seconds, max_open_seconds or open_seconds)
+        self.on_change = on_change
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.open_for = open_seconds
+        self.consecutive_opens = 0
+        self.opens = 0
+        self.refused = 0
+        self._outcomes = deque()  # (at, ok) inside the window
+        self._trial_started = None
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def _set_state(self, state: str):
+        if state == self.state:
+            return
+        old, self.state = self.state, state
+        if self.on_change:
+            self.on_change(self, old, state)
+
+    def _trim(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def allow(self) -> bool:
+        now = self._now()
+        if self.state == OPEN and now - self.opened_at >= self.open_for:
+            self._set_state(HALF_OPEN)
+            self._trial_started = None
+        if self.state == HALF_OPEN:
+            # One trial at a time; a trial whose caller went away is given up after open_seconds.
+            if self._trial_started is None or now - self._trial_started >= self.open_seconds:
+                self._trial_started = now
+                return True
+        elif self.state == CLOSED:
+            return True
+        self.refused += 1
+        return False
+
+    def release(self):
+        """Frees the half-open trial taken by allow() when the call ends without an outcome."""
+        if self.state == HALF_OPEN:
+            self._trial_started = None
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a trial call through."""
+        return max(0.0, self.opened_at + self.open_for - self._now()) if self.state == OPEN else 0.0
+
+    def record_success(self):
+        now = self._now()
+        self._outcomes.append((now, True))
+        self._trim(now)
+        if self.state == HALF_OPEN:
+            self._outcomes.clear()
+            self.consecutive_opens = 0
+            log.info(f"CIRCUIT_BREAKER: {self.name} trial succeeded; breaker closed.")
+            self._set_state(CLOSED)
+
+    def record_failure(self):
+        now = self._now()
+        self._outcomes.append((now, False))
+        self._trim(now)
+        if self.state == HALF_OPEN:
+            self._open(now, "trial failed")
+            return
+        if self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+            failed = sum(1 for _, ok in self._outcomes if not ok)
+            if failed / len(self._outcomes) >= self.failure_rate:
+                self._open(now, f"{failed} of the last {len(self._outcomes)} calls failed")
+
+    def _open(self, now: float, reason: str):
+        self.opened_at = now
+        self.opens += 1
+        self.consecutive_opens += 1
+        self.open_for = min(self.open_seconds * 2 ** (self.consecutive_opens - 1), self.max_open_seconds)
+        log.warning(f"CIRCUIT_BREAKER: {self.name} opened ({reason}); skipping it for {self.open_for:.0f}s.")
+        self._set_state(OPEN)
+
+    def failure_ratio(self) -> float:
+        self._trim(self._now())
+        return sum(1 for _, ok in self._outcomes if not ok) / len(self._outcomes) if self._outcomes else 0.0
+
+
+class CircuitBreakers:
+    """
+    The breakers of one scrape queue, created on first use: one per endpoint ("leaderboard",
+    "profile") and one per player. Listeners are called as listener(breaker, old_state,
+    new_state) on every state change of an endpoint breaker.
+    """
+    ENDPOINTS = ("leaderboard", "profile")
+
+    def __init__(self):
+        self.listeners = []
+        self._endpoints = {}
+        self._players = {}
+
+    def _notify(self, breaker: CircuitBreaker, old: str, new: str):
+        for listener in self.listeners:
+            listener(breaker, old, new)
+
+    def endpoint(self, name: str) -> CircuitBreaker:
+        if name not in self._endpoints:
+            self._endpoints[name] = CircuitBreaker(
+                name, BREAKER_FAILURE_RATE, BREAKER_MIN_CALLS, BREAKER_WINDOW_SECONDS, BREAKER_OPEN_SECONDS, on_change=self._notify
+            )
+        return self._endpoints[name]
+
+    def player(self, sdvx_id: str) -> CircuitBreaker:
+        if sdvx_id not in self._players:
+            self._players[sdvx_id] = CircuitBreaker(
+                f"player {sdvx_id}", BREAKER_FAILURE_RATE, PLAYER_BREAKER_MIN_CALLS, PLAYER_BREAKER_WINDOW_SECONDS,
+                PLAYER_BREAKER_OPEN_SECONDS, max_open_seconds=PLAYER_BREAKER_MAX_OPEN_SECONDS
+            )
+        return self._players[sdvx_id]
+
+    def open_endpoints(self) -> list:
+        return [b for b in self._endpoints.values() if b.state != CLOSED]
+
+    def quarantined(self) -> dict:
+        """sdvx_id -> seconds until the next trial scrape, for every player whose breaker is open."""
+        return {sdvx_id: b.retry_in() for sdvx_id, b in self._players.items() if b.state == OPEN}
+
+    def stats(self) -> dict:
+        return {
+            "endpoints": {name: {"state": b.state, "retry_in": b.retry_in(), "failure_ratio": b.failure_ratio()} for name, b in self._endpoints.items()},
+            "players_open": sorted(sdvx_id for sdvx_id, b in self._players.items() if b.state != CLOSED),
+            "refused": sum(b.refused for b in (*self._endpoints.values(), *self._players.values())),
+        }
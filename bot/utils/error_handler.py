@@ -1,13 +1,39 @@
+import asyncio
 import functools
 from typing import Callable, Any, Awaitable
+from bot.config import log
 from bot.utils.notification_service import NotificationService
+from bot.utils.circuit_breaker import CircuitBreakers, OPEN
 
 class ScrapeErrorHandler:
-    def __init__(self, notification_service: NotificationService):
+    def __init__(self, notification_service: NotificationService, breakers: CircuitBreakers | None = None):
         self.notification_service = notification_service
         self.failure_count = 0
         self.max_failures = 3
         self.system_is_down = False
+        # Endpoint circuit breakers also drive the DOWN/RECOVERED alerts, so an endpoint that
+        # keeps failing is reported even while the jobs around it still complete.
+        self.breakers = breakers
+        self._alert_tasks = set()
+        if breakers:
+            breakers.listeners.append(self._on_breaker_change)
+
+    def _breakers_closed(self) -> bool:
+        return not self.breakers or not self.breakers.open_endpoints()
+
+    def _send_alert(self, message: str):
+        task = asyncio.create_task(self.notification_service.send_admin_alert(message))
+        self._alert_tasks.add(task)
+        task.add_done_callback(self._alert_tasks.discard)
+
+    def _on_breaker_change(self, breaker, old_state: str, new_state: str):
+        if new_state == OPEN and not self.system_is_down:
+            self.system_is_down = True
+            log.warning(f"ERROR_HANDLER: {breaker.name} circuit breaker opened; marking the system DOWN.")
+            self._send_alert(f"System is DOWN: {breaker.name} scrapes are failing; circuit breaker open.")
+        elif self.system_is_down and self._breakers_closed() and self.failure_count < self.max_failures:
+            self.system_is_down = False
+            self._send_alert("System has RECOVERED: scraping is working again.")
 
     def handle_scrape_failures(self) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
         def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
@@ -22,7 +48,7 @@ class ScrapeErrorHandler:
                         await self.notification_service.send_admin_alert("System is DOWN: scraping failures have reached threshold.")
                     raise e
                 else:
-                    if self.system_is_down:
+                    if self.system_is_down and self._breakers_closed():
                         await self.notification_service.send_admin_alert("System has RECOVERED: scraping is working again.")
                         self.system_is_down = False
                     self.failure_count = 0
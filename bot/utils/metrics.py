@@ -0,0 +1,78 @@
+# bot/utils/metrics.py
+import time
+from collections import deque
+
+from bot.config import log
+
+
+class StageStats:
+    """Completed-item counter and timing for one pipeline stage (e.g. page fetch, HTML parse)."""
+    def __init__(self, name: str, window_seconds: float = 300.0):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.count = 0
+        self.failures = 0
+        self.total_seconds = 0.0
+        self._recent = deque()  # (completed_at, seconds) inside the window
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def record(self, seconds: float, ok: bool = True):
+        now = self._now()
+        self.count += 1
+        if not ok:
+            self.failures += 1
+        self.total_seconds += seconds
+        self._recent.append((now, seconds))
+        self._trim(now)
+
+    def _trim(self, now: float):
+        while self._recent and now - self._recent[0][0] > self.window_seconds:
+            self._recent.popleft()
+
+    def snapshot(self) -> dict:
+        now = self._now()
+        self._trim(now)
+        recent = len(self._recent)
+        busy = sum(seconds for _, seconds in self._recent)
+        span = now - self._recent[0][0] + self._recent[0][1] if recent else 0.0
+        return {
+            "name": self.name,
+            "count": self.count,
+            "failures": self.failures,
+            "avg_ms": self.total_seconds / self.count * 1000 if self.count else 0.0,
+            # Items per second of wall time over the recent window, and per second the stage was busy.
+            "per_second": recent / span if span > 0 else 0.0,
+            "per_busy_second": recent / busy if busy > 0 else 0.0,
+        }
+
+
+class StartupTimer:
+    """Time from a (re)start of the bot or its browser to the first page scraped successfully."""
+    def __init__(self):
+        self.label = "startup"
+        self.started_at = time.monotonic()
+        self.first_scrape_seconds = None
+
+    def begin(self, label: str):
+        self.label = label
+        self.started_at = time.monotonic()
+        self.first_scrape_seconds = None
+
+    def record_scrape(self):
+        if self.first_scrape_seconds is not None:
+            return
+        self.first_scrape_seconds = time.monotonic() - self.started_at
+        log.info(f"STARTUP: First successful scrape {self.first_scrape_seconds:.1f}s after {self.label}.")
+
+    def snapshot(self) -> dict:
+        return {"label": self.label, "first_scrape_seconds": self.first_scrape_seconds}
+
+
+def scrape_stage_stats() -> dict:
+    """Stats for each stage of the scrape pipeline; main.py shares one set between the backend and /botstatus."""
+    return {
+        "fetch": StageStats("fetch"),
+        "parse": StageStats("parse"),
+    }
@@ -0,0 +1,73 @@
+# bot/utils/proc.py
+#
+# Process-tree helpers read straight from /proc (Linux). On systems without /proc they only
+# see the process itself.
+import os
+import signal
+
+
+def _parent_pids() -> dict:
+    """pid -> parent pid for every process visible in /proc."""
+    parents = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return parents
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name is in parentheses and may contain spaces; fields resume after the last ')'.
+        fields = stat[stat.rfind(")") + 2:].split()
+        if len(fields) > 1:
+            parents[int(entry)] = int(fields[1])
+    return parents
+
+
+def process_tree(pid: int) -> list:
+    """pid followed by all of its descendants."""
+    children = {}
+    for child, parent in _parent_pids().items():
+        children.setdefault(parent, []).append(child)
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+
+def kill_process_tree(pid: int) -> int:
+    """SIGKILLs pid and its descendants (collected first, before they can be reparented). Returns how many were signalled."""
+    killed = 0
+    for target in process_tree(pid):
+        try:
+            os.kill(target, signal.SIGKILL)
+            killed += 1
+        except (ProcessLookupError, PermissionError):
+            continue
+    return killed
+
+
+def tree_rss(pid: int) -> tuple[int, int]:
+    """
+    Resident memory of pid and its descendants: (bytes, number of processes). RSS is summed per
+    process, so pages shared between Chrome's processes are counted more than once; it
+    overstates the footprint somewhat but moves with it.
+    """
+    total_kb, count = 0, 0
+    for member in process_tree(pid):
+        try:
+            with open(f"/proc/{member}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        count += 1
+                        break
+        except (OSError, ValueError, IndexError):
+            continue
+    return total_kb * 1024, count
@@ -0,0 +1,142 @@
+# bot/utils/scheduler.py
+import asyncio
+import random
+from datetime import datetime, timezone
+from typing import Callable, Awaitable
+
+from bot.config import log, SCHEDULER_LAG_THRESHOLD_SECONDS
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+PRIORITY_NAMES = {PRIORITY_HIGH: "high", PRIORITY_NORMAL: "normal", PRIORITY_LOW: "low"}
+
+
+class ScheduledJob:
+    def __init__(self, name: str, func: Callable[[], Awaitable], interval_seconds: float, priority: int, jitter_seconds: float):
+        self.name = name
+        self.func = func
+        self.interval = interval_seconds
+        self.priority = priority
+        self.jitter = jitter_seconds
+        self.slot = 0.0       # the fixed-rate grid point this job is waiting for (loop time)
+        self.next_run = 0.0   # slot plus this run's jitter
+        self.started_at = None
+        self.task = None
+        self.last_run_at = None
+        self.last_duration = None
+        self.last_lag = 0.0
+        self.runs = 0
+        self.overruns = 0
+        self.dropped = 0
+        self.failures = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+
+class JobScheduler:
+    """
+    Runs independent jobs at fixed rates. Each job is started on its own grid
+    (start, start + interval, ...) regardless of how long earlier runs took, and
+    runs as its own task so a slow scrape never delays a fast job. A job still
+    running when its next slot arrives counts as an overrun and that slot is
+    skipped. While a higher-priority job is overrunning or starting late,
+    low-priority jobs are dropped for the slot.
+    """
+    def __init__(self, lag_threshold_seconds: float = SCHEDULER_LAG_THRESHOLD_SECONDS):
+        self.jobs = []
+        self.lag_threshold = lag_threshold_seconds
+
+    def add_job(self, name: str, func: Callable[[], Awaitable], interval_seconds: float, priority: int = PRIORITY_NORMAL, jitter_seconds: float = 0.0):
+        self.jobs.append(ScheduledJob(name, func, interval_seconds, priority, jitter_seconds))
+
+    def _now(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def _advance(self, job: ScheduledJob, now: float):
+        job.slot += job.interval
+        if job.slot <= now:
+            # Slots that already passed are skipped rather than run back to back.
+            job.slot += ((now - job.slot) // job.interval + 1) * job.interval
+        job.next_run = job.slot + random.uniform(0, job.jitter)
+
+    def is_behind(self, now: float) -> bool:
+        for job in self.jobs:
+            if job.priority == PRIORITY_LOW:
+                continue
+            if job.is_running and now - job.started_at > job.interval:
+                return True
+            if job.last_lag > self.lag_threshold:
+                return True
+        return False
+
+    async def _run_job(self, job: ScheduledJob):
+        start = self._now()
+        try:
+            await job.func()
+        except Exception as e:
+            job.failures += 1
+            log.error(f"SCHEDULER: Job '{job.name}' failed: {e}", exc_info=True)
+        finally:
+            job.last_duration = self._now() - start
+            job.last_run_at = datetime.now(timezone.utc)
+            job.runs += 1
+            if job.last_duration > job.interval:
+                log.warning(f"SCHEDULER: Job '{job.name}' took {job.last_duration:.1f}s, longer than its {job.interval}s interval.")
+
+    def _dispatch_due(self, now: float):
+        for job in sorted(self.jobs, key=lambda j: j.priority):
+            if job.next_run > now:
+                continue
+            if job.is_running:
+                job.overruns += 1
+                log.warning(f"SCHEDULER: Job '{job.name}' is still running at its next slot; skipping this run.")
+            elif job.priority == PRIORITY_LOW and self.is_behind(now):
+                job.dropped += 1
+                log.warning(f"SCHEDULER: Falling behind; dropping low-priority job '{job.name}' for this slot.")
+            else:
+                job.last_lag = now - job.next_run
+                job.started_at = now
+                job.task = asyncio.create_task(self._run_job(job))
+            self._advance(job, now)
+
+    async def run(self):
+        if not self.jobs:
+            return
+        start = self._now()
+        for job in self.jobs:
+            job.slot = start
+            job.next_run = start + random.uniform(0, job.jitter)
+        log.info(f"SCHEDULER: Started {len(self.jobs)} jobs: " + ", ".join(f"{j.name} every {j.interval}s" for j in self.jobs))
+        try:
+            while True:
+                self._dispatch_due(self._now())
+                next_wakeup = min(job.next_run for job in self.jobs)
+                await asyncio.sleep(max(0.0, next_wakeup - self._now()))
+        finally:
+            running = [job.task for job in self.jobs if job.is_running]
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+    def get_job_stats(self) -> list:
+        now = datetime.now(timezone.utc)
+        return [
+            {
+                "name": job.name,
+                "interval": job.interval,
+                "priority": PRIORITY_NAMES.get(job.priority, str(job.priority)),
+                "last_run_at": job.last_run_at,
+                "seconds_since_last_run": (now - job.last_run_at).total_seconds() if job.last_run_at else None,
+                "last_duration": job.last_duration,
+                "lag": job.last_lag,
+                "runs": job.runs,
+                "overruns": job.overruns,
+                "dropped": job.dropped,
+                "failures": job.failures,
+                "running": job.is_running,
+            }
+            for job in self.jobs
+        ]
@@ -7,12 +7,14 @@ def mock_session_service():
     svc = MagicMock()
     svc.get_session_count = MagicMock() # This method is synchronous, no AsyncMock needed here
     svc.force_checkout = AsyncMock() # This method is async
+    svc.persist_stats = {"writes": 0, "writes_avoided": 0}
     return svc
 
 @pytest.fixture
 def mock_identity_service():
     svc = MagicMock()
     svc.force_unlink = AsyncMock() # This method is async
+    svc.last_sweep = None
     return svc
 
 @pytest.fixture
@@ -51,6 +53,97 @@ async def test_botstatus(mock_session_service, mock_identity_service, mock_error
         assert expected_count in desc
         mock_interaction.response.send_message.assert_awaited_once_with(embed="embed", ephemeral=True)
 
+@pytest.mark.asyncio
+async def test_botstatus_lists_scheduler_jobs(mock_session_service, mock_identity_service, mock_error_handler, mock_interaction):
+    mock_error_handler.system_is_down = False
+    mock_session_service.get_session_count.return_value = 0
+    scheduler = MagicMock()
+    scheduler.get_job_stats.return_value = [
+        {"name": "profile_sweep", "interval": 60, "seconds_since_last_run": 12.3, "lag": 0.4, "overruns": 1, "dropped": 0},
+        {"name": "leaderboard", "interval": 300, "seconds_since_last_run": None, "lag": 0.0, "overruns": 0, "dropped": 2},
+    ]
+    with patch("bot.cogs.admin_cog.create_embed", return_value="embed") as mock_create_embed:
+        cog = AdminCog(MagicMock(), mock_session_service, mock_identity_service, mock_error_handler, scheduler)
+        await cog.botstatus.callback(cog, mock_interaction)
+
+        desc = mock_create_embed.call_args.kwargs["description"]
+        assert "`profile_sweep` every 60s — last run 12s ago, lag 0.4s, overruns 1" in desc
+        assert "`leaderboard` every 300s — last run never" in desc
+        assert "dropped 2" in desc
+
+@pytest.mark.asyncio
+async def test_botstatus_shows_profile_cache_counters(mock_session_service, mock_identity_service, mock_error_handler, mock_interaction):
+    mock_error_handler.system_is_down = False
+    mock_session_service.get_session_count.return_value = 0
+    scrape_queue = MagicMock()
+    scrape_queue.profile_cache.stats.return_value = {"hits": 6, "misses": 3, "coalesced": 1, "entries": 3, "hit_rate": 0.7}
+    scrape_queue.restart_stats.return_value = {"restarts": 0, "watchdog_kills": 0, "rss_mb": None}
+    scrape_queue.breakers.stats.return_value = {"endpoints": {}, "players_open": [], "refused": 0}
+    with patch("bot.cogs.admin_cog.create_embed", return_value="embed") as mock_create_embed:
+        cog = AdminCog(MagicMock(), mock_session_service, mock_identity_service, mock_error_handler, scrape_queue=scrape_queue)
+        await cog.botstatus.callback(cog, mock_interaction)
+
+        desc = mock_create_embed.call_args.kwargs["description"]
+        assert "**Profile Cache:** 70% hit rate — 6 hits, 1 coalesced, 3 misses, 3 cached" in desc
+
+@pytest.mark.asyncio
+async def test_botstatus_shows_browser_restarts(mock_session_service, mock_identity_service, mock_error_handler, mock_interaction):
+    mock_error_handler.system_is_down = False
+    mock_session_service.get_session_count.return_value = 0
+    scrape_queue = MagicMock()
+    scrape_queue.profile_cache.stats.return_value = {"hits": 0, "misses": 0, "coalesced": 0, "entries": 0, "hit_rate": 0.0}
+    scrape_queue.restart_stats.return_value = {
+        "restarts": 3, "standby_swaps": 2, "cold_starts": 1, "watchdog_kills": 1, "recycles": 2,
+        "avg_swap_ms": 14.6, "avg_cold_start_ms": None, "standby_ready": 1, "rss_mb": 412.4,
+    }
+    scrape_queue.breakers.stats.return_value = {"endpoints": {}, "players_open": [], "refused": 0}
+    with patch("bot.cogs.admin_cog.create_embed", return_value="embed") as mock_create_embed:
+        cog = AdminCog(MagicMock(), mock_session_service, mock_identity_service, mock_error_handler, scrape_queue=scrape_queue)
+        await cog.botstatus.callback(cog, mock_interaction)
+
+        desc = mock_create_embed.call_args.kwargs["description"]
+        assert "**Browser Restarts:** 3 — 2 standby swaps (avg 15 ms), 1 cold starts, 1 watchdog kills, 2 recycles" in desc
+        assert "**Chrome Footprint:** 412 MB at last sample" in desc
+
+@pytest.mark.asyncio
+async def test_botstatus_shows_change_detection_skip_ratio(mock_session_service, mock_identity_service, mock_error_handler, mock_interaction):
+    mock_error_handler.system_is_down = False
+    mock_session_service.get_session_count.return_value = 0
+    change_detector = MagicMock()
+    change_detector.stats.return_value = {"checked": 8, "unchanged": 6, "players": 2, "skip_ratio": 0.75}
+    with patch("bot.cogs.admin_cog.create_embed", return_value="embed") as mock_create_embed:
+        cog = AdminCog(MagicMock(), mock_session_service, mock_identity_service, mock_error_handler, change_detector=change_detector)
+        await cog.botstatus.callback(cog, mock_interaction)
+
+        desc = mock_create_embed.call_args.kwargs["description"]
+        assert "**Change Detection:** 75% of profile pages unchanged — 6 of 8 parses skipped" in desc
+
+@pytest.mark.asyncio
+async def test_botstatus_shows_rate_limit_backoff(mock_session_service, mock_identity_service, mock_error_handler, mock_interaction):
+    mock_error_handler.system_is_down = False
+    mock_session_service.get_session_count.return_value = 0
+    rate_limiter = MagicMock()
+    rate_limiter.stats.return_value = {"rate": 0.5, "max_rate": 2.0, "requests": 40, "delayed": 12, "avg_wait_ms": 850.0, "backoffs": 2, "last_backoff_reason": "HTTP 503"}
+    with patch("bot.cogs.admin_cog.create_embed", return_value="embed") as mock_create_embed:
+        cog = AdminCog(MagicMock(), mock_session_service, mock_identity_service, mock_error_handler, rate_limiter=rate_limiter)
+        await cog.botstatus.callback(cog, mock_interaction)
+
+        desc = mock_create_embed.call_args.kwargs["description"]
+        assert "**Rate Limit:** 0.50 of 2.00 requests/s — 12 of 40 requests waited (avg 850 ms), 2 backoffs (last: HTTP 503)" in desc
+
+@pytest.mark.asyncio
+async def test_botstatus_shows_time_to_first_scrape(mock_session_service, mock_identity_service, mock_error_handler, mock_interaction):
+    mock_error_handler.system_is_down = False
+    mock_session_service.get_session_count.return_value = 0
+    startup_timer = MagicMock()
+    startup_timer.snapshot.return_value = {"label": "browser prewarm", "first_scrape_seconds": 4.25}
+    with patch("bot.cogs.admin_cog.create_embed", return_value="embed") as mock_create_embed:
+        cog = AdminCog(MagicMock(), mock_session_service, mock_identity_service, mock_error_handler, startup_timer=startup_timer)
+        await cog.botstatus.callback(cog, mock_interaction)
+
+        desc = mock_create_embed.call_args.kwargs["description"]
+        assert "**Startup:** first successful scrape 4.2s after browser prewarm" in desc
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("force_result, expected_theme", [
     (True, "success"),
@@ -85,4 +178,54 @@ async def test_force_unlink(mock_session_service, mock_identity_service, mock_er
         mock_create_embed.assert_called_once()
         args, kwargs = mock_create_embed.call_args
         assert kwargs.get("theme") == expected_theme
-        mock_interaction.response.send_message.assert_awaited_once_with(embed="embed", ephemeral=True)
\ No newline at end of file
+        mock_interaction.response.send_message.assert_awaited_once_with(embed="embed", ephemeral=True)
+@pytest.mark.asyncio
+async def test_botstatus_shows_open_circuit_breakers(mock_session_service, mock_identity_service, mock_error_handler, mock_interaction):
+    mock_error_handler.system_is_down = True
+    mock_session_service.get_session_count.return_value = 0
+    scrape_queue = MagicMock()
+    scrape_queue.profile_cache.stats.return_value = {"hits": 0, "misses": 0, "coalesced": 0, "entries": 0, "hit_rate": 0.0}
+    scrape_queue.restart_stats.return_value = {"restarts": 0, "watchdog_kills": 0, "rss_mb": None}
+    scrape_queue.breakers.stats.return_value = {
+        "endpoints": {
+            "leaderboard": {"state": "closed", "retry_in": 0.0, "failure_ratio": 0.0},
+            "profile": {"state": "open", "retry_in": 41.6, "failure_ratio": 0.8},
+        },
+        "players_open": ["1234-5678", "8765-4321"],
+        "refused": 17,
+    }
+    with patch("bot.cogs.admin_cog.create_embed", return_value="embed") as mock_create_embed:
+        cog = AdminCog(MagicMock(), mock_session_service, mock_identity_service, mock_error_handler, scrape_queue=scrape_queue)
+        await cog.botstatus.callback(cog, mock_interaction)
+
+        desc = mock_create_embed.call_args.kwargs["description"]
+        assert "**Circuit Breakers:** leaderboard closed • profile open (retry in 42s) — 2 players skipped, 17 scrapes refused" in desc
+
+@pytest.mark.asyncio
+async def test_botstatus_shows_last_sweep_breakdown_and_quarantine(mock_session_service, mock_identity_service, mock_error_handler, mock_interaction):
+    mock_error_handler.system_is_down = False
+    mock_session_service.get_session_count.return_value = 0
+    mock_identity_service.last_sweep = {"at": "2026-01-01T00:00:00+00:00", "results": {"ok": 7, "parse_error": 1, "skipped": 2}}
+    scrape_queue = MagicMock()
+    scrape_queue.profile_cache.stats.return_value = {"hits": 0, "misses": 0, "coalesced": 0, "entries": 0, "hit_rate": 0.0}
+    scrape_queue.restart_stats.return_value = {"restarts": 0, "watchdog_kills": 0, "rss_mb": None}
+    scrape_queue.breakers.stats.return_value = {"endpoints": {}, "players_open": [], "refused": 0}
+    scrape_queue.breakers.quarantined.return_value = {"1234-5678": 540.2, "8765-4321": 1190.0}
+    with patch("bot.cogs.admin_cog.create_embed", return_value="embed") as mock_create_embed:
+        cog = AdminCog(MagicMock(), mock_session_service, mock_identity_service, mock_error_handler, scrape_queue=scrape_queue)
+        await cog.botstatus.callback(cog, mock_interaction)
+
+        desc = mock_create_embed.call_args.kwargs["description"]
+        assert "**Last Profile Sweep:** 7 ok, 2 skipped, 1 parse_error — 2 quarantined, next retry in 540s" in desc
+
+@pytest.mark.asyncio
+async def test_botstatus_shows_session_writes_avoided(mock_session_service, mock_identity_service, mock_error_handler, mock_interaction):
+    mock_error_handler.system_is_down = False
+    mock_session_service.get_session_count.return_value = 2
+    mock_session_service.persist_stats = {"writes": 4, "writes_avoided": 11}
+    with patch("bot.cogs.admin_cog.create_embed", return_value="embed") as mock_create_embed:
+        cog = AdminCog(MagicMock(), mock_session_service, mock_identity_service, mock_error_handler)
+        await cog.botstatus.callback(cog, mock_interaction)
+
+        desc = mock_create_embed.call_args.kwargs["description"]
+        assert "**Active Sessions:** 2 (4 session writes, 11 avoided by batching)" in desc
@@ -0,0 +1,105 @@
+# tests/test_browser_lifecycle.py
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytz
+
+from bot.core.system_service import SystemService
+from bot.eagle_errors import ScrapeError
+from bot.utils.browser_lifecycle import BrowserLifecycle
+
+# Tuesday 10:00-20:00, Friday 22:00-02:00
+SCHEDULE = {"tuesday": {"open": "10:00", "close": "20:00"}, "friday": {"open": "22:00", "close": "02:00"}}
+
+
+def at(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=pytz.utc)
+
+
+@pytest.fixture
+def system_service(tmp_path):
+    path = tmp_path / "schedule.json"
+    path.write_text(json.dumps(SCHEDULE))
+    return SystemService(str(path))
+
+
+@pytest.fixture
+def browser():
+    browser = MagicMock()
+    browser.init_headless_chrome.return_value = True
+    browser.is_alive.return_value = False
+    browser.check_login = AsyncMock(return_value=True)
+    browser.relogin = AsyncMock(return_value=False)
+    browser.shutdown_browser = AsyncMock()
+    return browser
+
+
+@pytest.fixture
+def lifecycle(browser, system_service):
+    return BrowserLifecycle(browser, system_service, prewarm_minutes=10, shutdown_grace_minutes=15)
+
+
+@pytest.mark.parametrize("now, expected", [
+    ("2023-10-10 09:49:59", False),  # Before the prewarm window
+    ("2023-10-10 09:50:00", True),   # Prewarm starts 10 minutes before opening
+    ("2023-10-10 20:14:59", True),   # Grace period after closing
+    ("2023-10-10 20:15:00", False),
+    ("2023-10-14 02:10:00", True),   # Grace after Friday's overnight session
+    ("2023-10-11 14:00:00", False),  # Closed day
+])
+def test_should_run_covers_prewarm_and_grace(lifecycle, now, expected):
+    assert lifecycle.should_run(at(now)) is expected
+
+
+def test_next_start_is_prewarm_time_of_next_opening(lifecycle):
+    assert lifecycle.next_start(at("2023-10-11 14:00:00")) == at("2023-10-13 21:50:00")
+
+
+@pytest.mark.asyncio
+async def test_check_prewarms_and_validates_login_before_opening(lifecycle, browser, system_service):
+    with patch.object(system_service, "_get_now", return_value=at("2023-10-10 09:55:00")):
+        await lifecycle.check()
+    browser.init_headless_chrome.assert_called_once()
+    browser.check_login.assert_awaited_once()
+    assert lifecycle.login_ok is True and lifecycle.starts == 1
+
+
+@pytest.mark.asyncio
+async def test_check_renews_expired_login_before_opening(lifecycle, browser, system_service):
+    browser.check_login.return_value = False
+    browser.relogin.return_value = True
+    with patch.object(system_service, "_get_now", return_value=at("2023-10-10 09:55:00")):
+        await lifecycle.check()
+    browser.relogin.assert_awaited_once()
+    assert lifecycle.login_ok is True
+
+
+@pytest.mark.asyncio
+async def test_check_reports_failed_login(lifecycle, browser, system_service):
+    browser.check_login.side_effect = ScrapeError("login page")
+    with patch.object(system_service, "_get_now", return_value=at("2023-10-10 09:55:00")), \
+         patch("bot.utils.browser_lifecycle.log") as mock_log:
+        await lifecycle.check()
+    assert lifecycle.login_ok is False
+    assert "could not be confirmed" in mock_log.error.call_args[0][0]
+
+
+@pytest.mark.asyncio
+async def test_check_leaves_running_browser_alone_during_hours(lifecycle, browser, system_service):
+    browser.is_alive.return_value = True
+    with patch.object(system_service, "_get_now", return_value=at("2023-10-10 15:00:00")):
+        await lifecycle.check()
+    browser.init_headless_chrome.assert_not_called()
+    browser.shutdown_browser.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_check_shuts_down_after_close(lifecycle, browser, system_service):
+    browser.is_alive.return_value = True
+    lifecycle.parse_pool = MagicMock()
+    with patch.object(system_service, "_get_now", return_value=at("2023-10-10 20:30:00")):
+        await lifecycle.check()
+    browser.shutdown_browser.assert_awaited_once()
+    lifecycle.parse_pool.shutdown.assert_called_once()
+    assert lifecycle.stops == 1
@@ -0,0 +1,78 @@
+# tests/test_change_detector.py
+import pathlib
+import pytest
+from unittest.mock import MagicMock
+
+from bot import eagle_browser
+from bot.change_detector import ProfileChangeDetector
+from bot.eagle_parser import profile_content_hash, parse_profile_html
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+
+@pytest.fixture
+def profile_html():
+    return (FIXTURES / "eagle_profile.html").read_text(encoding="utf-8")
+
+@pytest.fixture
+def detector():
+    return ProfileChangeDetector()
+
+
+def test_content_hash_covers_header_and_score_log_only(profile_html):
+    base = profile_content_hash(profile_html)
+    assert base is not None
+    # Outside the region: nav links and the page title don't matter.
+    assert profile_content_hash(profile_html.replace("Arcades</a>", "Arcade List</a>")) == base
+    assert profile_content_hash(profile_html.replace("<title>Sound Voltex", "<title>SDVX")) == base
+    # Inside it: the header, the Profile panel and the last Score Log row (past the nested detail tables).
+    assert profile_content_hash(profile_html.replace("<b>Plays:</b> 2,481", "<b>Plays:</b> 2,482")) != base
+    last_row = profile_html.rindex("<tr class=\"accordion-toggle\"")
+    assert profile_content_hash(profile_html[:last_row] + profile_html[last_row:].replace("<td", "<td data-x=\"1\"", 1)) != base
+
+def test_content_hash_without_score_log():
+    assert profile_content_hash("<html><h2 class=\"page-header\">X</h2></html>") is None
+    assert profile_content_hash({}) is None
+    assert profile_content_hash({"player_name": "P"}) == profile_content_hash({"player_name": "P"})
+
+@pytest.mark.asyncio
+async def test_unchanged_page_is_not_parsed_again(profile_html, detector):
+    calls = []
+
+    async def run(func, *args, stats=None):
+        calls.append(args[1])
+        return func(*args)
+    parse_pool = MagicMock(run=run)
+
+    first = await eagle_browser.parse_profile_page(profile_html, "95688187", detector, parse_pool)
+    first["recent_plays"].clear()  # callers get their own copy
+    second = await eagle_browser.parse_profile_page(profile_html, "95688187", detector, parse_pool)
+    changed = await eagle_browser.parse_profile_page(profile_html.replace("2,481", "2,482"), "95688187", detector, parse_pool)
+
+    assert calls == ["95688187", "95688187"]
+    assert second == parse_profile_html(profile_html, "95688187")
+    assert changed["total_plays"] == 2482
+    assert detector.stats() == {"checked": 3, "unchanged": 1, "players": 1, "skip_ratio": pytest.approx(1 / 3)}
+
+@pytest.mark.asyncio
+async def test_pages_without_score_log_are_not_remembered(detector):
+    parse_pool = MagicMock(run=MagicMock(side_effect=AssertionError("nothing to parse")))
+    assert await eagle_browser.parse_profile_page({}, "1", detector, parse_pool) == {}
+    assert detector.stats()["checked"] == 0
+    assert detector.lookup("1", None) is None
+
+def test_least_recently_scraped_players_are_evicted():
+    detector = ProfileChangeDetector(max_players=2)
+    detector.remember("1", "h1", {"player_name": "A"})
+    detector.remember("2", "h2", {"player_name": "B"})
+    assert detector.lookup("1", "h1") == {"player_name": "A"}
+    detector.remember("3", "h3", {"player_name": "C"})
+
+    assert detector.lookup("2", "h2") is None
+    assert detector.lookup("1", "h1") == {"player_name": "A"}
+    assert detector.stats()["players"] == 2
+    assert detector.evictions == 1
+
+@pytest.mark.asyncio
+async def test_pool_browsers_share_the_injected_detector(detector):
+    pool = eagle_browser.EagleBrowserPool(size=2, change_detector=detector)
+    assert all(browser.change_detector is detector for browser in pool.browsers)
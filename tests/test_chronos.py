@@ -10,7 +10,8 @@ from bot.utils.error_handler import ScrapeErrorHandler
 def mock_services():
     system_service = MagicMock()
     identity_service = MagicMock()
-    identity_service.update_player_cache = AsyncMock()
+    identity_service.refresh_leaderboard = AsyncMock()
+    identity_service.refresh_profiles = AsyncMock()
     identity_service._read_users = AsyncMock(return_value={})
     session_service = MagicMock()
     session_service.find_and_end_stale_sessions = AsyncMock()
@@ -28,26 +29,28 @@ def mock_services():
     return system_service, identity_service, session_service, error_handler
 
 @pytest.mark.asyncio
-async def test_tick_during_open_hours(mock_services):
+async def test_profile_sweep_job_during_open_hours(mock_services):
     system_service, identity_service, session_service, error_handler = mock_services
     system_service.is_within_arcade_hours.return_value = True
     
     chronos = Chronos(system_service, identity_service, session_service, error_handler)
 
-    await chronos._tick()
-    identity_service.update_player_cache.assert_awaited_once()
-    session_service.find_and_end_stale_sessions.assert_awaited_once()
+    session_service.get_session_discord_ids.return_value = {"user1"}
+
+    await chronos._profile_sweep_job()
+    identity_service.refresh_profiles.assert_awaited_once_with(active_discord_ids={"user1"})
+    identity_service._read_users.assert_awaited_once()
 
 @pytest.mark.asyncio
-async def test_tick_during_closed_hours(mock_services):
+async def test_profile_sweep_job_during_closed_hours(mock_services):
     system_service, identity_service, session_service, error_handler = mock_services
     system_service.is_within_arcade_hours.return_value = False
     chronos = Chronos(system_service, identity_service, session_service, error_handler)
-    await chronos._tick()
-    identity_service.update_player_cache.assert_not_awaited()
+    await chronos._profile_sweep_job()
+    identity_service.refresh_profiles.assert_not_awaited()
 
 @pytest.mark.asyncio
-async def test_tick_handles_service_exception(mock_services):
+async def test_profile_sweep_job_handles_service_exception(mock_services):
     system_service, identity_service, session_service, error_handler = mock_services
     
     # FIX: The decorator factory MUST be a regular `def`, not `async def`.
@@ -63,16 +66,16 @@ async def test_tick_handles_service_exception(mock_services):
     error_handler.handle_scrape_failures.return_value = decorator_that_raises
     
     system_service.is_within_arcade_hours.return_value = True
-    identity_service.update_player_cache.side_effect = Exception("fail")
+    identity_service.refresh_profiles.side_effect = Exception("fail")
     
     chronos = Chronos(system_service, identity_service, session_service, error_handler)
     
     # Now this will work as intended, catching the "fail" exception.
     with pytest.raises(Exception, match="fail"):
-        await chronos._tick()
+        await chronos._profile_sweep_job()
     
-    identity_service.update_player_cache.assert_awaited_once()
-    session_service.find_and_end_stale_sessions.assert_not_awaited()
+    identity_service.refresh_profiles.assert_awaited_once()
+    identity_service._read_users.assert_not_awaited()
 
 @pytest.mark.asyncio
 async def test_check_for_new_scores_logic(mock_services):
@@ -89,4 +92,72 @@ async def test_check_for_new_scores_logic(mock_services):
         "123": {"discord_id": "user1", "recent_plays": [{"timestamp": "ts_new"}]}
     }
     await chronos._check_for_new_scores()
-    session_service.process_new_score.assert_awaited_once_with("user1")
\ No newline at end of file
+    session_service.process_new_score.assert_awaited_once_with("user1")
+
+
+def test_registers_independent_jobs(mock_services):
+    chronos = Chronos(*mock_services)
+    jobs = {job.name: job for job in chronos.scheduler.jobs}
+    assert set(jobs) == {"stale_sessions", "profile_sweep", "leaderboard"}
+    assert jobs["stale_sessions"].interval < jobs["profile_sweep"].interval < jobs["leaderboard"].interval
+    assert jobs["stale_sessions"].priority < jobs["leaderboard"].priority
+
+def test_registers_browser_lifecycle_job_when_given(mock_services):
+    lifecycle = MagicMock()
+    lifecycle.check = AsyncMock()
+    chronos = Chronos(*mock_services, browser_lifecycle=lifecycle)
+    jobs = {job.name: job for job in chronos.scheduler.jobs}
+    assert jobs["browser_lifecycle"].func is lifecycle.check
+
+@pytest.mark.asyncio
+async def test_jobs_respect_arcade_hours(mock_services):
+    system_service, identity_service, session_service, error_handler = mock_services
+    identity_service.refresh_leaderboard = AsyncMock()
+    identity_service.refresh_profiles = AsyncMock()
+    session_service.get_session_discord_ids.return_value = {"user1"}
+    chronos = Chronos(system_service, identity_service, session_service, error_handler)
+
+    system_service.is_within_arcade_hours.return_value = False
+    await chronos._leaderboard_job()
+    await chronos._profile_sweep_job()
+    await chronos._stale_session_job()
+    identity_service.refresh_leaderboard.assert_not_awaited()
+    identity_service.refresh_profiles.assert_not_awaited()
+    session_service.find_and_end_stale_sessions.assert_awaited_once()
+
+    system_service.is_within_arcade_hours.return_value = True
+    await chronos._leaderboard_job()
+    await chronos._profile_sweep_job()
+    identity_service.refresh_leaderboard.assert_awaited_once()
+    identity_service.refresh_profiles.assert_awaited_once_with(active_discord_ids={"user1"})
+
+@pytest.mark.asyncio
+async def test_check_for_new_scores_counts_every_play_in_the_same_minute(mock_services):
+    """Two plays sharing a timestamp are both detected, one process_new_score call each."""
+    system_service, identity_service, session_service, error_handler = mock_services
+    chronos = Chronos(system_service, identity_service, session_service, error_handler)
+    old_play = {"song_title": "A", "chart": "EXH 17", "score": "9,000,000", "timestamp": "2025-06-18 10:58 PM", "is_new_record": False}
+    identity_service._read_users.return_value = {"123": {"discord_id": "user1", "recent_plays": [old_play]}}
+    await chronos._check_for_new_scores()
+
+    same_minute = [
+        {"song_title": "C", "chart": "MXM 18", "score": "9,500,000", "timestamp": "2025-06-18 10:59 PM", "is_new_record": True},
+        {"song_title": "B", "chart": "EXH 17", "score": "9,100,000", "timestamp": "2025-06-18 10:59 PM", "is_new_record": False},
+    ]
+    identity_service._read_users.return_value = {"123": {"discord_id": "user1", "recent_plays": same_minute + [old_play]}}
+    await chronos._check_for_new_scores()
+    assert session_service.process_new_score.await_count == 2
+
+    # Nothing new on the next check.
+    await chronos._check_for_new_scores()
+    assert session_service.process_new_score.await_count == 2
+
+@pytest.mark.asyncio
+async def test_check_for_new_scores_baselines_players_seen_after_first_tick(mock_services):
+    system_service, identity_service, session_service, error_handler = mock_services
+    chronos = Chronos(system_service, identity_service, session_service, error_handler)
+    await chronos._check_for_new_scores()
+
+    identity_service._read_users.return_value = {"456": {"discord_id": "user2", "recent_plays": [{"timestamp": "t1"}, {"timestamp": "t0"}]}}
+    await chronos._check_for_new_scores()
+    session_service.process_new_score.assert_not_awaited()
@@ -0,0 +1,138 @@
+# tests/test_circuit_breaker.py
+import pytest
+from unittest.mock import MagicMock
+
+from bot.utils.circuit_breaker import CircuitBreaker, CircuitBreakers, CLOSED, OPEN, HALF_OPEN
+
+
+def make_breaker(**kwargs):
+    clock = {"now": 1000.0}
+    options = {"failure_rate": 0.5, "min_calls": 4, "window_seconds": 60, "open_seconds": 30}
+    options.update(kwargs)
+    breaker = CircuitBreaker("profile", **options)
+    breaker._now = lambda: clock["now"]
+    return breaker, clock
+
+
+def test_breaker_stays_closed_below_min_calls():
+    breaker, _ = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_opens_at_failure_rate_and_refuses_calls():
+    breaker, _ = make_breaker()
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.refused == 1
+    assert breaker.retry_in() == 30
+
+
+def test_failures_outside_the_window_are_forgotten():
+    breaker, clock = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    clock["now"] += 61
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.failure_ratio() == 1.0
+
+
+def test_half_open_lets_one_trial_through_then_closes_on_success():
+    breaker, clock = make_breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    clock["now"] += 30
+
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.failure_ratio() == 0.0
+
+
+def test_failed_trial_reopens_the_breaker():
+    breaker, clock = make_breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    clock["now"] += 30
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.opens == 2
+    assert not breaker.allow()
+
+
+def test_released_trial_can_be_retried():
+    breaker, clock = make_breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    clock["now"] += 30
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_registry_notifies_listeners_of_endpoint_state_changes():
+    breakers = CircuitBreakers()
+    listener = MagicMock()
+    breakers.listeners.append(listener)
+    endpoint = breakers.endpoint("leaderboard")
+    endpoint.min_calls = 1
+
+    endpoint.record_failure()
+
+    listener.assert_called_once_with(endpoint, CLOSED, OPEN)
+    assert breakers.open_endpoints() == [endpoint]
+    assert breakers.stats()["endpoints"]["leaderboard"]["state"] == OPEN
+
+
+def test_registry_lists_open_player_breakers():
+    breakers = CircuitBreakers()
+    player = breakers.player("1234-5678")
+    player.min_calls = 1
+    player.record_failure()
+    breakers.player("8765-4321").record_success()
+
+    stats = breakers.stats()
+    assert stats["players_open"] == ["1234-5678"]
+    assert breakers.open_endpoints() == []
+
+
+def test_failed_trials_back_off_exponentially_up_to_the_cap():
+    breaker, clock = make_breaker(max_open_seconds=100)
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.open_for == 30
+
+    for expected in (60, 100, 100):
+        clock["now"] += breaker.open_for
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.open_for == expected
+
+    clock["now"] += breaker.open_for
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.consecutive_opens == 0
+
+
+def test_quarantined_lists_open_players_with_their_retry_time():
+    breakers = CircuitBreakers()
+    player = breakers.player("1234-5678")
+    player.min_calls = 1
+    player.record_failure()
+
+    assert breakers.quarantined() == {"1234-5678": pytest.approx(player.open_for, abs=1)}
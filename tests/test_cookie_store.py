@@ -0,0 +1,37 @@
+# tests/test_cookie_store.py
+import os
+import json
+import time
+
+from bot.cookie_store import CookieStore, cdp_cookie_params
+
+
+def test_save_and_load_round_trip(tmp_path):
+    store = CookieStore(str(tmp_path / "data" / "cookies.json"))
+    cookies = [{"name": "session", "value": "abc", "domain": "eagle.ac", "path": "/", "expires": -1}]
+    store.save(cookies, user_agent="TestAgent/1.0")
+
+    reloaded = CookieStore(store.path)
+    assert reloaded.load() == cookies
+    assert reloaded.user_agent == "TestAgent/1.0"
+    assert store.version == 1
+    assert os.stat(store.path).st_mode & 0o777 == 0o600
+    assert os.listdir(tmp_path / "data") == ["cookies.json"]
+
+def test_load_drops_expired_cookies(tmp_path):
+    path = tmp_path / "cookies.json"
+    path.write_text(json.dumps({"cookies": [
+        {"name": "old", "value": "1", "domain": "eagle.ac", "expires": time.time() - 60},
+        {"name": "fresh", "value": "2", "domain": "eagle.ac", "expires": time.time() + 3600},
+    ]}))
+    assert [c["name"] for c in CookieStore(str(path)).load()] == ["fresh"]
+
+def test_missing_or_corrupt_jar_loads_empty(tmp_path):
+    assert CookieStore(str(tmp_path / "missing.json")).load() == []
+    corrupt = tmp_path / "corrupt.json"
+    corrupt.write_text("{not json")
+    assert CookieStore(str(corrupt)).load() == []
+
+def test_cdp_cookie_params_keeps_settable_fields():
+    exported = {"name": "s", "value": "v", "domain": "eagle.ac", "path": "/", "expires": -1, "size": 2, "session": True, "httpOnly": True}
+    assert cdp_cookie_params([exported]) == [{"name": "s", "value": "v", "domain": "eagle.ac", "path": "/", "httpOnly": True}]
@@ -0,0 +1,248 @@
+# tests/test_eagle_browser.py
+import pathlib
+import threading
+import pytest
+from unittest.mock import MagicMock, PropertyMock, patch
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
+
+from bot.eagle_browser import EagleBrowser, LEAN_BLOCKED_URL_PATTERNS, PLAYSTABLE_LOCATOR, perform_login
+from bot.cookie_store import CookieStore
+from bot.eagle_errors import SessionExpiredError, ProfileNotFoundError, EmptyProfileError, ScrapeTimeoutError
+from bot.eagle_parser import parse_profile_html, PROFILE_EXTRACT_JS, PROFILE_CLASSIFY_JS, PAGE_READY
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def profile_html():
+    return (FIXTURES / "eagle_profile.html").read_text(encoding="utf-8")
+
+@pytest.fixture
+def no_wait():
+    with patch("bot.eagle_browser.WebDriverWait") as mock_wait:
+        mock_wait.return_value.until.return_value = PAGE_READY
+        yield mock_wait
+
+
+def test_lean_profile_blocks_resources_and_uses_eager_loading():
+    browser = EagleBrowser(backend="selenium", lean=True)
+    with patch("bot.eagle_browser.webdriver.Chrome") as mock_chrome, patch("bot.eagle_browser.Service"):
+        assert browser.init_headless_chrome() is True
+    options = mock_chrome.call_args.kwargs["options"]
+    assert options.page_load_strategy == "eager"
+    assert options.experimental_options["prefs"]["profile.managed_default_content_settings.images"] == 2
+    mock_chrome.return_value.execute_cdp_cmd.assert_any_call("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URL_PATTERNS})
+
+def test_full_profile_does_not_block_resources():
+    browser = EagleBrowser(backend="selenium", lean=False)
+    with patch("bot.eagle_browser.webdriver.Chrome") as mock_chrome, patch("bot.eagle_browser.Service"):
+        assert browser.init_headless_chrome() is True
+    assert mock_chrome.call_args.kwargs["options"].page_load_strategy == "normal"
+    mock_chrome.return_value.execute_cdp_cmd.assert_not_called()
+
+def test_load_page_records_latency_and_bytes(no_wait):
+    browser = EagleBrowser(backend="selenium")
+    browser.headless_driver = MagicMock()
+    browser.headless_driver.execute_script.return_value = {"bytes": 2048, "requests": 3}
+    assert browser._load_page("https://eagle.ac/x", PLAYSTABLE_LOCATOR, "profile x") is True
+    assert browser._load_page("https://eagle.ac/y", PLAYSTABLE_LOCATOR, "profile y") is True
+    assert browser.page_stats["loads"] == 2
+    assert browser.page_stats["total_bytes"] == 4096
+
+def test_load_page_timeout_is_not_counted(no_wait):
+    no_wait.return_value.until.side_effect = TimeoutException()
+    browser = EagleBrowser(backend="selenium")
+    browser.headless_driver = MagicMock()
+    assert browser._load_page("https://eagle.ac/x", PLAYSTABLE_LOCATOR, "profile x") is False
+    assert browser.page_stats["loads"] == 0
+
+def test_js_extraction_falls_back_to_soup(profile_html, no_wait):
+    browser = EagleBrowser(backend="selenium", extraction="js")
+    browser.headless_driver = MagicMock()
+    browser.headless_driver.execute_script.side_effect = JavascriptException("boom")
+    browser.headless_driver.page_source = profile_html
+    profile = browser._scrape_player_profile_sync("95688187")
+    assert profile == parse_profile_html(profile_html, "95688187")
+    browser.headless_driver.execute_script.assert_any_call(PROFILE_EXTRACT_JS)
+
+
+@pytest.mark.parametrize("outcome, error", [
+    ("login", SessionExpiredError),
+    ("not_found", ProfileNotFoundError),
+    ("empty", EmptyProfileError),
+])
+def test_profile_scrape_fails_fast_on_alternate_pages(no_wait, outcome, error):
+    no_wait.return_value.until.return_value = outcome
+    browser = EagleBrowser(backend="selenium")
+    driver = MagicMock()
+    page_source = PropertyMock(return_value="")
+    type(driver).page_source = page_source
+    driver.execute_script.return_value = {}
+    browser.headless_driver = driver
+    with pytest.raises(error):
+        browser._scrape_player_profile_sync("12345678")
+    # The page source is never read for pages without a Score Log.
+    page_source.assert_not_called()
+
+def test_profile_wait_polls_classify_script(no_wait):
+    browser = EagleBrowser(backend="selenium")
+    browser.headless_driver = MagicMock()
+    browser.headless_driver.execute_script.return_value = None
+    browser._load_page("https://eagle.ac/x", PLAYSTABLE_LOCATOR, "profile x", classify_script=PROFILE_CLASSIFY_JS)
+    condition = no_wait.return_value.until.call_args[0][0]
+    browser.headless_driver.execute_script.return_value = "empty"
+    assert condition(browser.headless_driver) == "empty"
+    browser.headless_driver.execute_script.assert_called_with(PROFILE_CLASSIFY_JS)
+
+
+def dead_driver():
+    driver = MagicMock()
+    type(driver).title = PropertyMock(side_effect=WebDriverException("chrome not reachable"))
+    return driver
+
+@pytest.mark.asyncio
+async def test_dead_driver_is_replaced_by_warm_standby():
+    browser = EagleBrowser(backend="selenium", standby=True, standby_dir_prefix="/tmp/eagle-test-standby")
+    browser.headless_driver = dead_driver()
+    standby = MagicMock()
+    browser.standby_driver, browser.standby_user_data_dir = standby, "/tmp/eagle-test-standby-0"
+    with patch.object(EagleBrowser, "init_headless_chrome") as mock_init, \
+         patch.object(EagleBrowser, "_ensure_standby") as mock_refill:
+        await browser.ensure_browser_is_ready()
+
+    mock_init.assert_not_called()
+    mock_refill.assert_called_once()
+    assert browser.headless_driver is standby
+    assert browser.standby_driver is None
+    assert browser.user_data_dir == "/tmp/eagle-test-standby-0"
+    assert browser._next_standby_dir() == "/tmp/eagle-test-standby-1"
+    stats = browser.restart_stats()
+    assert (stats["restarts"], stats["standby_swaps"], stats["cold_starts"]) == (1, 1, 0)
+    assert stats["avg_swap_ms"] is not None
+
+@pytest.mark.asyncio
+async def test_dead_standby_falls_back_to_cold_start():
+    browser = EagleBrowser(backend="selenium", standby=False)
+    browser.headless_driver = dead_driver()
+    stale_standby = dead_driver()
+    browser.standby_driver = stale_standby
+    with patch.object(EagleBrowser, "init_headless_chrome", return_value=True) as mock_init:
+        await browser.ensure_browser_is_ready()
+
+    mock_init.assert_called_once()
+    stale_standby.quit.assert_called_once()
+    assert browser.restart_stats()["cold_starts"] == 1
+
+def test_watchdog_kills_hung_navigation():
+    browser = EagleBrowser(backend="selenium", navigation_deadline=0.05)
+    driver = MagicMock()
+    driver.service.process.pid = 4242
+    killed = threading.Event()
+
+    def hung_get(url):
+        # Blocks like a wedged chromedriver until its process is killed.
+        assert killed.wait(5)
+        raise WebDriverException("connection refused")
+
+    driver.get.side_effect = hung_get
+    browser.headless_driver = driver
+    with patch("bot.eagle_browser.kill_process_tree", side_effect=lambda pid: killed.set() or 2) as mock_kill, \
+         pytest.raises(ScrapeTimeoutError):
+        browser._fetch_player_profile_sync("12345678")
+
+    mock_kill.assert_called_once_with(4242)
+    assert browser.restart_stats()["watchdog_kills"] == 1
+
+def test_watchdog_stays_quiet_for_normal_navigation(no_wait):
+    browser = EagleBrowser(backend="selenium", navigation_deadline=5)
+    browser.headless_driver = MagicMock()
+    browser.headless_driver.page_source = "<html></html>"
+    with patch("bot.eagle_browser.kill_process_tree") as mock_kill:
+        assert browser._fetch_player_profile_sync("12345678") == "<html></html>"
+    mock_kill.assert_not_called()
+
+def test_memory_budget_mode_uses_low_footprint_flags_and_tmpfs_clone(tmp_path):
+    browser = EagleBrowser(backend="selenium", memory_budget=True, tmpfs_user_data_dir=str(tmp_path / "shm"))
+    with patch("bot.eagle_browser.webdriver.Chrome") as mock_chrome, patch("bot.eagle_browser.Service"), \
+         patch("bot.eagle_browser.clone_chrome_profile", side_effect=lambda dest: dest) as mock_clone:
+        assert browser.init_headless_chrome() is True
+    mock_clone.assert_called_once_with(str(tmp_path / "shm"))
+    args = mock_chrome.call_args.kwargs["options"].arguments
+    assert f"--user-data-dir={tmp_path / 'shm'}" in args
+    assert "--renderer-process-limit=1" in args
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pages, rss_mb, recycled", [
+    (10, 200, False),   # sampled, under budget
+    (10, 900, True),    # over the RSS budget
+    (500, 200, True),   # over the page limit
+    (3, 900, False),    # not due for a sample yet
+])
+async def test_memory_budget_recycles_between_scrapes(pages, rss_mb, recycled):
+    browser = EagleBrowser(backend="selenium", memory_budget=True)
+    browser.memory_budget_mb, browser.recycle_after_pages = 600, 500
+    browser.headless_driver = MagicMock()
+    browser.pages_since_start = pages
+    with patch("bot.eagle_browser.tree_rss", return_value=(rss_mb * 1024 * 1024, 5)), \
+         patch.object(EagleBrowser, "_replace_driver") as mock_replace:
+        await browser.ensure_browser_is_ready()
+    assert mock_replace.await_count == int(recycled)
+    assert browser.restart_stats()["recycles"] == int(recycled)
+    assert browser.restart_stats()["rss_mb"] == (None if pages == 3 else rss_mb)
+
+def test_load_page_counts_navigations_for_recycling(no_wait):
+    browser = EagleBrowser(backend="selenium")
+    browser.headless_driver = MagicMock()
+    browser._load_page("https://eagle.ac/x", PLAYSTABLE_LOCATOR, "profile x")
+    browser._load_page("https://eagle.ac/y", PLAYSTABLE_LOCATOR, "profile y")
+    assert browser.pages_since_start == 2
+
+@pytest.mark.asyncio
+async def test_expired_session_logs_in_again_and_retries(tmp_path):
+    store = CookieStore(str(tmp_path / "cookies.json"))
+    browser = EagleBrowser(backend="selenium", cookie_store=store)
+    browser.headless_driver = MagicMock()
+    browser.headless_driver.execute_cdp_cmd.return_value = {"cookies": [{"name": "session", "value": "new", "domain": "eagle.ac"}]}
+    browser.headless_driver.execute_script.return_value = "TestAgent/1.0"
+    fetch = MagicMock(side_effect=[SessionExpiredError("profile 1 redirected to the kailua login"), "<html></html>"])
+    with patch.object(EagleBrowser, "_fetch_player_profile_sync", fetch), \
+         patch.object(EagleBrowser, "_login_sync", return_value=True) as mock_login:
+        page = await browser.fetch_player_profile("1")
+
+    assert page == "<html></html>"
+    mock_login.assert_called_once()
+    assert browser.logins == 1
+    assert store.load()[0]["value"] == "new"
+
+@pytest.mark.asyncio
+async def test_relogin_uses_jar_saved_by_another_browser(tmp_path):
+    store = CookieStore(str(tmp_path / "cookies.json"))
+    first, second = (EagleBrowser(backend="selenium", cookie_store=store) for _ in range(2))
+    for browser in (first, second):
+        browser.headless_driver = MagicMock()
+        await browser.ensure_browser_is_ready()
+    store.save([{"name": "session", "value": "new", "domain": "eagle.ac", "path": "/", "expires": -1}])
+
+    with patch.object(EagleBrowser, "_login_sync") as mock_login:
+        assert await second.relogin() is True
+
+    mock_login.assert_not_called()
+    second.headless_driver.execute_cdp_cmd.assert_called_with(
+        "Network.setCookies", {"cookies": [{"name": "session", "value": "new", "domain": "eagle.ac", "path": "/"}]}
+    )
+
+def test_perform_login_skips_steps_the_session_does_not_need():
+    driver = MagicMock()
+    # Already authorized: the login link leads straight back to eagle.ac.
+    driver.execute_script.side_effect = ["link", "link", None, "done"]
+    with patch("bot.eagle_browser.EAGLE_EMAIL", "a@b.c"), patch("bot.eagle_browser.EAGLE_PASSWORD", "pw"):
+        assert perform_login(driver, "https://eagle.ac/auth/kailua", step_seconds=1) is True
+    driver.find_element.assert_called_once()
+    driver.find_element.return_value.click.assert_called_once()
+
+def test_perform_login_fails_when_form_comes_back():
+    driver = MagicMock()
+    driver.execute_script.return_value = "form"
+    with patch("bot.eagle_browser.EAGLE_EMAIL", "a@b.c"), patch("bot.eagle_browser.EAGLE_PASSWORD", "wrong"):
+        assert perform_login(driver, "https://eagle.ac/auth/kailua", step_seconds=0.05) is False
+    driver.find_element.return_value.submit.assert_called_once()
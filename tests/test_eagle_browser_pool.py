@@ -0,0 +1,138 @@
+# tests/test_eagle_browser_pool.py
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from bot.eagle_browser import EagleBrowser, EagleBrowserPool
+from bot.scrape_queue import ScrapeQueue
+
+
+@pytest.fixture
+def pool():
+    pool = EagleBrowserPool(size=3, backend="selenium", pool_dir="/tmp/eagle-bot-test-pool")
+    for i, browser in enumerate(pool.browsers):
+        browser.name = f"worker-{i}"
+    return pool
+
+
+def test_workers_get_separate_user_data_dirs(pool):
+    dirs = [b.user_data_dir for b in pool.browsers]
+    assert len(set(dirs)) == 3
+    assert dirs[1].endswith("worker-1") and dirs[2].endswith("worker-2")
+
+@pytest.mark.asyncio
+async def test_scrapes_run_concurrently_across_drivers(pool):
+    in_flight, peak = 0, 0
+
+    async def slow_scrape(self, sdvx_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"player_name": sdvx_id, "worker": self.name}
+
+    with patch.object(EagleBrowser, "fetch_player_profile", slow_scrape):
+        results = await asyncio.gather(*(pool.scrape_player_profile(str(i)) for i in range(9)))
+
+    assert peak == 3
+    assert len({r["worker"] for r in results}) == 3
+    assert pool._idle.qsize() == 3
+
+@pytest.mark.asyncio
+async def test_dead_driver_does_not_block_other_drivers(pool):
+    """A driver whose restart fails only fails its own request and is returned to the pool."""
+    async def scrape(self, sdvx_id):
+        if self.name == "worker-0":
+            raise RuntimeError("Headless browser is unavailable and could not be restarted.")
+        return {"player_name": sdvx_id}
+
+    with patch.object(EagleBrowser, "fetch_player_profile", scrape):
+        results = await asyncio.gather(*(pool.scrape_player_profile(str(i)) for i in range(3)), return_exceptions=True)
+
+    assert sum(isinstance(r, RuntimeError) for r in results) == 1
+    assert sum(isinstance(r, dict) for r in results) == 2
+    assert pool._idle.qsize() == 3
+
+def test_init_headless_chrome_clones_profile_for_extra_workers(pool):
+    with patch("bot.eagle_browser.clone_chrome_profile") as mock_clone, \
+         patch.object(EagleBrowser, "init_headless_chrome", return_value=True) as mock_init:
+        assert pool.init_headless_chrome() is True
+    assert mock_clone.call_count == 2
+    assert mock_init.call_count == 3
+
+def test_init_headless_chrome_succeeds_with_partial_pool(pool):
+    with patch("bot.eagle_browser.clone_chrome_profile", side_effect=OSError("disk full")), \
+         patch.object(EagleBrowser, "init_headless_chrome", return_value=True) as mock_init:
+        assert pool.init_headless_chrome() is True
+    mock_init.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_browser_is_returned_before_the_parse_stage(pool):
+    """The driver goes back to the pool as soon as its page is fetched."""
+    idle_during_parse = []
+
+    async def fetch(self, sdvx_id):
+        return "<html></html>"
+
+    async def parse(page, sdvx_id, change_detector, parse_pool, parse_stats):
+        idle_during_parse.append(pool._idle.qsize())
+        return {"player_name": sdvx_id}
+
+    with patch.object(EagleBrowser, "fetch_player_profile", fetch), \
+         patch("bot.eagle_browser.parse_profile_page", parse):
+        assert await pool.scrape_player_profile("1") == {"player_name": "1"}
+    assert idle_during_parse == [3]
+
+@pytest.mark.asyncio
+async def test_queue_fetches_the_next_page_while_one_is_parsed():
+    """With a worker per driver plus one per parser, a single driver fetches while the last page parses."""
+    pool = EagleBrowserPool(size=1, backend="selenium", pool_dir="/tmp/eagle-bot-test-pool")
+    queue = ScrapeQueue(pool, workers=2)
+    fetched = []
+    second_fetched = asyncio.Event()
+
+    async def fetch(self, sdvx_id):
+        fetched.append(sdvx_id)
+        if len(fetched) == 2:
+            second_fetched.set()
+        return "<html></html>"
+
+    async def parse(page, sdvx_id, change_detector, parse_pool, parse_stats):
+        if sdvx_id == "1":
+            await asyncio.wait_for(second_fetched.wait(), 1)
+        return {"player_name": sdvx_id}
+
+    with patch.object(EagleBrowser, "fetch_player_profile", fetch), \
+         patch("bot.eagle_browser.parse_profile_page", parse):
+        results = await asyncio.gather(queue.scrape_player_profile("1"), queue.scrape_player_profile("2"))
+    for task in queue._worker_tasks:
+        task.cancel()
+
+    assert [r["player_name"] for r in results] == ["1", "2"]
+    assert fetched == ["1", "2"]
+
+@pytest.mark.asyncio
+async def test_shutdown_waits_for_scrape_in_progress(pool):
+    order = []
+
+    async def scrape(self, sdvx_id):
+        await asyncio.sleep(0.01)
+        order.append("scrape")
+        return {}
+
+    async def shutdown(self):
+        order.append("shutdown")
+
+    with patch.object(EagleBrowser, "fetch_player_profile", scrape), \
+         patch.object(EagleBrowser, "shutdown", shutdown):
+        scrape_task = asyncio.create_task(pool.scrape_player_profile("1"))
+        await asyncio.sleep(0)
+        await pool.shutdown()
+        await scrape_task
+
+    assert order == ["scrape", "shutdown", "shutdown", "shutdown"]
+    assert pool._idle.qsize() == 3
+
+def test_pool_browsers_share_one_parse_pool(pool):
+    assert all(browser.parse_pool is pool.parse_pool for browser in pool.browsers)
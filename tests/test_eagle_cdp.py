@@ -0,0 +1,176 @@
+# tests/test_eagle_cdp.py
+import asyncio
+import json
+import pathlib
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.cookie_store import CookieStore
+from bot.rate_limiter import RateLimiter
+from bot.eagle_cdp import EagleCdpBrowser, CdpConnection, CdpError
+from bot.eagle_errors import ProfileNotFoundError, ScrapeTimeoutError
+from bot.eagle_parser import parse_profile_html, PROFILE_CLASSIFY_JS
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+
+
+class FakeChrome:
+    """Answers the DevTools commands EagleCdpBrowser sends, per page session."""
+    def __init__(self, profile_html: str):
+        self.profile_html = profile_html
+        self.url = {}              # sessionId -> last navigated URL
+        self.navigate_delay = 0.0
+        self.commit_delay = 0.0    # between the Page.navigate reply and the new document committing
+        self.in_flight = 0
+        self.peak = 0
+        self.methods = []
+        self.tasks = set()
+
+    def evaluate(self, session_id: str, expression: str):
+        url = self.url.get(session_id, "")
+        if PROFILE_CLASSIFY_JS.strip() in expression:
+            return "not_found" if url.endswith("/00000000") else "ready"
+        if "outerHTML" in expression:
+            return self.profile_html
+        return None
+
+    async def commit(self, session_id: str, url: str, loader_id: str, emit):
+        await asyncio.sleep(self.commit_delay)
+        self.url[session_id] = url
+        await emit({"method": "Page.frameNavigated", "sessionId": session_id,
+                    "params": {"frame": {"id": "frame", "loaderId": loader_id, "url": url}}})
+
+    async def handle(self, message: dict, emit) -> dict:
+        method, params, session_id = message["method"], message.get("params", {}), message.get("sessionId")
+        self.methods.append(method)
+        if method == "Target.createTarget":
+            return {"targetId": f"target-{self.methods.count(method)}"}
+        if method == "Target.attachToTarget":
+            return {"sessionId": f"session-{params['targetId']}"}
+        if method == "Page.navigate":
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(self.navigate_delay)
+            self.in_flight -= 1
+            loader_id = f"loader-{self.methods.count(method)}"
+            task = asyncio.create_task(self.commit(session_id, params["url"], loader_id, emit))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+            return {"frameId": "frame", "loaderId": loader_id}
+        if method == "Runtime.evaluate":
+            return {"result": {"type": "object", "value": self.evaluate(session_id, params["expression"])}}
+        return {}
+
+
+@pytest_asyncio.fixture
+async def fake_chrome():
+    chrome = FakeChrome((FIXTURES / "eagle_profile.html").read_text(encoding="utf-8"))
+
+    async def devtools(request):
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+
+        async def reply(message):
+            result = await chrome.handle(message, ws.send_json)
+            await ws.send_json({"id": message["id"], "result": result})
+
+        async for msg in ws:
+            task = asyncio.create_task(reply(json.loads(msg.data)))
+            chrome.tasks.add(task)
+            task.add_done_callback(chrome.tasks.discard)
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/devtools/browser/fake", devtools)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    chrome.ws_url = f"ws://127.0.0.1:{port}/devtools/browser/fake"
+    yield chrome
+    for task in list(chrome.tasks):
+        task.cancel()
+    await runner.cleanup()
+
+
+@pytest.fixture
+def make_browser(fake_chrome, tmp_path):
+    def make(**kwargs):
+        return EagleCdpBrowser(cdp_url=fake_chrome.ws_url, base_url="https://eagle.test", lean=True,
+                               cookie_store=CookieStore(str(tmp_path / "cookies.json")), rate_limiter=RateLimiter(rate=0), **kwargs)
+    return make
+
+
+@pytest.mark.asyncio
+async def test_profile_scrape_over_devtools_matches_soup_parse(make_browser, fake_chrome):
+    browser = make_browser(pages=2)
+    profile = await browser.scrape_player_profile("95688187")
+    await browser.close()
+
+    assert profile == parse_profile_html(fake_chrome.profile_html, "95688187")
+    assert fake_chrome.methods.count("Target.createTarget") == 2
+    assert "Network.setBlockedURLs" in fake_chrome.methods
+
+@pytest.mark.asyncio
+async def test_concurrent_scrapes_share_page_targets(make_browser, fake_chrome):
+    fake_chrome.navigate_delay = 0.02
+    browser = make_browser(pages=3)
+    pages = await asyncio.gather(*(browser.fetch_player_profile(str(i)) for i in range(9)))
+    await browser.close()
+
+    assert all('id="playstable"' in page for page in pages)
+    assert fake_chrome.peak == 3
+
+@pytest.mark.asyncio
+async def test_missing_profile_raises_outcome_error(make_browser):
+    browser = make_browser(pages=1)
+    with pytest.raises(ProfileNotFoundError):
+        await browser.fetch_player_profile("00000000")
+    await browser.close()
+
+@pytest.mark.asyncio
+async def test_scrape_waits_for_the_new_document_on_a_reused_page(make_browser, fake_chrome):
+    browser = make_browser(pages=1)
+    assert 'id="playstable"' in await browser.fetch_player_profile("1")
+    # The previous player's Score Log stays up until the next navigation commits.
+    fake_chrome.commit_delay = 0.2
+    with pytest.raises(ProfileNotFoundError):
+        await browser.fetch_player_profile("00000000")
+    await browser.close()
+
+@pytest.mark.asyncio
+async def test_hung_page_is_replaced_after_deadline(make_browser, fake_chrome):
+    fake_chrome.navigate_delay = 1.0
+    browser = make_browser(pages=1, navigation_deadline=0.05)
+    with pytest.raises(ScrapeTimeoutError):
+        await browser.fetch_player_profile("1")
+    fake_chrome.navigate_delay = 0.0
+    assert 'id="playstable"' in await browser.fetch_player_profile("1")
+    await browser.close()
+
+    assert browser.restart_stats()["watchdog_kills"] == 1
+    assert fake_chrome.methods.count("Target.createTarget") == 2
+
+@pytest.mark.asyncio
+async def test_relogin_is_paced_by_the_rate_limiter(make_browser):
+    browser = make_browser(pages=1)
+    browser.rate_limiter = MagicMock(acquire=AsyncMock())
+    browser._cookie_version = browser.cookie_store.version  # no newer jar to restore instead
+    with patch("bot.eagle_cdp.cdp_login", AsyncMock(return_value=True)), \
+         patch.object(EagleCdpBrowser, "_save_cookies", AsyncMock()):
+        assert await browser.relogin() is True
+    await browser.close()
+
+    browser.rate_limiter.acquire.assert_awaited_once()
+    browser.rate_limiter.report.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_connection_fails_pending_commands_when_closed(fake_chrome):
+    connection = CdpConnection(fake_chrome.ws_url)
+    await connection.connect()
+    await connection.close()
+    with pytest.raises(CdpError):
+        await connection.send("Target.createTarget")
@@ -0,0 +1,110 @@
+# tests/test_eagle_http.py
+import pathlib
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.eagle_browser import EagleBrowser
+from bot.eagle_errors import SessionExpiredError, ProfileNotFoundError
+from bot.eagle_http import EagleHttpClient
+from bot.cookie_store import CookieStore
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+
+
+@pytest_asyncio.fixture
+async def eagle_server():
+    """Serves the recorded eagle.ac pages on localhost. Profiles require a 'session' cookie."""
+    profile_html = (FIXTURES / "eagle_profile.html").read_text(encoding="utf-8")
+
+    async def profile(request):
+        if request.cookies.get("session") != "abc":
+            raise web.HTTPFound("/auth/kailua")
+        return web.Response(text=profile_html, content_type="text/html")
+
+    async def missing_profile(request):
+        return web.Response(text="<html><head><title>eagle</title></head><body><h2>Player not found</h2></body></html>", content_type="text/html")
+
+    async def login(request):
+        return web.Response(text="<form><input name='email'></form>", content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/game/sdvx/profile/00000000", missing_profile)
+    app.router.add_get("/game/sdvx/profile/{sdvx_id}", profile)
+    app.router.add_get("/auth/kailua", login)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://localhost:{port}"
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_fetch_html_with_cookies(eagle_server):
+    client = EagleHttpClient()
+    client.load_cookies([{"name": "session", "value": "abc", "domain": "localhost", "path": "/"}])
+    html = await client.fetch_html(f"{eagle_server}/game/sdvx/profile/95688187")
+    await client.close()
+    assert 'id="playstable"' in html
+
+@pytest.mark.asyncio
+async def test_fetch_html_login_redirect_raises(eagle_server):
+    client = EagleHttpClient()
+    client.load_cookies([])
+    with pytest.raises(SessionExpiredError):
+        await client.fetch_html(f"{eagle_server}/game/sdvx/profile/95688187")
+    assert client.cookies_loaded is False
+    await client.close()
+
+@pytest.mark.asyncio
+async def test_browser_http_backend_parses_profile(eagle_server, tmp_path):
+    browser = EagleBrowser(backend="http", base_url=eagle_server, cookie_store=CookieStore(str(tmp_path / "cookies.json")))
+    cookies = [{"name": "session", "value": "abc", "domain": "localhost", "path": "/"}]
+    with patch.object(EagleBrowser, "ensure_browser_is_ready", new_callable=AsyncMock), \
+         patch.object(EagleBrowser, "export_session_cookies", return_value=cookies):
+        browser.headless_driver = MagicMock()
+        browser.headless_driver.execute_script.return_value = "TestAgent/1.0"
+        profile = await browser.scrape_player_profile("95688187")
+    await browser.http_client.close()
+    assert profile["player_name"] == "RAVERX"
+    assert len(profile["recent_plays"]) == 20
+
+@pytest.mark.asyncio
+async def test_browser_http_backend_falls_back_to_selenium(eagle_server, tmp_path):
+    browser = EagleBrowser(backend="http", base_url=eagle_server, cookie_store=CookieStore(str(tmp_path / "cookies.json")))
+    with patch.object(EagleBrowser, "ensure_browser_is_ready", new_callable=AsyncMock), \
+         patch.object(EagleBrowser, "export_session_cookies", return_value=[]), \
+         patch.object(EagleBrowser, "_fetch_player_profile_sync", return_value={"player_name": "FromSelenium"}) as mock_sync:
+        browser.headless_driver = MagicMock()
+        browser.headless_driver.execute_script.return_value = "TestAgent/1.0"
+        profile = await browser.scrape_player_profile("95688187")
+    await browser.http_client.close()
+    assert profile == {"player_name": "FromSelenium"}
+    mock_sync.assert_called_once_with("95688187")
+
+@pytest.mark.asyncio
+async def test_browser_http_backend_not_found_skips_selenium(eagle_server, tmp_path):
+    browser = EagleBrowser(backend="http", base_url=eagle_server, cookie_store=CookieStore(str(tmp_path / "cookies.json")))
+    with patch.object(EagleBrowser, "ensure_browser_is_ready", new_callable=AsyncMock), \
+         patch.object(EagleBrowser, "export_session_cookies", return_value=[]), \
+         patch.object(EagleBrowser, "_fetch_player_profile_sync") as mock_sync:
+        browser.headless_driver = MagicMock()
+        browser.headless_driver.execute_script.return_value = "TestAgent/1.0"
+        with pytest.raises(ProfileNotFoundError):
+            await browser.scrape_player_profile("00000000")
+    await browser.http_client.close()
+    mock_sync.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_browser_http_backend_uses_saved_cookies_without_chrome(eagle_server, tmp_path):
+    store = CookieStore(str(tmp_path / "cookies.json"))
+    store.save([{"name": "session", "value": "abc", "domain": "localhost", "path": "/", "expires": -1}], user_agent="TestAgent/1.0")
+    browser = EagleBrowser(backend="http", base_url=eagle_server, cookie_store=store)
+    with patch.object(EagleBrowser, "ensure_browser_is_ready", new_callable=AsyncMock) as mock_ready:
+        profile = await browser.scrape_player_profile("95688187")
+    await browser.http_client.close()
+    assert profile["player_name"] == "RAVERX"
+    mock_ready.assert_not_awaited()
@@ -0,0 +1,153 @@
+# tests/test_eagle_parser.py
+import json
+import pathlib
+import shutil
+import pytest
+from bs4 import BeautifulSoup
+from bot import eagle_parser
+from bot.eagle_parser import (
+    parse_leaderboard_html, parse_profile_html, leaderboard_from_rows, profile_from_extract,
+    LEADERBOARD_EXTRACT_JS, PROFILE_EXTRACT_JS, PROFILE_CLASSIFY_JS, play_fingerprint, new_plays_since,
+    classify_profile_html, PAGE_READY, PAGE_LOGIN, PAGE_NOT_FOUND, PAGE_EMPTY, PAGE_UNKNOWN,
+    available_parser_backends, resolve_parser_backend, _extract_profile_soup
+)
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+
+@pytest.fixture
+def profile_html():
+    return (FIXTURES / "eagle_profile.html").read_text(encoding="utf-8")
+
+@pytest.fixture
+def arcade_html():
+    return (FIXTURES / "eagle_arcade.html").read_text(encoding="utf-8")
+
+
+def test_parse_profile_header_fields(profile_html):
+    profile = parse_profile_html(profile_html, "95688187")
+    assert profile["player_name"] == "RAVERX"
+    assert profile["skill_level"] == "魔騎士 (Lv.10)"
+    assert profile["total_plays"] == 2481
+
+def test_parse_profile_recent_plays(profile_html):
+    plays = parse_profile_html(profile_html, "95688187")["recent_plays"]
+    # Detail rows (tr.hiddenRow) are skipped; only the accordion-toggle rows are plays.
+    assert len(plays) == 20
+    assert plays[0] == {
+        "song_title": "Grace-like Fragment",
+        "chart": "EXH 18",
+        "clear_type": "COMPLETE",
+        "grade": "AAA",
+        "score": "9,669,781",
+        "vf_per_play": 0.473,
+        "timestamp": "2025-06-18 10:59 PM",
+        "is_new_record": True,
+    }
+    assert plays[1]["is_new_record"] is False
+    assert plays[4]["vf_per_play"] is None
+
+def test_parse_profile_without_score_log():
+    assert parse_profile_html("<html><body><h2 class='page-header'>Login</h2></body></html>", "1") == {}
+
+def test_parse_leaderboard(arcade_html):
+    board = parse_leaderboard_html(arcade_html)
+    assert len(board) == 10
+    assert board[0] == {"rank": 1, "sdvx_id": "1266-6165", "player_name": "#-FINN-#", "volforce": 17.02}
+    # The IIDX Top 10 panel on the same page must not leak into the SDVX board.
+    assert all(p["sdvx_id"] != "1111-2222" for p in board)
+
+def test_parse_leaderboard_missing_panel():
+    assert parse_leaderboard_html("<html><body></body></html>") == []
+
+
+# --- In-page (JS) extraction must produce the same dicts as the BeautifulSoup path ---
+
+@pytest.mark.parametrize("backend", available_parser_backends())
+def test_parser_backends_match_full_tree(profile_html, arcade_html, backend):
+    full_profile = profile_from_extract(_extract_profile_soup(BeautifulSoup(profile_html, "html.parser"), "95688187"), "95688187")
+    assert parse_profile_html(profile_html, "95688187", backend) == full_profile
+    assert parse_leaderboard_html(arcade_html, backend) == parse_leaderboard_html(arcade_html, "html.parser")
+    assert len(parse_leaderboard_html(arcade_html, backend)) == 10
+
+@pytest.mark.parametrize("backend", available_parser_backends())
+def test_profile_labels_outside_list_items_are_parsed(profile_html, backend):
+    # The labels are found by text, so a layout that moves them out of the <li>s still parses.
+    relaid = profile_html.replace("<li", "<div").replace("</li>", "</div>")
+    assert relaid != profile_html
+    assert parse_profile_html(relaid, "95688187", backend) == parse_profile_html(profile_html, "95688187", backend)
+
+def test_resolve_parser_backend_falls_back_when_not_installed(monkeypatch):
+    monkeypatch.setattr(eagle_parser.importlib.util, "find_spec", lambda name: None)
+    assert available_parser_backends() == ["html.parser"]
+    assert resolve_parser_backend("auto") == "html.parser"
+    assert resolve_parser_backend("lxml") == "html.parser"
+
+def test_recorded_profile_extract_matches_soup(profile_html):
+    raw = json.loads((FIXTURES / "eagle_profile_extract.json").read_text(encoding="utf-8"))
+    assert profile_from_extract(raw, "95688187") == parse_profile_html(profile_html, "95688187")
+
+def test_recorded_leaderboard_extract_matches_soup(arcade_html):
+    rows = json.loads((FIXTURES / "eagle_arcade_extract.json").read_text(encoding="utf-8"))
+    assert leaderboard_from_rows(rows) == parse_leaderboard_html(arcade_html)
+
+def test_profile_from_extract_skips_incomplete_rows():
+    raw = {"player_name": "P", "skill_level": None, "plays_text": "1,000", "rows": [
+        {"title": "A", "chart": "EXH 17", "clear": None, "grade": "S", "score": "1", "vf": "", "timestamp": "t", "is_new_record": False},
+        {"title": "B", "chart": "EXH 17", "clear": "COMPLETE", "grade": "S", "score": "1", "vf": "", "timestamp": "t", "is_new_record": False},
+    ]}
+    profile = profile_from_extract(raw, "1")
+    assert profile["total_plays"] == 1000
+    assert [p["song_title"] for p in profile["recent_plays"]] == ["B"]
+
+@pytest.mark.skipif(shutil.which("chromedriver") is None, reason="needs chromedriver and Chrome")
+def test_js_extraction_in_chrome_matches_soup(profile_html, arcade_html):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    options = Options()
+    options.add_argument("--headless=new"); options.add_argument("--no-sandbox")
+    driver = webdriver.Chrome(options=options)
+    try:
+        driver.get((FIXTURES / "eagle_profile.html").as_uri())
+        assert profile_from_extract(driver.execute_script(PROFILE_EXTRACT_JS), "95688187") == parse_profile_html(profile_html, "95688187")
+        driver.get((FIXTURES / "eagle_arcade.html").as_uri())
+        assert leaderboard_from_rows(driver.execute_script(LEADERBOARD_EXTRACT_JS)) == parse_leaderboard_html(arcade_html)
+    finally:
+        driver.quit()
+
+
+def test_fingerprints_distinguish_plays_in_the_same_minute(profile_html):
+    plays = parse_profile_html(profile_html, "95688187")["recent_plays"]
+    assert plays[0]["timestamp"] == plays[1]["timestamp"]
+    assert play_fingerprint(plays[0]) != play_fingerprint(plays[1])
+    assert play_fingerprint(dict(plays[0])) == play_fingerprint(plays[0])
+    assert len({play_fingerprint(p) for p in plays}) == len(plays)
+
+def test_new_plays_since_stops_at_first_seen_row(profile_html):
+    plays = parse_profile_html(profile_html, "95688187")["recent_plays"]
+    known = {play_fingerprint(p) for p in plays[3:]}
+
+    assert new_plays_since(plays, known) == (plays[:3], True)
+    assert new_plays_since(plays, {play_fingerprint(p) for p in plays}) == ([], True)
+    assert new_plays_since(plays, set()) == (plays, False)
+
+
+@pytest.mark.parametrize("html, expected", [
+    ("<h2>Player not found</h2>", PAGE_NOT_FOUND),
+    ("<title>404 Not Found</title>", PAGE_NOT_FOUND),
+    ('<h2 class="page-header"><div class="col-xs-7">NEWBIE</div></h2><p>No plays yet.</p>', PAGE_EMPTY),
+    ('<h2 class="page-header">Profile</h2><a href="/auth/kailua">Log in</a>', PAGE_LOGIN),
+    ("<div>loading...</div>", PAGE_UNKNOWN),
+])
+def test_classify_profile_html(html, expected):
+    assert classify_profile_html(html) == expected
+
+@pytest.mark.parametrize("backend", available_parser_backends())
+def test_classify_profile_html_ready(profile_html, backend):
+    assert classify_profile_html(profile_html, backend) == PAGE_READY
+
+def test_classify_js_is_valid_script():
+    if shutil.which("node") is None:
+        pytest.skip("node is not installed")
+    import subprocess
+    result = subprocess.run(["node", "--check", "-"], input=f"(function(){{{PROFILE_CLASSIFY_JS}}})", capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -1,7 +1,9 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 
 from bot.utils.error_handler import ScrapeErrorHandler
+from bot.utils.circuit_breaker import CircuitBreakers
 
 # A dummy exception for testing
 class ScrapeTestError(Exception):
@@ -136,4 +138,30 @@ async def test_failure_count_reset(handler, mock_notification_service, mock_scra
         await decorated_func()
         
     assert handler.failure_count == 1
-    mock_notification_service.send_admin_alert.assert_not_awaited()
\ No newline at end of file
+    mock_notification_service.send_admin_alert.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_open_endpoint_breaker_marks_system_down_until_it_closes(mock_notification_service, mock_scrape_func):
+    breakers = CircuitBreakers()
+    handler = ScrapeErrorHandler(mock_notification_service, breakers=breakers)
+    endpoint = breakers.endpoint("profile")
+    endpoint.min_calls = 1
+
+    endpoint.record_failure()
+    await asyncio.sleep(0)
+    assert handler.system_is_down is True
+    mock_notification_service.send_admin_alert.assert_awaited_once_with(
+        "System is DOWN: profile scrapes are failing; circuit breaker open."
+    )
+
+    # A job succeeding doesn't end the outage while the breaker is still open.
+    await handler.handle_scrape_failures()(mock_scrape_func)()
+    assert handler.system_is_down is True
+
+    endpoint.opened_at -= endpoint.open_seconds
+    assert endpoint.allow()
+    endpoint.record_success()
+    await asyncio.sleep(0)
+    assert handler.system_is_down is False
+    mock_notification_service.send_admin_alert.assert_awaited_with("System has RECOVERED: scraping is working again.")
+    assert mock_notification_service.send_admin_alert.await_count == 2
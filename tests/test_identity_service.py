@@ -7,6 +7,7 @@ from datetime import datetime, timezone
 
 from bot.eagle_browser import EagleBrowser
 from bot.core.identity_service import IdentityService
+from bot.player_store import PlayerStore
 
 
 @pytest.fixture
@@ -18,18 +19,20 @@ def mock_browser():
     return browser
 
 @pytest.fixture
-def users_file_path():
-    """Provides a consistent fake file path for the user data file."""
-    return "fake_users.json"
+def player_store(tmp_path):
+    """Provides an empty player database in a temporary directory."""
+    store = PlayerStore(str(tmp_path / "eagle.db"))
+    yield store
+    store.close()
 
 
 @pytest.mark.asyncio
-async def test_link_user_new_user(users_file_path, mock_browser):
+async def test_link_user_new_user(player_store, mock_browser):
     """Tests that a new user can link their account successfully, with player_name from profile scrape."""
     with patch.object(IdentityService, '_read_users', return_value={}) as mock_read_users, \
          patch.object(IdentityService, '_write_users') as mock_write_users:
         
-        service = IdentityService(users_file_path, mock_browser)
+        service = IdentityService(player_store, mock_browser)
         # Mock profile scrape to return player_name (as per current _scrape_player_profile)
         mock_browser.scrape_player_profile.return_value = { 
             "player_name": "TestPlayerName", "recent_plays": [] # recent_plays included to match signature
@@ -49,10 +52,10 @@ async def test_link_user_new_user(users_file_path, mock_browser):
 
 
 @pytest.mark.asyncio
-async def test_link_user_invalid_id(users_file_path, mock_browser):
+async def test_link_user_invalid_id(player_store, mock_browser):
     """Tests that linking fails with an invalid SDVX ID format."""
     with patch.object(IdentityService, '_write_users') as mock_write_users:
-        service = IdentityService(users_file_path, mock_browser)
+        service = IdentityService(player_store, mock_browser)
         result = await service.link_user(discord_id="discord123", sdvx_id="invalid-id") 
         
         assert result is False
@@ -61,8 +64,8 @@ async def test_link_user_invalid_id(users_file_path, mock_browser):
 
 
 @pytest.mark.asyncio
-async def test_update_player_cache_update_existing(users_file_path, mock_browser):
-    """Test update_player_cache updates existing player data (name, volforce, rank) from leaderboard and enriches with recent_plays from profile."""
+async def test_refresh_jobs_update_existing(player_store, mock_browser):
+    """The leaderboard job updates existing player data (name, volforce, rank) and the profile sweep enriches it with recent_plays."""
     initial_users = {
         "10000001": {"sdvx_id": "10000001", "discord_id": "d1", "player_name": "OldA", "volforce": 1.0, "rank": 5}
     }
@@ -79,8 +82,9 @@ async def test_update_player_cache_update_existing(users_file_path, mock_browser
     with patch.object(IdentityService, '_read_users', return_value=initial_users), \
          patch.object(IdentityService, '_write_users') as mock_write_users:
         
-        service = IdentityService(users_file_path, mock_browser)
-        new_players = await service.update_player_cache()
+        service = IdentityService(player_store, mock_browser)
+        new_players = await service.refresh_leaderboard()
+        await service.refresh_profiles()
         
         assert new_players == [] # Expect no new players, as '10000001' was already in initial_users
         written_data = mock_write_users.call_args[0][0]
@@ -96,7 +100,7 @@ async def test_update_player_cache_update_existing(users_file_path, mock_browser
 
 
 @pytest.mark.asyncio
-async def test_update_player_cache_discover_new(users_file_path, mock_browser):
+async def test_refresh_jobs_discover_new(player_store, mock_browser):
     """Tests that a truly new player from a leaderboard scrape is added and enriched with recent_plays."""
     scraped_data = [{ # Leaderboard data
         "sdvx_id": "87654321", "player_name": "NEWBIE_LB", "volforce": 1.0, "rank": 2
@@ -111,8 +115,9 @@ async def test_update_player_cache_discover_new(users_file_path, mock_browser):
     with patch.object(IdentityService, '_read_users', return_value={}), \
          patch.object(IdentityService, '_write_users') as mock_write_users:
         
-        service = IdentityService(users_file_path, mock_browser)
-        new_players = await service.update_player_cache()
+        service = IdentityService(player_store, mock_browser)
+        new_players = await service.refresh_leaderboard()
+        await service.refresh_profiles()
         
         assert new_players == ["NEWBIE_LB"] # This list still reflects names from initial leaderboard discovery
         written_data = mock_write_users.call_args[0][0]
@@ -128,39 +133,42 @@ async def test_update_player_cache_discover_new(users_file_path, mock_browser):
 
 
 @pytest.mark.asyncio
-async def test_update_player_cache_scrape_fails(users_file_path, mock_browser):
+async def test_refresh_leaderboard_scrape_fails(player_store, mock_browser):
     """Tests that the service handles a failure from the web scraper."""
     mock_browser.scrape_leaderboard.side_effect = Exception("Leaderboard Scrape Failed")
     
     with patch.object(IdentityService, '_write_users') as mock_write_users:
-        service = IdentityService(users_file_path, mock_browser)
+        service = IdentityService(player_store, mock_browser)
         
         with pytest.raises(Exception, match="Leaderboard Scrape Failed"):
-            await service.update_player_cache()
+            await service.refresh_leaderboard()
             
         mock_write_users.assert_not_called()
         mock_browser.scrape_player_profile.assert_not_awaited() 
 
 @pytest.mark.asyncio
-async def test_get_user_by_discord_id(users_file_path, mock_browser):
+async def test_get_user_by_discord_id(player_store, mock_browser):
     """Tests finding a user by their Discord ID."""
-    mock_data = {
+    player_store.save_players({
         "11112222": {"discord_id": "discord1", "player_name": "Player One"},
         "33334444": {"discord_id": "discord2", "player_name": "Player Two"}
-    }
-    
-    with patch.object(IdentityService, '_read_users', return_value=mock_data):
-        service = IdentityService(users_file_path, mock_browser)
-        
-        found_user = await service.get_user_by_discord_id("discord2") 
+    })
+
+    with patch.object(IdentityService, '_read_users') as mock_read_users:
+        service = IdentityService(player_store, mock_browser)
+
+        found_user = await service.get_user_by_discord_id("discord2")
         assert found_user is not None
         assert found_user["player_name"] == "Player Two"
+        assert found_user["sdvx_id"] == "33334444"
 
-        not_found_user = await service.get_user_by_discord_id("discord3") 
+        not_found_user = await service.get_user_by_discord_id("discord3")
         assert not_found_user is None
+        # The lookup goes through the discord_id index, not a read of the whole roster.
+        mock_read_users.assert_not_called()
 
 @pytest.mark.asyncio
-async def test_force_unlink_success(users_file_path, mock_browser):
+async def test_force_unlink_success(player_store, mock_browser):
     """Tests that an admin can forcibly unlink a user."""
     initial_users = {
         "11112222": {"discord_id": "discord1_to_unlink", "player_name": "Player One"}
@@ -168,7 +176,7 @@ async def test_force_unlink_success(users_file_path, mock_browser):
     with patch.object(IdentityService, '_read_users', return_value=initial_users), \
          patch.object(IdentityService, '_write_users') as mock_write_users:
         
-        service = IdentityService(users_file_path, mock_browser)
+        service = IdentityService(player_store, mock_browser)
         result = await service.force_unlink("discord1_to_unlink") 
 
         assert result is True
@@ -176,23 +184,23 @@ async def test_force_unlink_success(users_file_path, mock_browser):
         assert written_data["11112222"]["discord_id"] is None
 
 @pytest.mark.asyncio
-async def test_force_unlink_user_not_found(users_file_path, mock_browser):
+async def test_force_unlink_user_not_found(player_store, mock_browser):
     """Tests that force_unlink returns False if the user isn't linked."""
     with patch.object(IdentityService, '_read_users', return_value={}), \
          patch.object(IdentityService, '_write_users') as mock_write_users:
 
-        service = IdentityService(users_file_path, mock_browser)
+        service = IdentityService(player_store, mock_browser)
         result = await service.force_unlink("non_existent_discord_id") 
 
         assert result is False
         mock_write_users.assert_not_called()
 
 @pytest.mark.asyncio
-async def test_link_user_profile_enrichment_success(users_file_path, mock_browser):
+async def test_link_user_profile_enrichment_success(player_store, mock_browser):
     """Test link_user enriches the user profile with scraped data (name only) on success."""
     with patch.object(IdentityService, '_read_users', return_value={}), \
          patch.object(IdentityService, '_write_users') as mock_write_users:
-        service = IdentityService(users_file_path, mock_browser)
+        service = IdentityService(player_store, mock_browser)
         mock_browser.scrape_player_profile.return_value = {
             "player_name": "EnrichedName", "recent_plays": [] 
         }
@@ -207,11 +215,11 @@ async def test_link_user_profile_enrichment_success(users_file_path, mock_browse
         mock_browser.scrape_player_profile.assert_awaited_once_with("87654321")
 
 @pytest.mark.asyncio
-async def test_link_user_profile_enrichment_scrape_fails(users_file_path, mock_browser):
+async def test_link_user_profile_enrichment_scrape_fails(player_store, mock_browser):
     """Test link_user still succeeds if scrape_player_profile fails (returns None/empty)."""
     with patch.object(IdentityService, '_read_users', return_value={}), \
          patch.object(IdentityService, '_write_users') as mock_write_users:
-        service = IdentityService(users_file_path, mock_browser)
+        service = IdentityService(player_store, mock_browser)
         mock_browser.scrape_player_profile.return_value = None
         result = await service.link_user(discord_id="discordY", sdvx_id="1111-2222") 
         assert result is True
@@ -224,8 +232,8 @@ async def test_link_user_profile_enrichment_scrape_fails(users_file_path, mock_b
         mock_browser.scrape_player_profile.assert_awaited_once_with("11112222")
 
 @pytest.mark.asyncio
-async def test_update_player_cache_enrich_existing_users(users_file_path, mock_browser):
-    """Test update_player_cache updates existing users from leaderboard and gets recent_plays from profile."""
+async def test_refresh_jobs_enrich_existing_users(player_store, mock_browser):
+    """The leaderboard job updates existing users and the profile sweep gets their recent_plays."""
     initial_users = {
         "10000001": {"sdvx_id": "10000001", "discord_id": "d1", "player_name": "OldA", "volforce": 9.0, "rank": 5}
     }
@@ -245,8 +253,9 @@ async def test_update_player_cache_enrich_existing_users(users_file_path, mock_b
     mock_browser.scrape_player_profile.side_effect = AsyncMock(side_effect=profile_scrape_side_effect)
     with patch.object(IdentityService, '_read_users', return_value=initial_users.copy()), \
          patch.object(IdentityService, '_write_users') as mock_write_users:
-        service = IdentityService(users_file_path, mock_browser)
-        new_players = await service.update_player_cache()
+        service = IdentityService(player_store, mock_browser)
+        new_players = await service.refresh_leaderboard()
+        await service.refresh_profiles()
         
         assert new_players == ["C_new"] # Only 'C_new' is new from leaderboard
         
@@ -270,8 +279,8 @@ async def test_update_player_cache_enrich_existing_users(users_file_path, mock_b
 
 
 @pytest.mark.asyncio
-async def test_update_player_cache_enrich_existing_users_scrape_fails(users_file_path, mock_browser):
-    """Test update_player_cache preserves old data if profile scrape fails for a user."""
+async def test_refresh_jobs_enrich_existing_users_scrape_fails(player_store, mock_browser):
+    """The profile sweep preserves old data if profile scrape fails for a user."""
     initial_users = {
         "10000001": {"sdvx_id": "10000001", "discord_id": "d1", "player_name": "OldA", "volforce": 9.0, "rank": 1, "recent_plays": [{"song_title": "OldSong", "is_new_record": False}]},
         "10000002": {"sdvx_id": "10000002", "discord_id": "d2", "player_name": "OldB", "volforce": 8.0, "rank": 2, "recent_plays": []}
@@ -290,8 +299,9 @@ async def test_update_player_cache_enrich_existing_users_scrape_fails(users_file
     mock_browser.scrape_player_profile.side_effect = AsyncMock(side_effect=profile_scrape_side_effect)
     with patch.object(IdentityService, '_read_users', return_value=initial_users.copy()), \
          patch.object(IdentityService, '_write_users') as mock_write_users:
-        service = IdentityService(users_file_path, mock_browser)
-        new_players = await service.update_player_cache()
+        service = IdentityService(player_store, mock_browser)
+        new_players = await service.refresh_leaderboard()
+        await service.refresh_profiles()
         assert new_players == [] 
         written_data = mock_write_users.call_args[0][0]
         # User 1 should be updated from leaderboard (VF/Rank) and profile (name, recent_plays)
@@ -305,4 +315,289 @@ async def test_update_player_cache_enrich_existing_users_scrape_fails(users_file
         assert written_data["10000002"]["volforce"] == 11.0 
         assert written_data["10000002"]["rank"] == 2 
         assert written_data["10000002"]["recent_plays"] == initial_users["10000002"]["recent_plays"]
-        assert mock_browser.scrape_player_profile.await_count == len(initial_users)
\ No newline at end of file
+        assert mock_browser.scrape_player_profile.await_count == len(initial_users)
+
+@pytest.mark.asyncio
+async def test_refresh_profiles_bounds_profile_scrape_concurrency(player_store, mock_browser):
+    """The profile sweep fans scrapes out, but never more than scrape_concurrency at once."""
+    initial_users = {f"1000000{i}": {"sdvx_id": f"1000000{i}", "discord_id": None} for i in range(6)}
+    mock_browser.scrape_leaderboard.return_value = []
+    in_flight, peak = 0, 0
+
+    async def slow_scrape(sdvx_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"player_name": f"P{sdvx_id}", "recent_plays": []}
+
+    mock_browser.scrape_player_profile.side_effect = slow_scrape
+    with patch.object(IdentityService, '_read_users', return_value=initial_users), \
+         patch.object(IdentityService, '_write_users') as mock_write_users:
+        service = IdentityService(player_store, mock_browser, scrape_concurrency=2)
+        await service.refresh_profiles()
+
+    assert peak == 2
+    written_data = mock_write_users.call_args[0][0]
+    assert all(written_data[sdvx_id]["player_name"] == f"P{sdvx_id}" for sdvx_id in initial_users)
+
+
+@pytest.mark.asyncio
+async def test_refresh_profiles_scrapes_only_due_players(player_store, mock_browser):
+    """With a tracking policy, only the players it selects are scraped; new plays promote a player."""
+    from bot.core.tracking_policy import TrackingPolicy
+    initial_users = {
+        "10000001": {"sdvx_id": "10000001", "discord_id": "d1", "recent_plays": [{"timestamp": "old"}]},
+        "10000002": {"sdvx_id": "10000002", "discord_id": None, "recent_plays": []},
+    }
+    mock_browser.scrape_leaderboard.return_value = []
+    mock_browser.scrape_player_profile.return_value = {"player_name": "P", "recent_plays": [{"timestamp": "new"}]}
+    policy = MagicMock(spec=TrackingPolicy)
+    policy.select_due.return_value = ["10000001"]
+
+    with patch.object(IdentityService, '_read_users', return_value=initial_users), \
+         patch.object(IdentityService, '_write_users') as mock_write_users:
+        service = IdentityService(player_store, mock_browser, tracking_policy=policy)
+        await service.refresh_profiles(active_discord_ids={"d1"})
+
+    assert policy.select_due.call_args[0][1] == {"d1"}
+    mock_browser.scrape_player_profile.assert_awaited_once_with("10000001")
+    policy.record_scrape.assert_called_once()
+    policy.record_activity.assert_called_once()
+    written_data = mock_write_users.call_args[0][0]
+    assert written_data["10000002"]["recent_plays"] == []
+
+@pytest.mark.asyncio
+async def test_refresh_profiles_applies_results_to_a_fresh_read(player_store, mock_browser):
+    """Profile sweeps scrape outside the lock, so a link made meanwhile must survive the write."""
+    before = {"10000001": {"sdvx_id": "10000001", "discord_id": None}}
+    after_link = {"10000001": {"sdvx_id": "10000001", "discord_id": "d1"}}
+    mock_browser.scrape_player_profile.return_value = {"player_name": "P", "recent_plays": [{"timestamp": "t"}]}
+
+    with patch.object(IdentityService, '_read_users', side_effect=[before, after_link]), \
+         patch.object(IdentityService, '_write_users') as mock_write_users:
+        service = IdentityService(player_store, mock_browser)
+        await service.refresh_profiles()
+
+    mock_browser.scrape_leaderboard.assert_not_awaited()
+    written_data = mock_write_users.call_args[0][0]
+    assert written_data["10000001"]["discord_id"] == "d1"
+    assert written_data["10000001"]["recent_plays"] == [{"timestamp": "t"}]
+
+@pytest.mark.asyncio
+async def test_refresh_profiles_skips_the_write_when_nothing_changed(player_store, mock_browser):
+    stored = {"10000001": {"sdvx_id": "10000001", "player_name": "P", "total_plays": 5, "recent_plays": [{"timestamp": "t"}], "last_updated": "then"}}
+    mock_browser.scrape_player_profile.return_value = {"player_name": "P", "skill_level": None, "total_plays": 5, "recent_plays": [{"timestamp": "t"}]}
+
+    with patch.object(IdentityService, '_read_users', side_effect=lambda: json.loads(json.dumps(stored))), \
+         patch.object(IdentityService, '_write_users') as mock_write_users:
+        service = IdentityService(player_store, mock_browser)
+        await service.refresh_profiles()
+        mock_write_users.assert_not_awaited()
+
+        mock_browser.scrape_player_profile.return_value = {"player_name": "P", "total_plays": 6, "recent_plays": [{"timestamp": "u"}]}
+        await service.refresh_profiles()
+
+    assert mock_write_users.call_args[0][0]["10000001"]["total_plays"] == 6
+    assert service.profile_outcomes == {"updated": 1, "unchanged": 1, "failed": 0}
+
+@pytest.mark.asyncio
+async def test_refresh_leaderboard_does_not_scrape_profiles(player_store, mock_browser):
+    mock_browser.scrape_leaderboard.return_value = [{"rank": 1, "sdvx_id": "1000-0001", "player_name": "A", "volforce": 20.0}]
+    with patch.object(IdentityService, '_read_users', return_value={}), \
+         patch.object(IdentityService, '_write_users') as mock_write_users:
+        service = IdentityService(player_store, mock_browser)
+        new_players = await service.refresh_leaderboard()
+
+    assert new_players == ["A"]
+    mock_browser.scrape_player_profile.assert_not_awaited()
+    assert mock_write_users.call_args[0][0]["10000001"]["volforce"] == 20.0
+
+@pytest.mark.asyncio
+async def test_link_user_links_without_name_when_scrape_times_out(player_store, mock_browser):
+    from bot.eagle_errors import ScrapeTimeoutError
+    mock_browser.scrape_player_profile.side_effect = ScrapeTimeoutError("too slow")
+    with patch.object(IdentityService, '_read_users', return_value={}), \
+         patch.object(IdentityService, '_write_users') as mock_write_users:
+        service = IdentityService(player_store, mock_browser)
+        assert await service.link_user("999", "12345678") is True
+
+    written_data = mock_write_users.call_args[0][0]
+    assert written_data["12345678"]["discord_id"] == "999"
+    assert "player_name" not in written_data["12345678"]
+
+@pytest.mark.asyncio
+async def test_refresh_player_profile_stores_fresh_plays(player_store, mock_browser):
+    player_store.save_players({"10000001": {"sdvx_id": "10000001", "discord_id": "d1", "recent_plays": [{"timestamp": "old"}]}})
+    mock_browser.scrape_player_profile.return_value = {"player_name": "P", "recent_plays": [{"timestamp": "new"}]}
+    with patch.object(IdentityService, '_write_users') as mock_write_users:
+        service = IdentityService(player_store, mock_browser)
+        profile = await service.refresh_player_profile("d1")
+        assert await service.refresh_player_profile("unknown") is None
+
+    mock_browser.scrape_player_profile.assert_awaited_once_with("10000001")
+    assert profile["recent_plays"] == [{"timestamp": "new"}]
+    mock_write_users.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_refresh_player_profile_falls_back_to_cache_on_failure(player_store, mock_browser):
+    player_store.save_players({"10000001": {"sdvx_id": "10000001", "discord_id": "d1", "recent_plays": [{"timestamp": "old"}]}})
+    mock_browser.scrape_player_profile.side_effect = TimeoutError()
+    with patch.object(IdentityService, '_write_users') as mock_write_users:
+        service = IdentityService(player_store, mock_browser)
+        profile = await service.refresh_player_profile("d1")
+
+    assert profile["recent_plays"] == [{"timestamp": "old"}]
+    mock_write_users.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_sweep_scrapes_session_players_at_active_session_priority(player_store, mock_browser):
+    from bot.scrape_queue import _scrape_context, PRIORITY_ACTIVE_SESSION, PRIORITY_BACKGROUND
+    users = {
+        "10000001": {"sdvx_id": "10000001", "discord_id": "d1"},
+        "10000002": {"sdvx_id": "10000002", "discord_id": "d2"},
+    }
+    priorities = {}
+
+    async def record_priority(sdvx_id):
+        priorities[sdvx_id] = _scrape_context.get()[0]
+        return {}
+
+    mock_browser.scrape_player_profile.side_effect = record_priority
+    with patch.object(IdentityService, '_read_users', return_value=users), \
+         patch.object(IdentityService, '_write_users'):
+        service = IdentityService(player_store, mock_browser)
+        await service.refresh_profiles(active_discord_ids={"d1"})
+
+    assert priorities == {"10000001": PRIORITY_ACTIVE_SESSION, "10000002": PRIORITY_BACKGROUND}
+
+@pytest.mark.asyncio
+async def test_sweep_continues_past_unreadable_profiles(player_store, mock_browser):
+    from bot.eagle_errors import ProfileNotFoundError
+    users = {
+        "10000001": {"sdvx_id": "10000001", "discord_id": None},
+        "10000002": {"sdvx_id": "10000002", "discord_id": None},
+    }
+
+    async def scrape(sdvx_id):
+        if sdvx_id == "10000001":
+            raise ProfileNotFoundError(sdvx_id)
+        return {"player_name": "P", "recent_plays": []}
+
+    mock_browser.scrape_player_profile.side_effect = scrape
+    with patch.object(IdentityService, '_read_users', return_value=users), \
+         patch.object(IdentityService, '_write_users') as mock_write_users:
+        service = IdentityService(player_store, mock_browser)
+        await service.refresh_profiles()
+
+    written_data = mock_write_users.call_args[0][0]
+    assert written_data["10000002"]["player_name"] == "P"
+    assert "player_name" not in written_data["10000001"]
+
+@pytest.mark.asyncio
+async def test_sweep_skips_players_behind_open_circuit_breaker(player_store, mock_browser):
+    from bot.eagle_errors import CircuitOpenError
+    users = {
+        "10000001": {"sdvx_id": "10000001", "discord_id": None, "last_updated": "old"},
+        "10000002": {"sdvx_id": "10000002", "discord_id": None},
+    }
+
+    async def scrape(sdvx_id):
+        if sdvx_id == "10000001":
+            raise CircuitOpenError("player 10000001 circuit breaker is open")
+        return {"player_name": "P", "recent_plays": []}
+
+    mock_browser.scrape_player_profile.side_effect = scrape
+    with patch.object(IdentityService, '_read_users', return_value=users), \
+         patch.object(IdentityService, '_write_users') as mock_write_users:
+        service = IdentityService(player_store, mock_browser)
+        await service.refresh_profiles()
+
+    written_data = mock_write_users.call_args[0][0]
+    assert written_data["10000001"]["last_updated"] == "old"
+    assert service.profile_outcomes == {"updated": 1, "unchanged": 0, "failed": 0}
+
+@pytest.mark.asyncio
+async def test_refresh_profiles_isolates_each_players_failure(player_store, mock_browser):
+    from bot.eagle_errors import SessionExpiredError, ScrapeTimeoutError
+    users = {sdvx_id: {"sdvx_id": sdvx_id, "discord_id": None} for sdvx_id in ("10000001", "10000002", "10000003", "10000004", "10000005")}
+
+    async def scrape(sdvx_id):
+        if sdvx_id == "10000002":
+            raise ValueError("malformed Score Log row")
+        if sdvx_id == "10000003":
+            raise SessionExpiredError("redirected to login")
+        if sdvx_id == "10000004":
+            raise ScrapeTimeoutError("deadline passed")
+        if sdvx_id == "10000005":
+            return {}
+        return {"player_name": "P", "recent_plays": []}
+
+    mock_browser.scrape_leaderboard.return_value = []
+    mock_browser.scrape_player_profile.side_effect = scrape
+    with patch.object(IdentityService, '_read_users', return_value=users), \
+         patch.object(IdentityService, '_write_users') as mock_write_users:
+        service = IdentityService(player_store, mock_browser)
+        await service.refresh_profiles()
+
+    written_data = mock_write_users.call_args[0][0]
+    assert written_data["10000001"]["player_name"] == "P"
+    assert service.last_sweep["results"] == {"ok": 1, "parse_error": 1, "auth_expired": 1, "timeout": 2}
+    assert service.sweep_results["timeout"] == 2
+
+@pytest.mark.asyncio
+async def test_profile_the_store_cannot_take_leaves_player_unchanged(player_store, mock_browser):
+    users = {
+        "10000001": {"sdvx_id": "10000001", "discord_id": None, "player_name": "Old"},
+        "10000002": {"sdvx_id": "10000002", "discord_id": None},
+    }
+
+    async def scrape(sdvx_id):
+        if sdvx_id == "10000001":
+            # recent_plays entries must be dicts; a bare string breaks the change check.
+            return {"player_name": "New", "recent_plays": ["garbage"]}
+        return {"player_name": "P", "recent_plays": []}
+
+    mock_browser.scrape_player_profile.side_effect = scrape
+    users["10000001"]["recent_plays"] = [{"song": "A"}]
+    with patch.object(IdentityService, '_read_users', return_value=users), \
+         patch.object(IdentityService, '_write_users') as mock_write_users, \
+         patch("bot.core.identity_service.play_fingerprint", side_effect=lambda play: play["song"]):
+        service = IdentityService(player_store, mock_browser, tracking_policy=MagicMock(select_due=MagicMock(return_value=["10000001", "10000002"])))
+        await service.refresh_profiles()
+
+    written_data = mock_write_users.call_args[0][0]
+    assert written_data["10000001"]["player_name"] == "Old"
+    assert written_data["10000002"]["player_name"] == "P"
+    assert service.profile_outcomes == {"updated": 1, "unchanged": 0, "failed": 1}
+
+@pytest.mark.asyncio
+async def test_link_user_keeps_profiles_stored_while_it_scraped(player_store, mock_browser):
+    """link_user scrapes outside the lock and writes back only the players it touched."""
+    player_store.save_players({
+        "11111111": {"sdvx_id": "11111111", "discord_id": None, "recent_plays": []},
+        "22222222": {"sdvx_id": "22222222", "discord_id": None},
+    })
+    service = IdentityService(player_store, mock_browser)
+    scraping = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_scrape(sdvx_id):
+        scraping.set()
+        await release.wait()
+        return {"player_name": "Two"}
+    mock_browser.scrape_player_profile.side_effect = slow_scrape
+
+    link = asyncio.create_task(service.link_user("discord2", "22222222"))
+    await scraping.wait()
+    # A sweep stores player one's new plays while the link is still scraping.
+    users = await service._read_users()
+    users["11111111"]["recent_plays"] = [{"timestamp": "t"}]
+    await service._write_users(users)
+    release.set()
+    assert await link is True
+
+    assert service.players.get("11111111")["recent_plays"] == [{"timestamp": "t"}]
+    assert service.players.get("22222222")["discord_id"] == "discord2"
+    await service.players.close()
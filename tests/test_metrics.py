@@ -0,0 +1,31 @@
+# tests/test_metrics.py
+from bot.utils.metrics import StageStats
+
+
+def test_stage_stats_throughput_and_latency():
+    stats = StageStats("parse", window_seconds=60)
+    clock = {"now": 100.0}
+    stats._now = lambda: clock["now"]
+
+    for _ in range(4):
+        clock["now"] += 0.5
+        stats.record(0.25)
+    snapshot = stats.snapshot()
+
+    assert snapshot["count"] == 4
+    assert snapshot["avg_ms"] == 250.0
+    assert snapshot["per_busy_second"] == 4.0
+    # 4 pages between t=100.25 (first start) and t=102.0
+    assert abs(snapshot["per_second"] - 4 / 1.75) < 1e-9
+
+
+def test_stage_stats_window_drops_old_samples():
+    stats = StageStats("fetch", window_seconds=10)
+    clock = {"now": 0.0}
+    stats._now = lambda: clock["now"]
+    stats.record(1.0, ok=False)
+    clock["now"] = 100.0
+
+    snapshot = stats.snapshot()
+    assert snapshot["count"] == 1 and snapshot["failures"] == 1
+    assert snapshot["per_second"] == 0.0
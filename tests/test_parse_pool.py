@@ -0,0 +1,31 @@
+# tests/test_parse_pool.py
+import pathlib
+import pytest
+from unittest.mock import patch
+
+from bot import parse_pool
+from bot.parse_pool import ParsePool
+from bot.eagle_parser import parse_profile_html
+from bot.utils.metrics import StageStats
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+
+
+@pytest.mark.asyncio
+async def test_run_parse_in_process_pool_matches_inline_parse():
+    html = (FIXTURES / "eagle_profile.html").read_text(encoding="utf-8")
+    stats = StageStats("parse")
+    pool = ParsePool(workers=1)
+    try:
+        result = await pool.run(parse_profile_html, html, "95688187", stats=stats)
+    finally:
+        pool.shutdown()
+    assert result == parse_profile_html(html, "95688187")
+    assert stats.count == 1
+
+
+@pytest.mark.asyncio
+async def test_run_parse_without_pool_uses_a_thread():
+    with patch.object(parse_pool, "ProcessPoolExecutor") as mock_executor:
+        assert await ParsePool(workers=0).run(sorted, [3, 1, 2]) == [1, 2, 3]
+    mock_executor.assert_not_called()
@@ -1,34 +1,38 @@
 import pytest
-from unittest.mock import patch
 from bot.core.performance_service import PerformanceService
+from bot.player_store import PlayerStore
 
 @pytest.fixture
-def service():
-    return PerformanceService("fake_users.json")
+def store(tmp_path):
+    store = PlayerStore(str(tmp_path / "eagle.db"))
+    yield store
+    store.close()
 
-def test_get_player_stats_from_cache_found(service):
-    mock_users = {"1234": {"sdvx_id": "1234", "name": "Alice"}}
-    with patch.object(service, "_read_users", return_value=mock_users):
-        result = service.get_player_stats_from_cache("1234")
-        assert result == {"sdvx_id": "1234", "name": "Alice"}
+@pytest.fixture
+def service(store):
+    return PerformanceService(store)
+
+def test_get_player_stats_from_cache_found(service, store):
+    store.save_players({"1234": {"sdvx_id": "1234", "name": "Alice"}})
+    result = service.get_player_stats_from_cache("1234")
+    assert result == {"sdvx_id": "1234", "discord_id": None, "name": "Alice", "recent_plays": []}
 
-def test_get_player_stats_from_cache_not_found(service):
-    mock_users = {"5678": {"sdvx_id": "5678", "name": "Bob"}}
-    with patch.object(service, "_read_users", return_value=mock_users):
-        result = service.get_player_stats_from_cache("9999")
-        assert result is None
+def test_get_player_stats_from_cache_not_found(service, store):
+    store.save_players({"5678": {"sdvx_id": "5678", "name": "Bob"}})
+    result = service.get_player_stats_from_cache("9999")
+    assert result is None
 
-def test_get_arcade_leaderboard_from_cache(service):
+def test_get_arcade_leaderboard_from_cache(service, store):
     mock_users = {
-        str(i): {"sdvx_id": str(i), "rank": i, "name": f"User{i}"} for i in range(1, 13)
+        str(i): {"sdvx_id": str(i), "rank": 13 - i, "name": f"User{i}"} for i in range(1, 13)
     }
     mock_users["no_rank"] = {"sdvx_id": "no_rank", "name": "NoRank"}  # No 'rank' key
-    with patch.object(service, "_read_users", return_value=mock_users):
-        result = service.get_arcade_leaderboard_from_cache()
-        assert len(result) == 10
-        assert all("rank" in user for user in result)
-        assert result == sorted(result, key=lambda u: u["rank"])
-        assert all(user["sdvx_id"] != "no_rank" for user in result)
+    store.save_players(mock_users)
+    result = service.get_arcade_leaderboard_from_cache()
+    assert len(result) == 10
+    assert all("rank" in user for user in result)
+    assert result == sorted(result, key=lambda u: u["rank"])
+    assert all(user["sdvx_id"] != "no_rank" for user in result)
 
 def test_analyze_new_scores_for_records(service):
     plays = [
@@ -0,0 +1,102 @@
+# tests/test_player_cache.py
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from bot.player_cache import PlayerCache
+from bot.player_store import PlayerStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PlayerStore(str(tmp_path / "eagle.db"))
+    store.save_players({
+        "10000001": {"sdvx_id": "10000001", "discord_id": "d1", "player_name": "P1", "rank": 2},
+        "10000002": {"sdvx_id": "10000002", "discord_id": None, "player_name": "P2", "rank": 1},
+    })
+    yield store
+    store.close()
+
+
+def test_reads_come_from_memory_after_load(store):
+    cache = PlayerCache(store)
+    cache.load()
+    store.load_players = MagicMock()
+
+    assert cache.get_by_discord_id("d1")["player_name"] == "P1"
+    assert cache.get("10000002")["player_name"] == "P2"
+    assert [p["sdvx_id"] for p in cache.leaderboard()] == ["10000002", "10000001"]
+    store.load_players.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reads_hand_out_copies(store):
+    cache = PlayerCache(store)
+    cache.get("10000001")["player_name"] = "changed"
+    cache.snapshot()["10000001"]["discord_id"] = "d9"
+
+    assert cache.get("10000001")["player_name"] == "P1"
+    assert cache.get_by_discord_id("d9") is None
+    assert cache.pending_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_relinking_moves_the_discord_index(store):
+    cache = PlayerCache(store, flush_seconds=60)
+    users = cache.snapshot()
+    users["10000001"]["discord_id"] = None
+    users["10000002"]["discord_id"] = "d1"
+
+    assert cache.put_many(users) == 2
+    assert cache.get_by_discord_id("d1")["sdvx_id"] == "10000002"
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_changes_are_written_behind_in_one_batch(store):
+    cache = PlayerCache(store, flush_seconds=0.01)
+    saves = []
+    original_save = store.save_players
+    store.save_players = lambda batch: saves.append(sorted(batch)) or original_save(batch)
+
+    for rank, sdvx_id in ((5, "10000001"), (6, "10000002"), (7, "10000001")):
+        player = cache.get(sdvx_id)
+        player["rank"] = rank
+        cache.put_many({sdvx_id: player})
+    assert saves == []
+    assert cache.pending_count() == 2
+
+    await asyncio.sleep(0.05)
+    assert saves == [["10000001", "10000002"]]
+    assert cache.pending_count() == 0
+    assert store.load_players()["10000001"]["rank"] == 7
+    assert [p["rank"] for p in cache.leaderboard()] == [6, 7]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_players_are_not_written(store):
+    cache = PlayerCache(store, flush_seconds=60)
+    assert cache.put_many(cache.snapshot()) == 0
+    assert cache.pending_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_close_writes_pending_changes_now(store):
+    cache = PlayerCache(store, flush_seconds=60)
+    cache.put_many({"10000003": {"sdvx_id": "10000003", "discord_id": "d3"}})
+
+    await cache.close()
+
+    assert store.load_players()["10000003"]["discord_id"] == "d3"
+    assert cache.flushes == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_write_keeps_players_dirty(store):
+    cache = PlayerCache(store, flush_seconds=60)
+    cache.put_many({"10000003": {"sdvx_id": "10000003"}})
+    store.save_players = MagicMock(side_effect=OSError("disk full"))
+
+    await cache.close()
+
+    assert cache.pending_count() == 1
@@ -0,0 +1,68 @@
+# tests/test_player_store.py
+import json
+import pytest
+
+from bot.player_store import PlayerStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PlayerStore(str(tmp_path / "data" / "eagle.db"))
+    yield store
+    store.close()
+
+
+def test_players_round_trip_with_plays_and_extra_fields(store):
+    plays = [{"song_title": "A", "score": 9900000}, {"song_title": "B", "score": 9800000}]
+    store.save_players({
+        "10000001": {"sdvx_id": "10000001", "discord_id": "d1", "player_name": "P1", "rank": 2, "volforce": 17.25,
+                     "skill_level": "8", "total_plays": 120, "last_updated": "2025-01-01T00:00:00+00:00",
+                     "recent_plays": plays, "note": "kept"},
+        "10000002": {"sdvx_id": "10000002", "player_name": "P2"},
+    })
+
+    players = store.load_players()
+    assert players["10000001"] == {
+        "sdvx_id": "10000001", "discord_id": "d1", "player_name": "P1", "rank": 2, "volforce": 17.25,
+        "skill_level": "8", "total_plays": 120, "last_updated": "2025-01-01T00:00:00+00:00",
+        "recent_plays": plays, "note": "kept",
+    }
+    assert players["10000002"] == {"sdvx_id": "10000002", "discord_id": None, "player_name": "P2", "recent_plays": []}
+
+
+def test_save_writes_only_changed_players_in_one_batch(store):
+    store.save_players({str(i): {"sdvx_id": str(i), "rank": i} for i in range(100)})
+    players = store.load_players()
+    players["5"]["volforce"] = 16.0
+    players["7"]["recent_plays"] = [{"song_title": "C"}]
+
+    assert store.save_players(players) == 2
+    assert store.rows_skipped == 98
+    assert store.load_players()["7"]["recent_plays"] == [{"song_title": "C"}]
+
+
+def test_database_uses_wal_journal(store):
+    assert store._connect().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_import_users_json(store, tmp_path):
+    users_file = tmp_path / "users.json"
+    users_file.write_text(json.dumps({
+        "10000001": {"sdvx_id": "10000001", "discord_id": "d1", "player_name": "P1", "recent_plays": [{"song_title": "A"}]},
+        "10000002": {"sdvx_id": "10000002", "rank": 1},
+    }))
+
+    assert store.is_empty()
+    assert store.import_users_json(str(users_file)) == 2
+    assert not store.is_empty()
+    assert store.load_players()["10000001"]["recent_plays"] == [{"song_title": "A"}]
+    assert store.import_users_json(str(tmp_path / "missing.json")) == 0
+
+
+def test_record_session_adds_to_history(store):
+    for end_time in ("2025-06-15T12:00:00+00:00", "2025-06-16T12:00:00+00:00"):
+        store.record_session({"discord_id": "d1", "sdvx_id": "10000001", "type": "auto", "start_time": None,
+                              "end_time": end_time, "songs_played": 5, "initial_volforce": 15.0, "final_volforce": 15.1})
+
+    rows = store._connect().execute("SELECT end_time, songs_played FROM sessions WHERE discord_id = ? ORDER BY id", ("d1",)).fetchall()
+    assert [tuple(row) for row in rows] == [("2025-06-15T12:00:00+00:00", 5), ("2025-06-16T12:00:00+00:00", 5)]
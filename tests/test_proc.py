@@ -0,0 +1,60 @@
+# tests/test_proc.py
+import os
+import subprocess
+import sys
+import time
+import pytest
+
+from bot.utils.proc import process_tree, kill_process_tree, tree_rss
+
+pytestmark = pytest.mark.skipif(not os.path.isdir("/proc") or sys.platform != "linux", reason="needs /proc")
+
+
+def wait_for_children(pid: int, count: int) -> list:
+    for _ in range(100):
+        tree = process_tree(pid)
+        if len(tree) > count:
+            return tree
+        time.sleep(0.02)
+    return process_tree(pid)
+
+
+def is_running(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return False
+
+
+def test_kill_process_tree_kills_descendants():
+    parent = subprocess.Popen(["sh", "-c", "sleep 30 & sleep 30 & wait"])
+    try:
+        tree = wait_for_children(parent.pid, 2)
+        assert tree[0] == parent.pid and len(tree) == 3
+        assert kill_process_tree(parent.pid) == 3
+        parent.wait(timeout=5)
+        for _ in range(100):
+            if not any(is_running(pid) for pid in tree[1:]):
+                break
+            time.sleep(0.02)
+        else:
+            pytest.fail("children survived kill_process_tree")
+    finally:
+        if parent.poll() is None:
+            parent.kill()
+
+def test_process_tree_of_missing_pid_is_just_the_pid():
+    assert process_tree(2 ** 22 + 1) == [2 ** 22 + 1]
+    assert kill_process_tree(2 ** 22 + 1) == 0
+
+def test_tree_rss_sums_the_process_tree():
+    parent = subprocess.Popen(["sh", "-c", "sleep 30 & wait"])
+    try:
+        wait_for_children(parent.pid, 1)
+        rss_bytes, processes = tree_rss(parent.pid)
+        assert processes == 2
+        assert rss_bytes > 0
+    finally:
+        kill_process_tree(parent.pid)
+        parent.wait(timeout=5)
@@ -0,0 +1,136 @@
+# tests/test_profile_cache.py
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from bot.eagle_errors import ProfileNotFoundError, SessionExpiredError
+from bot.profile_cache import ProfileCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def cache():
+    cache = ProfileCache(ttl_seconds=30, max_entries=2)
+    cache._now = FakeClock()
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_hit_within_ttl_and_miss_after(cache):
+    fetch = AsyncMock(return_value={"player_name": "P"})
+
+    assert await cache.get_or_fetch("1", fetch) == {"player_name": "P"}
+    assert await cache.get_or_fetch("1", fetch) == {"player_name": "P"}
+    assert fetch.await_count == 1
+
+    cache._now.now += 31
+    await cache.get_or_fetch("1", fetch)
+    assert fetch.await_count == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_max_age_forces_a_fresher_scrape(cache):
+    fetch = AsyncMock(return_value={"player_name": "P"})
+    await cache.get_or_fetch("1", fetch)
+    cache._now.now += 10
+
+    await cache.get_or_fetch("1", fetch, max_age=5)
+    assert fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction(cache):
+    fetch = AsyncMock(side_effect=lambda: {"player_name": "P"})
+    await cache.get_or_fetch("1", fetch)
+    await cache.get_or_fetch("2", fetch)
+    await cache.get_or_fetch("1", fetch)  # "2" is now least recently used
+    await cache.get_or_fetch("3", fetch)
+
+    assert cache.get("1") is not None
+    assert cache.get("2") is None
+    assert cache.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_scrape(cache):
+    gate = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await gate.wait()
+        return {"player_name": "P", "recent_plays": []}
+
+    tasks = [asyncio.create_task(cache.get_or_fetch("1", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == 1
+    assert cache.misses == 1 and cache.coalesced == 4
+    # Each caller gets its own copy.
+    results[0]["recent_plays"].append("mutated")
+    assert results[1]["recent_plays"] == []
+
+
+@pytest.mark.asyncio
+async def test_empty_results_and_errors_are_not_cached(cache):
+    assert await cache.get_or_fetch("1", AsyncMock(return_value={})) == {}
+    with pytest.raises(RuntimeError):
+        await cache.get_or_fetch("1", AsyncMock(side_effect=RuntimeError("boom")))
+    assert cache.get("1") is None
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_scrape_cancelled_when_last_waiter_leaves(cache):
+    started, cancelled = asyncio.Event(), asyncio.Event()
+
+    async def fetch():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.create_task(cache.get_or_fetch("1", fetch))
+    await started.wait()
+    waiter.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert "1" not in cache._in_flight
+
+
+@pytest.mark.asyncio
+async def test_known_bad_ids_are_negatively_cached(cache):
+    cache.negative_ttl_seconds = 600
+    fetch = AsyncMock(side_effect=ProfileNotFoundError("gone"))
+    for _ in range(3):
+        with pytest.raises(ProfileNotFoundError):
+            await cache.get_or_fetch("1", fetch)
+    assert fetch.await_count == 1
+    assert cache.negative_hits == 2
+
+    cache._now.now += 601
+    fetch.side_effect = None
+    fetch.return_value = {"player_name": "P"}
+    assert await cache.get_or_fetch("1", fetch) == {"player_name": "P"}
+    assert cache.stats()["negative_entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_session_expiry_is_not_negatively_cached(cache):
+    fetch = AsyncMock(side_effect=SessionExpiredError("login"))
+    for _ in range(2):
+        with pytest.raises(SessionExpiredError):
+            await cache.get_or_fetch("1", fetch)
+    assert fetch.await_count == 2
@@ -0,0 +1,97 @@
+# tests/test_rate_limiter.py
+import aiohttp
+import pytest
+from aiohttp import web
+
+from bot.eagle_http import EagleHttpClient
+from bot.rate_limiter import RateLimiter, BACKOFF_COOLDOWN_SECONDS
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def limiter():
+    limiter = RateLimiter(rate=2.0, burst=3, min_rate=0.25, slow_seconds=5.0)
+    limiter._now = Clock()
+    return limiter
+
+
+def test_burst_is_free_then_requests_are_spaced(limiter):
+    delays = [limiter.reserve() for _ in range(5)]
+    assert delays[:3] == [0.0, 0.0, 0.0]
+    assert delays[3:] == pytest.approx([0.5, 1.0])
+    assert limiter.stats()["delayed"] == 2
+
+def test_bucket_refills_over_time(limiter):
+    for _ in range(3):
+        limiter.reserve()
+    limiter._now.now += 10
+    assert [limiter.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+@pytest.mark.parametrize("report", [
+    {"seconds": 0.5, "status": 503},
+    {"seconds": 0.5, "status": 429},
+    {"seconds": 0.5, "challenge": True},
+    {"seconds": 6.0},
+])
+def test_trouble_halves_the_rate(limiter, report):
+    limiter.report(**report)
+    assert limiter.rate == 1.0
+    assert limiter.stats()["backoffs"] == 1
+
+def test_concurrent_failures_back_off_once(limiter):
+    for _ in range(4):
+        limiter.report(0.5, status=500)
+    assert limiter.rate == 1.0
+    limiter._now.now += BACKOFF_COOLDOWN_SECONDS
+    limiter.report(0.5, status=500)
+    limiter._now.now += BACKOFF_COOLDOWN_SECONDS
+    limiter.report(0.5, status=500)
+    limiter._now.now += BACKOFF_COOLDOWN_SECONDS
+    limiter.report(0.5, status=500)
+    assert limiter.rate == 0.25  # floor
+
+def test_fast_responses_recover_the_rate(limiter):
+    limiter.report(0.5, status=500)
+    for _ in range(10):
+        limiter.report(0.5)
+    assert limiter.rate == 2.0
+
+def test_retry_after_pauses_every_request(limiter):
+    limiter.report(0.1, status=429, retry_after=30)
+    assert limiter.reserve() == pytest.approx(30.0)
+
+def test_zero_rate_disables_limiting():
+    limiter = RateLimiter(rate=0)
+    assert [limiter.reserve() for _ in range(10)] == [0.0] * 10
+
+@pytest.mark.asyncio
+async def test_http_client_reports_throttling():
+    async def throttled(request):
+        return web.Response(status=429, headers={"Retry-After": "12"}, text="slow down")
+
+    app = web.Application()
+    app.router.add_get("/arcade/94", throttled)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    limiter = RateLimiter(rate=50.0, burst=5)
+    client = EagleHttpClient(rate_limiter=limiter)
+    try:
+        with pytest.raises(aiohttp.ClientResponseError):
+            await client.fetch_html(f"http://localhost:{port}/arcade/94")
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+    assert limiter.rate == 25.0
+    assert limiter.reserve() > 11
@@ -0,0 +1,137 @@
+# tests/test_scheduler.py
+import asyncio
+import pytest
+
+from bot.utils.scheduler import JobScheduler, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
+
+
+def make_scheduler(*jobs, lag_threshold: float = 10.0) -> JobScheduler:
+    scheduler = JobScheduler(lag_threshold_seconds=lag_threshold)
+    for name, func, interval, priority in jobs:
+        scheduler.add_job(name, func, interval, priority=priority)
+    for job in scheduler.jobs:
+        job.slot = job.next_run = 0.0
+    return scheduler
+
+
+def test_advance_keeps_fixed_rate_grid():
+    scheduler = make_scheduler(("job", None, 10, PRIORITY_NORMAL))
+    job = scheduler.jobs[0]
+
+    scheduler._advance(job, now=3.0)   # a run that took 3s doesn't push the next start back
+    assert job.next_run == 10.0
+
+    scheduler._advance(job, now=34.0)  # slots 20 and 30 already passed and are skipped
+    assert job.next_run == 40.0
+
+
+def test_advance_applies_jitter_within_bounds():
+    scheduler = JobScheduler()
+    scheduler.add_job("job", None, 10, jitter_seconds=2.0)
+    job = scheduler.jobs[0]
+    for _ in range(20):
+        scheduler._advance(job, now=job.slot)
+        assert job.slot <= job.next_run <= job.slot + 2.0
+
+
+@pytest.mark.asyncio
+async def test_job_still_running_at_next_slot_counts_as_overrun():
+    release = asyncio.Event()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await release.wait()
+
+    scheduler = make_scheduler(("slow", slow, 10, PRIORITY_NORMAL))
+    job = scheduler.jobs[0]
+
+    scheduler._dispatch_due(0.0)
+    await asyncio.sleep(0)
+    scheduler._dispatch_due(10.0)
+
+    assert calls == [1]
+    assert job.overruns == 1
+    assert job.next_run == 20.0
+    release.set()
+    await job.task
+
+
+@pytest.mark.asyncio
+async def test_low_priority_job_dropped_while_behind():
+    release = asyncio.Event()
+    low_calls = []
+
+    async def slow():
+        await release.wait()
+
+    async def low():
+        low_calls.append(1)
+
+    scheduler = make_scheduler(("sweep", slow, 10, PRIORITY_HIGH), ("leaderboard", low, 100, PRIORITY_LOW))
+    sweep, leaderboard = scheduler.jobs
+
+    scheduler._dispatch_due(0.0)
+    await asyncio.sleep(0)
+    assert low_calls == [1]
+
+    # The sweep has now been running past its interval: the leaderboard slot is dropped.
+    leaderboard.next_run = 15.0
+    scheduler._dispatch_due(15.0)
+    await asyncio.sleep(0)
+    assert scheduler.is_behind(15.0)
+    assert low_calls == [1]
+    assert leaderboard.dropped == 1
+
+    release.set()
+    await sweep.task
+    assert not scheduler.is_behind(16.0)
+
+
+@pytest.mark.asyncio
+async def test_failing_job_is_counted_and_does_not_stop_others():
+    async def boom():
+        raise RuntimeError("scrape failed")
+
+    ran = []
+
+    async def ok():
+        ran.append(1)
+
+    scheduler = make_scheduler(("boom", boom, 10, PRIORITY_NORMAL), ("ok", ok, 10, PRIORITY_NORMAL))
+    scheduler._dispatch_due(0.0)
+    await asyncio.gather(*(job.task for job in scheduler.jobs))
+
+    boom_job, ok_job = scheduler.jobs
+    assert boom_job.failures == 1 and boom_job.runs == 1
+    assert ran == [1]
+    stats = {s["name"]: s for s in scheduler.get_job_stats()}
+    assert stats["boom"]["failures"] == 1
+    assert stats["ok"]["last_run_at"] is not None
+    assert stats["ok"]["seconds_since_last_run"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_run_starts_jobs_independently_at_their_own_rates():
+    counts = {"fast": 0, "slow": 0}
+
+    async def fast():
+        counts["fast"] += 1
+
+    async def slow():
+        counts["slow"] += 1
+        await asyncio.sleep(1)  # never finishes inside the test window
+
+    scheduler = JobScheduler()
+    scheduler.add_job("fast", fast, 0.02, priority=PRIORITY_HIGH)
+    scheduler.add_job("slow", slow, 10, priority=PRIORITY_NORMAL)
+
+    task = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(0.15)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert counts["slow"] == 1
+    assert counts["fast"] >= 4
+    assert not scheduler.jobs[1].is_running
@@ -0,0 +1,217 @@
+# tests/test_scrape_queue.py
+import asyncio
+import pytest
+import pytest_asyncio
+from unittest.mock import MagicMock, AsyncMock
+
+from bot.eagle_errors import ScrapeTimeoutError, CircuitOpenError, ProfileNotFoundError, SessionExpiredError
+from bot.scrape_queue import (
+    ScrapeQueue, scrape_priority, PRIORITY_INTERACTIVE, PRIORITY_ACTIVE_SESSION, PRIORITY_BACKGROUND
+)
+
+
+class GatedBrowser:
+    """Fake browser whose scrapes block until released, recording the order they start in."""
+    def __init__(self):
+        self.started = []
+        self.gate = asyncio.Event()
+
+    async def scrape_player_profile(self, sdvx_id):
+        self.started.append(sdvx_id)
+        await self.gate.wait()
+        return {"player_name": sdvx_id}
+
+    async def scrape_leaderboard(self):
+        self.started.append("leaderboard")
+        return []
+
+    async def close(self):
+        pass
+
+
+@pytest_asyncio.fixture
+async def make_queue():
+    """Builds ScrapeQueues and stops their workers after the test."""
+    queues = []
+
+    def factory(browser, workers=1):
+        queue = ScrapeQueue(browser, workers=workers)
+        queues.append(queue)
+        return queue
+
+    yield factory
+    for queue in queues:
+        await queue.close()
+
+
+async def submit(queue, sdvx_id, priority, timeout=None):
+    with scrape_priority(priority, timeout=timeout):
+        return await queue.scrape_player_profile(sdvx_id)
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_requests_run_first(make_queue):
+    browser = GatedBrowser()
+    queue = make_queue(browser, workers=1)
+
+    first = asyncio.create_task(submit(queue, "busy", PRIORITY_BACKGROUND))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)  # the single worker is now busy with "busy"
+    tasks = [
+        asyncio.create_task(submit(queue, "bg", PRIORITY_BACKGROUND)),
+        asyncio.create_task(submit(queue, "session", PRIORITY_ACTIVE_SESSION)),
+        asyncio.create_task(submit(queue, "checkout", PRIORITY_INTERACTIVE)),
+    ]
+    await asyncio.sleep(0)
+    browser.gate.set()
+    results = await asyncio.gather(first, *tasks)
+
+    assert browser.started == ["busy", "checkout", "session", "bg"]
+    assert [r["player_name"] for r in results] == ["busy", "bg", "session", "checkout"]
+    assert queue.stats["completed"] == 4
+
+
+@pytest.mark.asyncio
+async def test_deadline_raises_and_queued_request_is_dropped(make_queue):
+    browser = GatedBrowser()
+    queue = make_queue(browser, workers=1)
+
+    busy = asyncio.create_task(submit(queue, "busy", PRIORITY_BACKGROUND))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)  # the single worker is now busy with "busy"
+    with pytest.raises(ScrapeTimeoutError):
+        await submit(queue, "late", PRIORITY_INTERACTIVE, timeout=0.01)
+
+    browser.gate.set()
+    await busy
+    await queue._queue.join()
+    assert "late" not in browser.started
+    assert queue.stats["timed_out"] == 1
+    assert queue.stats["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_is_dropped_from_queue(make_queue):
+    browser = GatedBrowser()
+    queue = make_queue(browser, workers=1)
+
+    busy = asyncio.create_task(submit(queue, "busy", PRIORITY_BACKGROUND))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(submit(queue, "cancelled", PRIORITY_BACKGROUND))
+    await asyncio.sleep(0)
+    waiting.cancel()
+
+    browser.gate.set()
+    await busy
+    await queue._queue.join()
+    assert browser.started == ["busy"]
+    assert queue.stats["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_scrape_errors_propagate_to_the_caller(make_queue):
+    browser = MagicMock()
+    browser.scrape_leaderboard = AsyncMock(side_effect=RuntimeError("driver died"))
+    browser.close = AsyncMock()
+    queue = make_queue(browser, workers=2)
+
+    with pytest.raises(RuntimeError, match="driver died"):
+        await queue.scrape_leaderboard()
+    assert queue.stats["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_close_stops_workers_and_closes_browser(make_queue):
+    browser = MagicMock()
+    browser.scrape_leaderboard = AsyncMock(return_value=[])
+    browser.close = AsyncMock()
+    queue = make_queue(browser, workers=2)
+
+    await queue.scrape_leaderboard()
+    workers = list(queue._worker_tasks)
+    await queue.close()
+
+    assert all(task.done() for task in workers)
+    browser.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_default_priority_is_background_without_deadline(make_queue):
+    browser = MagicMock()
+    browser.scrape_player_profile = AsyncMock(return_value={"player_name": "P"})
+    browser.close = AsyncMock()
+    queue = make_queue(browser, workers=1)
+
+    assert await queue.scrape_player_profile("12345678") == {"player_name": "P"}
+    browser.scrape_player_profile.assert_awaited_once_with("12345678")
+
+
+@pytest.mark.asyncio
+async def test_profile_scrapes_go_through_the_cache(make_queue):
+    browser = MagicMock()
+    browser.scrape_player_profile = AsyncMock(return_value={"player_name": "P"})
+    browser.close = AsyncMock()
+    queue = make_queue(browser, workers=2)
+
+    await asyncio.gather(queue.scrape_player_profile("1"), queue.scrape_player_profile("1"))
+    await queue.scrape_player_profile("1")
+
+    browser.scrape_player_profile.assert_awaited_once_with("1")
+    assert queue.profile_cache.stats()["hits"] == 1
+    assert queue.profile_cache.stats()["coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_open_player_breaker_skips_scrape_without_loading_the_page(make_queue):
+    browser = MagicMock()
+    browser.scrape_player_profile = AsyncMock(return_value={})
+    browser.close = AsyncMock()
+    queue = make_queue(browser)
+    queue.breakers.player("1234-5678").min_calls = 2
+
+    for _ in range(2):
+        assert await queue.scrape_player_profile("1234-5678") == {}
+        queue.profile_cache.invalidate("1234-5678")
+
+    with pytest.raises(CircuitOpenError):
+        await queue.scrape_player_profile("1234-5678")
+    assert browser.scrape_player_profile.await_count == 2
+    assert queue.breakers.stats()["players_open"] == ["1234-5678"]
+
+
+@pytest.mark.asyncio
+async def test_unavailable_profile_counts_as_breaker_success(make_queue):
+    browser = MagicMock()
+    browser.scrape_player_profile = AsyncMock(side_effect=ProfileNotFoundError("no such player"))
+    browser.close = AsyncMock()
+    queue = make_queue(browser)
+
+    with pytest.raises(ProfileNotFoundError):
+        await queue.scrape_player_profile("1234-5678")
+    assert queue.breakers.player("1234-5678").failure_ratio() == 0.0
+
+
+@pytest.mark.asyncio
+async def test_caller_timeout_is_not_a_breaker_failure(make_queue):
+    browser = GatedBrowser()
+    queue = make_queue(browser)
+
+    with scrape_priority(PRIORITY_INTERACTIVE, timeout=0.01):
+        with pytest.raises(ScrapeTimeoutError):
+            await queue.scrape_player_profile("slow")
+    browser.gate.set()
+    assert queue.breakers.endpoint("profile").failure_ratio() == 0.0
+
+
+@pytest.mark.asyncio
+async def test_expired_login_is_not_held_against_the_player(make_queue):
+    browser = MagicMock()
+    browser.scrape_player_profile = AsyncMock(side_effect=SessionExpiredError("redirected to login"))
+    browser.close = AsyncMock()
+    queue = make_queue(browser)
+
+    with pytest.raises(SessionExpiredError):
+        await queue.scrape_player_profile("1234-5678")
+    assert queue.breakers.player("1234-5678").failure_ratio() == 0.0
+    assert queue.breakers.endpoint("profile").failure_ratio() == 1.0
@@ -10,6 +10,7 @@ def mock_session_service():
     svc.start_manual_session = AsyncMock()
     svc.end_session = AsyncMock()
     svc.pause_session = AsyncMock()
+    svc.get_session_discord_ids.return_value = {"12345"}
     return svc
 
 @pytest.fixture
@@ -23,6 +24,8 @@ def mock_interaction():
     interaction = MagicMock()
     interaction.user.id = 12345
     interaction.response.send_message = AsyncMock()
+    interaction.response.defer = AsyncMock()
+    interaction.followup.send = AsyncMock()
     return interaction
 
 @pytest.mark.asyncio
@@ -98,6 +101,8 @@ async def test_checkout_with_detailed_summary(mock_session_service, mock_identit
         assert kwargs.get("title") == "🏁 Checked Out"
         assert any(field['name'] == 'Total Songs Played' for field in kwargs.get("fields"))
         assert any(field['name'] == 'VF Gained' and field['value'] == '+0.050' for field in kwargs.get("fields"))
+        mock_interaction.response.defer.assert_awaited_once()
+        mock_interaction.followup.send.assert_awaited_once_with(embed="embed_obj")
 
 @pytest.mark.asyncio
 async def test_checkout_no_session_found(mock_session_service, mock_identity_service, mock_interaction):
@@ -105,4 +110,15 @@ async def test_checkout_no_session_found(mock_session_service, mock_identity_ser
     with patch("bot.cogs.session_cog.create_embed", return_value="embed_obj") as mock_create_embed:
         cog = SessionCog(MagicMock(), mock_session_service, mock_identity_service)
         await cog.checkout.callback(cog, mock_interaction)
-        assert mock_create_embed.call_args.kwargs.get("title") == "Checkout Failed"
\ No newline at end of file
+        assert mock_create_embed.call_args.kwargs.get("title") == "Checkout Failed"
+
+
+@pytest.mark.asyncio
+async def test_checkout_without_session_replies_before_scraping(mock_session_service, mock_identity_service, mock_interaction):
+    mock_session_service.get_session_discord_ids.return_value = set()
+    with patch("bot.cogs.session_cog.create_embed", return_value="embed_obj"):
+        cog = SessionCog(MagicMock(), mock_session_service, mock_identity_service)
+        await cog.checkout.callback(cog, mock_interaction)
+    mock_session_service.end_session.assert_not_awaited()
+    mock_interaction.response.defer.assert_not_awaited()
+    mock_interaction.response.send_message.assert_awaited_once_with(embed="embed_obj", ephemeral=True)
@@ -0,0 +1,80 @@
+# tests/test_session_journal.py
+import json
+import os
+from unittest.mock import patch
+
+from bot.session_journal import SessionJournal, EVENT_STARTED, EVENT_SCORE, EVENT_PAUSED, EVENT_ENDED
+
+AT = "2025-06-15T12:00:00+00:00"
+
+
+def write_events(journal, *events):
+    journal.append([journal.event(kind, discord_id, AT, **fields) for kind, discord_id, fields in events])
+
+
+def test_load_replays_snapshot_and_journal_tail(tmp_path):
+    journal = SessionJournal(str(tmp_path / "sessions.json"))
+    write_events(journal,
+        (EVENT_STARTED, "user1", {"session": {"status": "active", "songs_played_count": 0}}),
+        (EVENT_SCORE, "user1", {}),
+        (EVENT_STARTED, "user2", {"session": {"status": "active"}}),
+        (EVENT_ENDED, "user2", {}),
+        (EVENT_PAUSED, "user1", {"status": "pending_break", "reminder_sent": True}),
+    )
+
+    reloaded = SessionJournal(str(tmp_path / "sessions.json"))
+    sessions = reloaded.load()
+
+    assert sessions == {"user1": {"status": "pending_break", "songs_played_count": 1, "last_activity": AT, "reminder_sent": True}}
+    assert reloaded.seq == 5
+    assert reloaded.events_since_snapshot == 5
+    assert reloaded.journal_path == str(tmp_path / "sessions.journal")
+
+
+def test_compact_writes_snapshot_and_empties_journal(tmp_path):
+    journal = SessionJournal(str(tmp_path / "sessions.json"))
+    write_events(journal, (EVENT_STARTED, "user1", {"session": {"status": "active"}}))
+    with patch("bot.session_journal.os.fsync") as mock_fsync:
+        journal.compact(json.dumps({"seq": 1, "sessions": {"user1": {"status": "active"}}}))
+
+    assert mock_fsync.call_count == 3  # the snapshot, its directory, the emptied journal
+    assert json.loads((tmp_path / "sessions.json").read_text()) == {"seq": 1, "sessions": {"user1": {"status": "active"}}}
+    assert (tmp_path / "sessions.journal").read_text() == ""
+    assert sorted(os.listdir(tmp_path)) == ["sessions.journal", "sessions.json"]
+    assert journal.events_since_snapshot == 0
+
+
+def test_load_skips_events_already_in_snapshot(tmp_path):
+    (tmp_path / "sessions.json").write_text(json.dumps({"seq": 2, "sessions": {"user1": {"status": "active", "songs_played_count": 1}}}))
+    # Left behind by a crash after the snapshot was replaced but before the journal was emptied.
+    (tmp_path / "sessions.journal").write_text("".join(json.dumps(e) + "\n" for e in [
+        {"seq": 1, "event": EVENT_STARTED, "discord_id": "user1", "at": AT, "session": {"status": "active", "songs_played_count": 0}},
+        {"seq": 2, "event": EVENT_SCORE, "discord_id": "user1", "at": AT},
+        {"seq": 3, "event": EVENT_SCORE, "discord_id": "user1", "at": AT},
+    ]))
+
+    journal = SessionJournal(str(tmp_path / "sessions.json"))
+    sessions = journal.load()
+
+    assert sessions["user1"]["songs_played_count"] == 2
+    assert journal.seq == 3
+
+
+def test_load_skips_torn_last_line(tmp_path):
+    journal = SessionJournal(str(tmp_path / "sessions.json"))
+    write_events(journal, (EVENT_STARTED, "user1", {"session": {"status": "active"}}))
+    with open(journal.journal_path, "a") as f:
+        f.write('{"seq": 2, "event": "sco')
+
+    sessions = SessionJournal(str(tmp_path / "sessions.json")).load()
+
+    assert sessions == {"user1": {"status": "active"}}
+
+
+def test_load_reads_sessions_file_from_before_the_journal(tmp_path):
+    (tmp_path / "sessions.json").write_text(json.dumps({"user1": {"status": "on_break"}}))
+
+    journal = SessionJournal(str(tmp_path / "sessions.json"))
+
+    assert journal.load() == {"user1": {"status": "on_break"}}
+    assert journal.seq == 0
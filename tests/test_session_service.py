@@ -1,6 +1,9 @@
 # tests/test_session_service.py
 import pytest
+import pytest_asyncio
 from unittest.mock import patch, MagicMock, AsyncMock
+import asyncio
+import json
 from datetime import datetime, timezone, timedelta
 
 from bot.utils.notification_service import NotificationService
@@ -42,10 +45,10 @@ def mock_notification_service():
     svc.post_vf_milestone_announcement = AsyncMock()
     return svc
 
-@pytest.fixture
-def service(mock_performance_service, mock_browser, mock_role_service, mock_notification_service):
+@pytest_asyncio.fixture
+async def service(mock_performance_service, mock_browser, mock_role_service, mock_notification_service):
     with patch.object(SessionService, '_blocking_read_sessions', return_value={}), \
-         patch.object(SessionService, '_blocking_write_sessions'):
+         patch.object(SessionService, '_blocking_persist'):
         svc = SessionService(
             "fake_path.json",
             performance_service=mock_performance_service,
@@ -54,6 +57,7 @@ def service(mock_performance_service, mock_browser, mock_role_service, mock_noti
             notification_service=mock_notification_service
         )
         yield svc
+        await svc.close()
 
 @pytest.mark.asyncio
 async def test_process_new_score_new_session(service, mock_role_service):
@@ -183,6 +187,10 @@ def test_get_session_count(service):
     service.sessions = {"user1": {}, "user2": {}, "user3": {}}
     assert service.get_session_count() == 3
 
+def test_get_session_discord_ids(service):
+    service.sessions = {"user1": {"status": "active"}, "user2": {"status": "on_break"}}
+    assert service.get_session_discord_ids() == {"user1", "user2"}
+
 @pytest.mark.asyncio
 async def test_start_manual_session_stores_initial_volforce(service):
     service.sessions = {}
@@ -212,4 +220,118 @@ async def test_analyze_session_data_success(service, mock_notification_service):
     with patch.object(service, '_get_now', return_value=MOCK_NOW):
         summary = await service._analyze_session_data(discord_id)
     assert summary["vf_milestone"] == milestone_name
-    mock_notification_service.post_vf_milestone_announcement.assert_awaited_once_with(player_name, milestone_name)
\ No newline at end of file
+    mock_notification_service.post_vf_milestone_announcement.assert_awaited_once_with(player_name, milestone_name)
+@pytest.mark.asyncio
+async def test_analyze_session_data_refreshes_profile_first(service):
+    """Checkout summaries are built from a fresh profile scrape, not the last sweep."""
+    service.sessions["user1"] = {"start_time": MOCK_NOW.isoformat()}
+    identity_service = service.performance_service.identity_service
+    calls = []
+    identity_service.refresh_player_profile = AsyncMock(side_effect=lambda *_: calls.append("refresh"))
+    identity_service.get_user_by_discord_id.side_effect = lambda *_: calls.append("read") or {"recent_plays": []}
+    service.performance_service.check_for_vf_milestone.return_value = None
+    with patch.object(service, '_get_now', return_value=MOCK_NOW):
+        await service._analyze_session_data("user1")
+    identity_service.refresh_player_profile.assert_awaited_once_with("user1")
+    assert calls == ["refresh", "read"]
+
+@pytest.mark.asyncio
+async def test_end_session_records_history_in_player_store(service):
+    service.player_store = MagicMock()
+    service.sessions = {"user1": {"type": "manual", "start_time": "2025-06-15T11:00:00+00:00", "songs_played_count": 7, "initial_volforce": 15.0}}
+    with patch.object(service, '_analyze_session_data', new_callable=AsyncMock) as mock_analyze, \
+         patch.object(service, '_get_now', return_value=MOCK_NOW):
+        mock_analyze.return_value = {"sdvx_id": "12345678", "final_volforce": 15.2}
+        await service.end_session("user1")
+
+    service.player_store.record_session.assert_called_once_with({
+        "discord_id": "user1", "sdvx_id": "12345678", "type": "manual", "start_time": "2025-06-15T11:00:00+00:00",
+        "end_time": MOCK_NOW.isoformat(), "songs_played": 7, "initial_volforce": 15.0, "final_volforce": 15.2,
+    })
+
+@pytest.mark.asyncio
+async def test_transitions_in_one_tick_are_written_once(service):
+    service.flush_seconds = 0.01
+    service.performance_service.identity_service.get_user_by_discord_id.return_value = {"volforce": 15.0}
+    with patch.object(service, '_get_now', return_value=MOCK_NOW):
+        await service.process_new_score("user1")
+        await service.process_new_score("user1")
+        await service.pause_session("user1")
+    await asyncio.sleep(0.05)
+
+    service._blocking_persist.assert_called_once()
+    events, snapshot = service._blocking_persist.call_args[0]
+    assert [e["event"] for e in events] == ["started", "score", "paused"]
+    assert [e["seq"] for e in events] == [1, 2, 3]
+    assert snapshot is None
+    assert service.persist_stats == {"writes": 1, "writes_avoided": 2}
+
+@pytest.mark.asyncio
+async def test_close_writes_pending_sessions_immediately(service):
+    service.flush_seconds = 60
+    service.performance_service.identity_service.get_user_by_discord_id.return_value = {"volforce": 15.0}
+    await service.start_manual_session("user1")
+    service._blocking_persist.assert_not_called()
+
+    await service.close()
+
+    service._blocking_persist.assert_called_once()
+    events, snapshot = service._blocking_persist.call_args[0]
+    assert [e["event"] for e in events] == ["started"]
+    assert json.loads(snapshot) == {"seq": 1, "sessions": {"user1": service.sessions["user1"]}}
+
+@pytest.mark.asyncio
+async def test_journal_is_compacted_after_enough_events(service):
+    service.flush_seconds = 60
+    service.compact_after_events = 2
+    service.performance_service.identity_service.get_user_by_discord_id.return_value = {"volforce": 15.0}
+    await service.process_new_score("user1")
+    await service.flush()
+    assert service._blocking_persist.call_args[0][1] is None
+
+    await service.process_new_score("user1")
+    await service.process_new_score("user1")
+    await service.flush()
+    events, snapshot = service._blocking_persist.call_args[0]
+    assert len(events) == 2
+    assert json.loads(snapshot)["sessions"]["user1"]["songs_played_count"] == 3
+
+def test_restart_replays_the_journal(tmp_path, mock_performance_service, mock_browser, mock_role_service, mock_notification_service):
+    path = str(tmp_path / "sessions.json")
+    mock_performance_service.identity_service.get_user_by_discord_id.return_value = {"volforce": 15.0}
+    svc = SessionService(path, mock_performance_service, mock_browser, mock_role_service, mock_notification_service)
+
+    async def play():
+        await svc.start_manual_session("user1")
+        await svc.process_new_score("user1")
+        await svc.pause_session("user1")
+        await svc.flush()
+        svc._flush_task.cancel()
+    with patch.object(svc, '_get_now', return_value=MOCK_NOW):
+        asyncio.run(play())
+
+    restarted = SessionService(path, mock_performance_service, mock_browser, mock_role_service, mock_notification_service)
+    assert restarted.sessions == svc.sessions
+    assert restarted.sessions["user1"]["status"] == "on_break"
+    assert restarted.journal.seq == 3
+
+@pytest.mark.asyncio
+async def test_concurrent_end_session_ends_once(service, mock_role_service):
+    service.sessions = {"user1": {"discord_id": "user1", "status": "active", "start_time": MOCK_NOW.isoformat()}}
+    release = asyncio.Event()
+
+    async def slow_analyze(discord_id):
+        await release.wait()
+        return {"player_name": "Test Player"}
+
+    with patch.object(service, '_analyze_session_data', side_effect=slow_analyze):
+        first = asyncio.create_task(service.end_session("user1"))
+        await asyncio.sleep(0)
+        second = await service.end_session("user1")
+        release.set()
+        summary = await first
+
+    assert summary == {"player_name": "Test Player"}
+    assert second is None
+    assert "user1" not in service.sessions
+    mock_role_service.remove_role.assert_awaited_once_with("user1")
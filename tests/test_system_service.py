@@ -52,4 +52,12 @@ def test_is_within_arcade_hours(service, scenario_time, expected):
 def test_init_file_not_found():
     with patch("builtins.open", side_effect=FileNotFoundError):
         service = SystemService("non_existent_path.json")
-        assert service.schedule == {}
\ No newline at end of file
+        assert service.schedule == {}
+
+def test_get_open_windows_spans_overnight_sessions(service):
+    now = datetime(2023, 10, 14, 1, 0, tzinfo=pytz.utc)  # Saturday, during Friday's overnight session
+    windows = service.get_open_windows(now, days_ahead=4)
+    assert windows == [
+        (datetime(2023, 10, 13, 22, 0, tzinfo=pytz.utc), datetime(2023, 10, 14, 2, 0, tzinfo=pytz.utc)),
+        (datetime(2023, 10, 17, 10, 0, tzinfo=pytz.utc), datetime(2023, 10, 17, 20, 0, tzinfo=pytz.utc)),
+    ]
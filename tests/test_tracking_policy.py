@@ -0,0 +1,76 @@
+# tests/test_tracking_policy.py
+import pytest
+from datetime import datetime, timezone, timedelta
+
+from bot.core.tracking_policy import (
+    TrackingPolicy, TIER_ACTIVE_SESSION, TIER_LINKED_ACTIVE, TIER_LINKED_DORMANT, TIER_UNLINKED
+)
+
+NOW = datetime(2025, 6, 18, 22, 0, tzinfo=timezone.utc)
+CADENCE = {TIER_ACTIVE_SESSION: 0, TIER_LINKED_ACTIVE: 300, TIER_LINKED_DORMANT: 3600, TIER_UNLINKED: 21600}
+
+def played(delta: timedelta) -> list:
+    return [{"timestamp": (NOW - delta).strftime("%Y-%m-%d %I:%M %p")}]
+
+@pytest.fixture
+def policy():
+    return TrackingPolicy(
+        cadence_seconds=CADENCE,
+        budget_per_tick={TIER_ACTIVE_SESSION: 0, TIER_LINKED_ACTIVE: 0, TIER_LINKED_DORMANT: 0, TIER_UNLINKED: 0},
+        recent_days=14, promotion_minutes=60
+    )
+
+@pytest.fixture
+def users():
+    return {
+        "1": {"discord_id": "d1", "recent_plays": played(timedelta(days=30))},
+        "2": {"discord_id": "d2", "recent_plays": played(timedelta(days=2))},
+        "3": {"discord_id": "d3", "recent_plays": played(timedelta(days=60))},
+        "4": {"discord_id": None, "recent_plays": played(timedelta(days=1))},
+        "5": {"discord_id": "d5", "recent_plays": played(timedelta(minutes=10))},
+    }
+
+
+def test_classify(policy, users):
+    active = {"d1"}
+    assert policy.classify("1", users["1"], active, NOW) == TIER_ACTIVE_SESSION
+    assert policy.classify("2", users["2"], active, NOW) == TIER_LINKED_ACTIVE
+    assert policy.classify("3", users["3"], active, NOW) == TIER_LINKED_DORMANT
+    assert policy.classify("4", users["4"], active, NOW) == TIER_UNLINKED
+    # A play within the promotion window counts as active even without a session.
+    assert policy.classify("5", users["5"], active, NOW) == TIER_ACTIVE_SESSION
+
+def test_never_scraped_players_are_all_due(policy, users):
+    assert set(policy.select_due(users, set(), NOW)) == set(users)
+
+def test_cadence_per_tier(policy, users):
+    for sdvx_id in users:
+        policy.record_scrape(sdvx_id, NOW)
+    later = NOW + timedelta(minutes=10)
+    # 10 minutes later only the active tier (every tick) and linked_active (5 min) are due.
+    assert policy.select_due(users, {"d1"}, later) == ["1", "5", "2"]
+
+def test_budget_caps_tier_and_prefers_most_overdue(users):
+    policy = TrackingPolicy(
+        cadence_seconds=CADENCE,
+        budget_per_tick={TIER_ACTIVE_SESSION: 0, TIER_LINKED_ACTIVE: 1, TIER_LINKED_DORMANT: 1, TIER_UNLINKED: 1},
+    )
+    roster = {str(i): {"discord_id": f"d{i}", "recent_plays": played(timedelta(days=3))} for i in range(3)}
+    policy.record_scrape("0", NOW - timedelta(minutes=6))
+    policy.record_scrape("1", NOW - timedelta(minutes=30))
+    policy.record_scrape("2", NOW - timedelta(minutes=10))
+    assert policy.select_due(roster, set(), NOW) == ["1"]
+
+def test_record_activity_promotes_dormant_player(policy, users):
+    assert policy.classify("3", users["3"], set(), NOW) == TIER_LINKED_DORMANT
+    policy.record_activity("3", NOW - timedelta(minutes=5))
+    assert policy.classify("3", users["3"], set(), NOW) == TIER_ACTIVE_SESSION
+    assert policy.classify("3", users["3"], set(), NOW + timedelta(hours=2)) == TIER_LINKED_ACTIVE
+
+def test_players_leaving_the_roster_are_forgotten(policy, users):
+    policy.record_scrape("1", NOW)
+    policy.record_scrape("gone", NOW)
+    policy.record_activity("gone", NOW)
+    policy.select_due(users, set(), NOW)
+    assert "gone" not in policy.last_scraped and "gone" not in policy.last_activity
+    assert policy.last_scraped["1"] == NOW